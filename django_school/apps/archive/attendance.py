@@ -0,0 +1,62 @@
+"""
+Archived attendance is stored per lesson session as an array of statuses
+packed into 3 bits per student. The position of the student in the array
+is their position in the roster of the archived class.
+
+The attendance summaries of the lessons app count the sessions
+of the open school year only, the archived years are summed up per student
+by the archive views.
+"""
+import math
+from collections import Counter
+
+from django_school.apps.archive.models import (ArchivedClass,
+                                               ArchivedLessonSession)
+
+STATUS_BITS = 3
+STATUS_MASK = (1 << STATUS_BITS) - 1
+
+# 0 is also stored for the students without an attendance in the session
+STATUS_CODES = {"none": 0, "present": 1, "absent": 2, "exempt": 3, "excused": 4}
+STATUSES = {code: status for status, code in STATUS_CODES.items()}
+
+
+def pack_statuses(statuses):
+    value = 0
+    for position, status in enumerate(statuses):
+        value |= STATUS_CODES[status] << (position * STATUS_BITS)
+
+    return value.to_bytes(math.ceil(len(statuses) * STATUS_BITS / 8), "little")
+
+
+def unpack_statuses(data, count):
+    value = int.from_bytes(data, "little")
+
+    return [
+        STATUSES[(value >> (position * STATUS_BITS)) & STATUS_MASK]
+        for position in range(count)
+    ]
+
+
+def get_status(data, position):
+    value = int.from_bytes(data, "little")
+
+    return STATUSES[(value >> (position * STATUS_BITS)) & STATUS_MASK]
+
+
+def get_student_attendance(school_year, student, subject_name=None):
+    """Returns the numbers of the student's archived lessons by status."""
+    positions = {
+        archived_class.pk: archived_class.student_ids.index(student.pk)
+        for archived_class in ArchivedClass.objects.filter(
+            school_year=school_year, student_ids__contains=[student.pk]
+        )
+    }
+    sessions = ArchivedLessonSession.objects.filter(archived_class__in=positions)
+    if subject_name:
+        sessions = sessions.filter(subject_name=subject_name)
+
+    return Counter(
+        get_status(data, positions[class_pk])
+        for class_pk, data in sessions.values_list("archived_class", "statuses")
+    )
@@ -0,0 +1,50 @@
+import datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management import BaseCommand, CommandError
+
+from django_school.apps.archive.rollover import RolloverError, roll_over
+from django_school.apps.schools.models import School
+
+
+class Command(BaseCommand):
+    help = (
+        "Starts a new school year: archives the grades and attendance "
+        "of the previous one, promotes the classes and closes the previous year."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", help="The name of the new school year.")
+        parser.add_argument("--start", type=datetime.date.fromisoformat, required=True)
+        parser.add_argument("--end", type=datetime.date.fromisoformat, required=True)
+        parser.add_argument(
+            "--school",
+            help="The slug of the school, the data without a school if not given.",
+        )
+        parser.add_argument(
+            "--final-grade", type=int, default=settings.SCHOOL_FINAL_GRADE
+        )
+
+    def handle(self, *args, **options):
+        school = None
+        if options["school"]:
+            try:
+                school = School.objects.get(slug=options["school"])
+            except School.DoesNotExist:
+                raise CommandError(f"School {options['school']} doesn't exist.")
+
+        try:
+            closed_year, new_year, summary = roll_over(
+                school,
+                options["name"],
+                options["start"],
+                options["end"],
+                options["final_grade"],
+            )
+        except (RolloverError, ValidationError) as e:
+            raise CommandError(e)
+
+        self.stdout.write(f"Closed {closed_year}, started {new_year}")
+        for name, count in summary.items():
+            self.stdout.write(f"{name}: {count}")
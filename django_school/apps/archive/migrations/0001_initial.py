@@ -0,0 +1,56 @@
+# Generated by Django 3.2.7 on 2026-10-19 03:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('schools', '0002_auto_20261019_0307'),
+        ('users', '0010_auto_20261019_0252'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedGrade',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject_name', models.CharField(max_length=64)),
+                ('category_name', models.CharField(max_length=64)),
+                ('grade', models.FloatField(choices=[(1.0, '1'), (1.5, '1+'), (1.75, '2-'), (2.0, '2'), (2.5, '2+'), (2.75, '3-'), (3.0, '3'), (3.5, '3+'), (3.75, '4-'), (4.0, '4'), (4.5, '4+'), (4.75, '5-'), (5.0, '5'), (5.5, '5+'), (5.75, '6-'), (6.0, '6')])),
+                ('weight', models.PositiveIntegerField()),
+                ('comment', models.TextField(blank=True, null=True)),
+                ('created', models.DateTimeField()),
+                ('school_year', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_grades', to='schools.schoolyear')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_grades', to='users.user')),
+                ('teacher', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.user')),
+            ],
+            options={
+                'ordering': ['subject_name', 'created'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('subject_name', models.CharField(max_length=64)),
+                ('class_number', models.CharField(max_length=32)),
+                ('topic', models.CharField(blank=True, max_length=128, null=True)),
+                ('status', models.CharField(choices=[('present', 'Present'), ('absent', 'Absent'), ('exempt', 'Exempt'), ('excused', 'Excused'), ('none', 'None')], max_length=16)),
+                ('school_year', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_attendances', to='schools.schoolyear')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_attendances', to='users.user')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedgrade',
+            index=models.Index(fields=['school_year', 'student'], name='archive_arc_school__ccd41c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedattendance',
+            index=models.Index(fields=['school_year', 'student'], name='archive_arc_school__fa49ef_idx'),
+        ),
+    ]
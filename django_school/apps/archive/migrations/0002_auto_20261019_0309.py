@@ -0,0 +1,113 @@
+# Generated by Django 3.2.7 on 2026-10-19 03:09
+
+import math
+from collections import defaultdict
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+STATUS_CODES = {"none": 0, "present": 1, "absent": 2, "exempt": 3, "excused": 4}
+
+
+def pack_statuses(statuses):
+    value = 0
+    for position, status in enumerate(statuses):
+        value |= STATUS_CODES[status] << (position * 3)
+
+    return value.to_bytes(math.ceil(len(statuses) * 3 / 8), "little")
+
+
+def pack_archived_attendances(apps, schema_editor):
+    ArchivedAttendance = apps.get_model("archive", "ArchivedAttendance")
+    ArchivedClass = apps.get_model("archive", "ArchivedClass")
+    ArchivedLessonSession = apps.get_model("archive", "ArchivedLessonSession")
+
+    classes = ArchivedAttendance.objects.values_list(
+        "school_year_id", "class_number"
+    ).distinct()
+    for school_year_id, class_number in classes:
+        # the rows don't tell which session they come from, so the rows
+        # of the same subject and day are split into as many sessions
+        # as there are rows of a single student
+        sessions = defaultdict(list)
+        student_ids = set()
+        rows = ArchivedAttendance.objects.filter(
+            school_year_id=school_year_id, class_number=class_number
+        ).values_list("date", "subject_name", "topic", "student_id", "status")
+        for date, subject_name, topic, student_id, status in rows.iterator():
+            group = sessions[date, subject_name, topic]
+            session = next((s for s in group if student_id not in s), None)
+            if session is None:
+                session = {}
+                group.append(session)
+            session[student_id] = status
+            student_ids.add(student_id)
+
+        student_ids = sorted(student_ids)
+        archived_class = ArchivedClass.objects.create(
+            school_year_id=school_year_id, number=class_number, student_ids=student_ids
+        )
+        ArchivedLessonSession.objects.bulk_create(
+            [
+                ArchivedLessonSession(
+                    archived_class=archived_class,
+                    date=date,
+                    subject_name=subject_name,
+                    topic=topic,
+                    statuses=pack_statuses(
+                        [session.get(pk, "none") for pk in student_ids]
+                    ),
+                )
+                for (date, subject_name, topic), group in sessions.items()
+                for session in group
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0002_auto_20261019_0307'),
+        ('archive', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedClass',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.CharField(max_length=32)),
+                ('student_ids', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), size=None)),
+                ('school_year', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_classes', to='schools.schoolyear')),
+            ],
+            options={
+                'verbose_name_plural': 'archived classes',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedLessonSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('subject_name', models.CharField(max_length=64)),
+                ('topic', models.CharField(blank=True, max_length=128, null=True)),
+                ('statuses', models.BinaryField()),
+                ('archived_class', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to='archive.archivedclass')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedclass',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['student_ids'], name='archive_arc_student_743892_gin'),
+        ),
+        migrations.AddConstraint(
+            model_name='archivedclass',
+            constraint=models.UniqueConstraint(fields=('school_year', 'number'), name='unique_archived_class'),
+        ),
+        migrations.RunPython(pack_archived_attendances, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='ArchivedAttendance',
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 3.2.7 on 2026-10-19 04:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_auto_20261019_0355'),
+        ('archive', '0002_auto_20261019_0309'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedHomework',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject_name', models.CharField(max_length=64)),
+                ('title', models.CharField(max_length=64)),
+                ('description', models.TextField(blank=True, max_length=256, null=True)),
+                ('created', models.DateTimeField()),
+                ('completion_date', models.DateField()),
+                ('archived_class', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='homeworks', to='archive.archivedclass')),
+                ('teacher', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.user')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='archivedlessonsession',
+            name='teacher',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.user'),
+        ),
+        migrations.AlterField(
+            model_name='archivedlessonsession',
+            name='date',
+            field=models.DateField(null=True),
+        ),
+        migrations.CreateModel(
+            name='ArchivedHomeworkRealisation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('submission_date', models.DateTimeField()),
+                ('homework', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='realisations', to='archive.archivedhomework')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.user')),
+            ],
+        ),
+    ]
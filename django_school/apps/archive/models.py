@@ -0,0 +1,160 @@
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models
+
+from django_school.apps.common.models import AttachedFile
+from django_school.apps.grades.models import Grade
+from django_school.apps.schools.models import SchoolYear
+
+# the archived rows don't reference the classes, subjects and lesson sessions,
+# which are changed or removed when a new school year starts
+
+
+class ArchivedGrade(models.Model):
+    school_year = models.ForeignKey(
+        SchoolYear, on_delete=models.CASCADE, related_name="archived_grades"
+    )
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_grades",
+    )
+    teacher = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+    subject_name = models.CharField(max_length=64)
+    category_name = models.CharField(max_length=64)
+    grade = models.FloatField(choices=Grade.GRADES)
+    weight = models.PositiveIntegerField()
+    comment = models.TextField(null=True, blank=True)
+    created = models.DateTimeField()
+
+    class Meta:
+        ordering = ["subject_name", "created"]
+        indexes = [models.Index(fields=["school_year", "student"])]
+
+    def __str__(self):
+        return self.get_grade_display()
+
+
+class ArchivedClass(models.Model):
+    school_year = models.ForeignKey(
+        SchoolYear, on_delete=models.CASCADE, related_name="archived_classes"
+    )
+    number = models.CharField(max_length=32)
+    # the order of the students in the packed statuses of the sessions
+    student_ids = ArrayField(models.BigIntegerField())
+
+    class Meta:
+        verbose_name_plural = "archived classes"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["school_year", "number"], name="unique_archived_class"
+            )
+        ]
+        indexes = [GinIndex(fields=["student_ids"])]
+
+    def __str__(self):
+        return f"{self.number} {self.school_year}"
+
+
+class ArchivedClassRowQuerySet(models.QuerySet):
+    # the files attached to the archived rows are downloaded by the users
+    # who saw them before the rollover
+    teacher_field = "teacher"
+    class_field = "archived_class"
+
+    def visible_to_user(self, user):
+        if user.is_teacher:
+            return self.filter(**{self.teacher_field: user})
+        elif user.is_student or user.is_parent:
+            student_id = user.pk if user.is_student else user.child_id
+            return self.filter(
+                **{f"{self.class_field}__student_ids__contains": [student_id]}
+            )
+        else:
+            return self.none()
+
+
+class ArchivedLessonSession(models.Model):
+    archived_class = models.ForeignKey(
+        ArchivedClass, on_delete=models.CASCADE, related_name="sessions"
+    )
+    teacher = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+    date = models.DateField(null=True)
+    subject_name = models.CharField(max_length=64)
+    topic = models.CharField(max_length=128, null=True, blank=True)
+    # see django_school.apps.archive.attendance
+    statuses = models.BinaryField()
+    attached_files = GenericRelation(
+        AttachedFile,
+        content_type_field="related_object_content_type",
+        object_id_field="related_object_id",
+    )
+
+    objects = ArchivedClassRowQuerySet.as_manager()
+
+
+class ArchivedHomework(models.Model):
+    archived_class = models.ForeignKey(
+        ArchivedClass, on_delete=models.CASCADE, related_name="homeworks"
+    )
+    teacher = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+    subject_name = models.CharField(max_length=64)
+    title = models.CharField(max_length=64)
+    description = models.TextField(max_length=256, blank=True, null=True)
+    created = models.DateTimeField()
+    completion_date = models.DateField()
+    attached_files = GenericRelation(
+        AttachedFile,
+        content_type_field="related_object_content_type",
+        object_id_field="related_object_id",
+    )
+
+    objects = ArchivedClassRowQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.archived_class.number} {self.title}"
+
+
+class ArchivedHomeworkRealisationQuerySet(ArchivedClassRowQuerySet):
+    teacher_field = "homework__teacher"
+    class_field = "homework__archived_class"
+
+    def visible_to_user(self, user):
+        if user.is_student or user.is_parent:
+            return self.filter(student_id=user.pk if user.is_student else user.child_id)
+
+        return super().visible_to_user(user)
+
+
+class ArchivedHomeworkRealisation(models.Model):
+    homework = models.ForeignKey(
+        ArchivedHomework, on_delete=models.CASCADE, related_name="realisations"
+    )
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    submission_date = models.DateTimeField()
+    attached_files = GenericRelation(
+        AttachedFile,
+        content_type_field="related_object_content_type",
+        object_id_field="related_object_id",
+    )
+
+    objects = ArchivedHomeworkRealisationQuerySet.as_manager()
@@ -0,0 +1,345 @@
+import re
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.db.models import Exists, F, OuterRef, Q, Value
+from django.utils.text import slugify
+
+from django_school.apps.archive.attendance import pack_statuses
+from django_school.apps.archive.models import (ArchivedClass, ArchivedGrade,
+                                               ArchivedHomework,
+                                               ArchivedHomeworkRealisation,
+                                               ArchivedLessonSession)
+from django_school.apps.classes.models import Class
+from django_school.apps.common.cache import bump_model_versions
+from django_school.apps.common.models import AttachedFile
+from django_school.apps.events.models import EventStatus
+from django_school.apps.grades.models import Grade, GradeCategory
+from django_school.apps.lessons.models import (Attendance, Homework,
+                                               HomeworkRealisation,
+                                               LessonSession)
+from django_school.apps.schools.models import SchoolYear
+
+User = get_user_model()
+
+CLASS_NUMBER_RE = re.compile(r"^(\d+)(.*)$")
+
+BATCH_SIZE = 1000
+
+
+class RolloverError(Exception):
+    pass
+
+
+def insert_from_select(model, queryset):
+    """
+    Inserts the rows selected by the queryset into the table of the model
+    without loading them. The queryset has to select the values of the model's
+    fields as annotations named after the fields with a leading underscore.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    columns = ", ".join(
+        connection.ops.quote_name(model._meta.get_field(name[1:]).column)
+        for name in queryset.query.annotation_select
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {connection.ops.quote_name(model._meta.db_table)} "
+            f"({columns}) {sql}",
+            params,
+        )
+        return cursor.rowcount
+
+
+def archive_grades(school_year, school, before):
+    grades = Grade.objects.filter(student__school=school, created__date__lt=before)
+
+    archived = insert_from_select(
+        ArchivedGrade,
+        grades.values(
+            _school_year=Value(school_year.pk),
+            _student=F("student_id"),
+            _teacher=F("teacher_id"),
+            _subject_name=F("subject__name"),
+            _category_name=F("category__name"),
+            _grade=F("grade"),
+            _weight=F("weight"),
+            _comment=F("comment"),
+            _created=F("created"),
+        ),
+    )
+    grades.delete()
+    # the categories are created for a class anew every year
+    GradeCategory.objects.filter(school_class__school=school, grades=None).delete()
+
+    return archived
+
+
+def move_attached_files(model, archived_model, pks, archived_pks):
+    """Attaches the files of the rows being deleted to their archived copies."""
+    content_type = ContentType.objects.get_for_model(model)
+    archived_content_type = ContentType.objects.get_for_model(archived_model)
+    for pk, archived_pk in zip(pks, archived_pks):
+        AttachedFile.objects.filter(
+            related_object_content_type=content_type, related_object_id=pk
+        ).update(
+            related_object_content_type=archived_content_type,
+            related_object_id=archived_pk,
+        )
+
+
+def get_archived_class(school_year, school_class, student_ids):
+    archived_class, _ = ArchivedClass.objects.get_or_create(
+        school_year=school_year,
+        number=school_class.number,
+        defaults={"student_ids": student_ids},
+    )
+
+    return archived_class
+
+
+def archive_class_attendances(school_year, school_class, sessions, keep_files):
+    statuses = defaultdict(dict)
+    attendances = Attendance.objects.filter(lesson_session__in=sessions).values_list(
+        "lesson_session_id", "student_id", "status"
+    )
+    for session_id, student_id, status in attendances.iterator():
+        statuses[session_id][student_id] = status
+
+    student_ids = sorted({pk for students in statuses.values() for pk in students})
+    archived_class = get_archived_class(school_year, school_class, student_ids)
+    sessions = list(
+        sessions.values(
+            "pk", "date", "topic", "lesson__teacher", "lesson__subject__name"
+        ).iterator()
+    )
+    archived_sessions = ArchivedLessonSession.objects.bulk_create(
+        (
+            ArchivedLessonSession(
+                archived_class=archived_class,
+                teacher_id=session["lesson__teacher"],
+                date=session["date"],
+                subject_name=session["lesson__subject__name"],
+                topic=session["topic"],
+                statuses=pack_statuses(
+                    [
+                        statuses[session["pk"]].get(pk, "none")
+                        for pk in archived_class.student_ids
+                    ]
+                ),
+            )
+            for session in sessions
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    if not keep_files:
+        move_attached_files(
+            LessonSession,
+            ArchivedLessonSession,
+            [session["pk"] for session in sessions],
+            [archived_session.pk for archived_session in archived_sessions],
+        )
+
+    return sum(len(students) for students in statuses.values())
+
+
+def archive_attendances(school_year, school, before, graduating):
+    """
+    Archives the sessions of the closed year and all the sessions
+    of the graduating classes, which are deleted with their classes.
+    """
+    sessions = LessonSession.objects.filter(lesson__school_class__school=school).filter(
+        Q(date__lt=before) | Q(lesson__school_class__in=graduating)
+    )
+
+    archived = 0
+    for school_class in Class.objects.filter(
+        pk__in=sessions.values("lesson__school_class")
+    ):
+        archived += archive_class_attendances(
+            school_year,
+            school_class,
+            sessions.filter(lesson__school_class=school_class),
+            keep_files=school_class not in graduating,
+        )
+
+    Attendance.objects.filter(lesson_session__in=sessions).delete()
+    # the sessions with attached files are kept, so the files aren't removed
+    sessions.filter(
+        ~Exists(
+            AttachedFile.objects.filter(
+                related_object_content_type=ContentType.objects.get_for_model(
+                    LessonSession
+                ),
+                related_object_id=OuterRef("pk"),
+            )
+        )
+    ).delete()
+
+    return archived
+
+
+def archive_homeworks(school_year, graduating):
+    """
+    Copies the homeworks of the graduating classes with their realisations
+    and attached files to the archive, before the classes are deleted.
+    """
+    archived = 0
+    for school_class in graduating:
+        homeworks = list(
+            Homework.objects.filter(school_class=school_class).select_related("subject")
+        )
+        if not homeworks:
+            continue
+
+        archived_class = get_archived_class(
+            school_year,
+            school_class,
+            sorted(school_class.students.values_list("pk", flat=True)),
+        )
+        archived_homeworks = ArchivedHomework.objects.bulk_create(
+            ArchivedHomework(
+                archived_class=archived_class,
+                teacher_id=homework.teacher_id,
+                subject_name=homework.subject.name,
+                title=homework.title,
+                description=homework.description,
+                created=homework.created,
+                completion_date=homework.completion_date,
+            )
+            for homework in homeworks
+        )
+        move_attached_files(
+            Homework,
+            ArchivedHomework,
+            [homework.pk for homework in homeworks],
+            [archived_homework.pk for archived_homework in archived_homeworks],
+        )
+
+        archived_pks = {
+            homework.pk: archived_homework.pk
+            for homework, archived_homework in zip(homeworks, archived_homeworks)
+        }
+        realisations = list(
+            HomeworkRealisation.objects.filter(homework__in=homeworks).values(
+                "pk", "homework_id", "student_id", "submission_date"
+            )
+        )
+        archived_realisations = ArchivedHomeworkRealisation.objects.bulk_create(
+            (
+                ArchivedHomeworkRealisation(
+                    homework_id=archived_pks[realisation["homework_id"]],
+                    student_id=realisation["student_id"],
+                    submission_date=realisation["submission_date"],
+                )
+                for realisation in realisations
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        move_attached_files(
+            HomeworkRealisation,
+            ArchivedHomeworkRealisation,
+            [realisation["pk"] for realisation in realisations],
+            [archived.pk for archived in archived_realisations],
+        )
+        archived += len(homeworks)
+
+    return archived
+
+
+def delete_event_statuses(school, before):
+    # only tell whether the users have seen the events
+    return EventStatus.objects.filter(
+        event__school=school, event__date__lt=before
+    ).delete()[0]
+
+
+def get_numbered_classes(school):
+    """
+    Returns the classes with numbers starting with a grade as tuples
+    of the grade, the rest of the number and the class.
+    """
+    classes = []
+    for school_class in Class.objects.filter(school=school):
+        match = CLASS_NUMBER_RE.match(school_class.number)
+        if match:
+            classes.append((int(match[1]), match[2], school_class))
+
+    return classes
+
+
+def get_graduating_classes(school, final_grade):
+    return [
+        school_class
+        for grade, _, school_class in get_numbered_classes(school)
+        if grade >= final_grade
+    ]
+
+
+def promote_classes(school, final_grade):
+    """
+    Moves the classes to the next grade, e.g. 1a becomes 2a, and removes
+    the classes of the final grade, whose students graduate. The classes
+    with numbers not starting with a grade are left unchanged. The rows
+    of the graduating classes have to be archived first.
+    """
+    promoted = graduated = 0
+    # the higher grades go first, so the numbers they free can be taken
+    for grade, suffix, school_class in sorted(
+        get_numbered_classes(school), key=lambda item: item[0], reverse=True
+    ):
+        if grade >= final_grade:
+            school_class.students.update(school_class=None)
+            school_class.delete()
+            graduated += 1
+        else:
+            school_class.number = f"{grade + 1}{suffix}"
+            school_class.slug = slugify(school_class.number)
+            school_class.save()
+            promoted += 1
+
+    return promoted, graduated
+
+
+def roll_over(school, name, start_date, end_date, final_grade):
+    """
+    Starts a new school year: the rows of the closed year are moved
+    to the archive, the classes are promoted and the previous year is closed.
+    """
+    with transaction.atomic():
+        closed_year = (
+            SchoolYear.objects.select_for_update().filter(school=school).open().first()
+        )
+        if closed_year is None:
+            raise RolloverError("There is no open school year to close.")
+        if start_date <= closed_year.start_date:
+            raise RolloverError(
+                f"The new school year has to start after {closed_year.start_date}."
+            )
+
+        new_year = SchoolYear(
+            school=school, name=name, start_date=start_date, end_date=end_date
+        )
+        new_year.full_clean()
+        new_year.save()
+
+        graduating = get_graduating_classes(school, final_grade)
+        summary = {
+            "grades": archive_grades(closed_year, school, start_date),
+            "attendances": archive_attendances(
+                closed_year, school, start_date, graduating
+            ),
+            "homeworks": archive_homeworks(closed_year, graduating),
+            "event_statuses": delete_event_statuses(school, start_date),
+        }
+        summary["promoted"], summary["graduated"] = promote_classes(school, final_grade)
+
+        closed_year.is_closed = True
+        closed_year.save()
+        # the rows changed in bulk, without the signals
+        bump_model_versions(Grade, Attendance, User)
+
+    return closed_year, new_year, summary
@@ -0,0 +1,15 @@
+from django.urls import path
+
+from django_school.apps.archive.views import (school_year_detail_view,
+                                              school_year_list_view)
+
+app_name = "archive"
+
+urlpatterns = [
+    path("<slug:student_slug>/", school_year_list_view, name="school_year_list"),
+    path(
+        "<slug:student_slug>/<int:school_year_pk>/",
+        school_year_detail_view,
+        name="school_year_detail",
+    ),
+]
@@ -0,0 +1,74 @@
+from itertools import groupby
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.decorators import login_required
+from django.db.models import Exists, OuterRef
+from django.shortcuts import get_object_or_404, render
+
+from django_school.apps.archive.attendance import get_student_attendance
+from django_school.apps.archive.models import ArchivedClass, ArchivedGrade
+from django_school.apps.common.routers import read_only
+from django_school.apps.lessons.models import Attendance
+from django_school.apps.monitoring.utils import query_budget
+from django_school.apps.schools.models import SchoolYear
+
+User = get_user_model()
+
+
+@query_budget(8)
+@read_only
+@login_required
+def school_year_list_view(request, student_slug):
+    student = get_object_or_404(
+        User.students.visible_to_user(request.user), slug=student_slug
+    )
+    school_years = SchoolYear.objects.closed().filter(
+        Exists(
+            ArchivedGrade.objects.filter(school_year=OuterRef("pk"), student=student)
+        )
+        | Exists(
+            ArchivedClass.objects.filter(
+                school_year=OuterRef("pk"), student_ids__contains=[student.pk]
+            )
+        )
+    )
+
+    ctx = {"student": student, "school_years": school_years}
+
+    return render(request, "archive/school_year_list.html", ctx)
+
+
+@query_budget(11)
+@read_only
+@login_required
+def school_year_detail_view(request, student_slug, school_year_pk):
+    student = get_object_or_404(
+        User.students.visible_to_user(request.user), slug=student_slug
+    )
+    school_year = get_object_or_404(SchoolYear.objects.closed(), pk=school_year_pk)
+
+    grades = ArchivedGrade.objects.filter(school_year=school_year, student=student)
+    subjects = []
+    for subject_name, subject_grades in groupby(grades, lambda g: g.subject_name):
+        subject_grades = list(subject_grades)
+        average = sum(g.grade * g.weight for g in subject_grades) / sum(
+            g.weight for g in subject_grades
+        )
+        subjects.append((subject_name, subject_grades, average))
+
+    attendance = get_student_attendance(school_year, student)
+    del attendance["none"]
+
+    ctx = {
+        "student": student,
+        "school_year": school_year,
+        "subjects": subjects,
+        "attendance": [
+            (label, attendance[status])
+            for status, label in Attendance.ATTENDANCE_STATUSES
+            if status != "none"
+        ],
+        "total_attendance": sum(attendance.values()),
+    }
+
+    return render(request, "archive/school_year_detail.html", ctx)
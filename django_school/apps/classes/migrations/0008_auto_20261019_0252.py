@@ -0,0 +1,63 @@
+# Generated by Django 3.2.7 on 2026-10-19 02:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schools", "0001_initial"),
+        ("classes", "0007_alter_class_number"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="class",
+            name="school",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="schools.school",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="class",
+            name="number",
+            field=models.CharField(max_length=32),
+        ),
+        migrations.AlterField(
+            model_name="class",
+            name="slug",
+            field=models.SlugField(blank=True),
+        ),
+        migrations.AddConstraint(
+            model_name="class",
+            constraint=models.UniqueConstraint(
+                fields=("school", "number"), name="unique_class_number_in_school"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="class",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("school", None)),
+                fields=("number",),
+                name="unique_class_number_without_school",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="class",
+            constraint=models.UniqueConstraint(
+                fields=("school", "slug"), name="unique_class_slug_in_school"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="class",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("school", None)),
+                fields=("slug",),
+                name="unique_class_slug_without_school",
+            ),
+        ),
+    ]
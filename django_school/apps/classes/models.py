@@ -4,23 +4,29 @@ from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 
+from django_school.apps.schools.models import (SchoolScopedManager,
+                                               SchoolScopedModel,
+                                               unique_in_school_constraints)
+
 
 class ClassQuerySet(models.QuerySet):
     def with_students(self):
         return self.select_related("tutor").prefetch_related("students")
 
     def visible_to_user(self, user):
+        from django_school.apps.lessons.utils import get_taught_classes_ids
+
         if user.is_teacher:
-            return self.filter(lessons__teacher=user).distinct()
+            return self.filter(pk__in=get_taught_classes_ids(user))
         elif user.is_student:
             return self.filter(pk=user.school_class_id)
         elif user.is_parent:
             return self.filter(pk=user.child.school_class_id)
 
 
-class Class(models.Model):
-    number = models.CharField(max_length=32, unique=True)
-    slug = models.SlugField(unique=True, blank=True)
+class Class(SchoolScopedModel):
+    number = models.CharField(max_length=32)
+    slug = models.SlugField(blank=True)
     tutor = models.OneToOneField(
         settings.AUTH_USER_MODEL,
         models.SET_NULL,
@@ -28,10 +34,13 @@ class Class(models.Model):
         related_name="teacher_class",
     )
 
-    objects = ClassQuerySet.as_manager()
+    objects = SchoolScopedManager.from_queryset(ClassQuerySet)()
+
+    unique_in_school = ["number", "slug"]
 
     class Meta:
         verbose_name_plural = "classes"
+        constraints = unique_in_school_constraints("class", "number", "slug")
 
     def __str__(self):
         return self.number
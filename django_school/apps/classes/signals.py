@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from django_school.apps.classes.models import Class
+from django_school.apps.common.cache import bump_model_versions
+
+
+@receiver([post_save, post_delete], sender=Class)
+def bump_classes_version(sender, **kwargs):
+    bump_model_versions(Class)
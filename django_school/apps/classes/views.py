@@ -7,12 +7,15 @@ from django.views.generic.detail import SingleObjectMixin
 from django_weasyprint import WeasyTemplateView
 
 from django_school.apps.classes.models import Class
+from django_school.apps.common.routers import read_only
 from django_school.apps.common.utils import RolesRequiredMixin
+from django_school.apps.monitoring.utils import query_budget
 from django_school.apps.users.models import ROLES
 
 User = get_user_model()
 
 
+@query_budget(8)
 class ClassListView(LoginRequiredMixin, RolesRequiredMixin(ROLES.TEACHER), ListView):
     model = Class
     ordering = ["number"]
@@ -23,6 +26,7 @@ class ClassListView(LoginRequiredMixin, RolesRequiredMixin(ROLES.TEACHER), ListV
         return super().get_queryset().visible_to_user(self.request.user)
 
 
+@query_budget(10)
 class ClassDetailView(
     LoginRequiredMixin, RolesRequiredMixin(ROLES.TEACHER), DetailView
 ):
@@ -41,6 +45,8 @@ class ClassDetailView(
         )
 
 
+@query_budget(12)
+@read_only
 class ClassSummaryPDFView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER),
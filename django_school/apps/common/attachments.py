@@ -0,0 +1,87 @@
+"""
+Compares the attachments storage with the AttachedFile rows. Both sides are
+read in batches, so the memory use doesn't depend on the number of files.
+"""
+import os
+import posixpath
+import shutil
+import time
+
+from django.db.models import Q
+
+from django_school.apps.common.models import AttachedFile
+from django_school.apps.common.previews import get_original_name
+
+BATCH_SIZE = 1000
+
+
+def _batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def walk_storage(storage, directory):
+    """Yields the names and the modification times of the files in the directory."""
+    directories = [directory]
+    while directories:
+        current = directories.pop()
+        try:
+            entries = os.scandir(storage.path(current))
+        except FileNotFoundError:
+            continue
+
+        with entries:
+            for entry in entries:
+                name = posixpath.join(current, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(name)
+                elif entry.is_file(follow_symlinks=False):
+                    yield name, entry.stat().st_mtime
+
+
+def find_orphans(storage, directory, min_age, batch_size=BATCH_SIZE):
+    """
+    Yields the names of the files no row references. The files modified
+    within min_age seconds are skipped, they may belong to an upload
+    in progress or to a row which hasn't been committed yet.
+    """
+    modified_before = time.time() - min_age
+    files = (
+        name
+        for name, modified in walk_storage(storage, directory)
+        if modified < modified_before
+    )
+    for batch in _batches(files, batch_size):
+        # the previews are referenced with their files
+        originals = {name: get_original_name(name) for name in batch}
+        referenced = set(
+            AttachedFile.objects.filter(file__in=originals.values()).values_list(
+                "file", flat=True
+            )
+        )
+        yield from (name for name in batch if originals[name] not in referenced)
+
+
+def find_missing(storage, batch_size=BATCH_SIZE):
+    """Yields the names of the files referenced by the rows but not stored."""
+    names = (
+        AttachedFile.objects.exclude(Q(file="") | Q(file__isnull=True))
+        .order_by("file")
+        .values_list("file", flat=True)
+        .distinct()
+        .iterator(chunk_size=batch_size)
+    )
+    yield from (name for name in names if not storage.exists(name))
+
+
+def quarantine(storage, name, directory):
+    """Moves the file to the directory, keeping its path within the storage."""
+    target = os.path.join(directory, *name.split("/"))
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    shutil.move(storage.path(name), target)
@@ -0,0 +1,68 @@
+import time
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection, transaction
+
+from django_school.apps.common.routers import current_replica
+
+
+def _get_version_key(name):
+    return f"versions:{name}"
+
+
+def get_version(name):
+    # starts from a timestamp instead of 1, so a counter evicted from the cache
+    # never repeats a version used before
+    return cache.get_or_set(_get_version_key(name), time.time_ns, timeout=None)
+
+
+def bump_version(name):
+    try:
+        return cache.incr(_get_version_key(name))
+    except ValueError:
+        return get_version(name)
+
+
+def is_cache_shared():
+    # the per-process memory of a worker isn't invalidated by the changes made
+    # by the other workers, so nothing that can change is cached in it
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+def can_be_cached():
+    # data read inside an unfinished transaction may still be rolled back,
+    # and data read from a replica may be older than the invalidation
+    return (
+        is_cache_shared()
+        and not connection.in_atomic_block
+        and current_replica.get() is None
+    )
+
+
+def get_model_version_name(model):
+    return f"models:{model._meta.label_lower}"
+
+
+def get_model_versions(models):
+    # a single round trip to the cache, unless some of the counters are missing
+    names = [get_model_version_name(model) for model in models]
+    versions = cache.get_many([_get_version_key(name) for name in names])
+
+    return [versions.get(_get_version_key(name)) or get_version(name) for name in names]
+
+
+def bump_model_versions(*models):
+    """
+    Tells that rows of the models have changed. Called by the receivers of
+    post_save and post_delete, and after the bulk operations, which don't send
+    the signals. The versions are bumped after the commit, otherwise a page
+    rendered from the old rows in the meantime would get the new versions.
+    """
+    names = [get_model_version_name(model) for model in models]
+
+    def bump():
+        for name in names:
+            bump_version(name)
+
+    transaction.on_commit(bump)
@@ -0,0 +1,22 @@
+import datetime
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from django_school.apps.common.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes the idempotency keys older than IDEMPOTENCY_KEY_TTL, "
+        "the requests retried with them are handled again."
+    )
+
+    def handle(self, *args, **options):
+        expired = timezone.now() - datetime.timedelta(
+            seconds=settings.IDEMPOTENCY_KEY_TTL
+        )
+        count, _ = IdempotencyKey.objects.filter(created__lt=expired).delete()
+
+        self.stdout.write(f"Deleted {count} idempotency keys")
@@ -0,0 +1,67 @@
+import os
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from django_school.apps.common.attachments import (find_missing, find_orphans,
+                                                   quarantine)
+from django_school.apps.common.models import AttachedFile
+
+
+class Command(BaseCommand):
+    help = (
+        "Finds the attached files which aren't referenced by any row "
+        "and the rows whose files are missing. The orphans are only listed "
+        "unless --delete or --quarantine is given."
+    )
+
+    def add_arguments(self, parser):
+        action = parser.add_mutually_exclusive_group()
+        action.add_argument(
+            "--delete", action="store_true", help="Deletes the orphaned files."
+        )
+        action.add_argument(
+            "--quarantine",
+            metavar="DIRECTORY",
+            help="Moves the orphaned files to the directory outside of the storage.",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=settings.ATTACHMENTS_GC_MIN_AGE,
+            help="Skips the files modified within the number of seconds.",
+        )
+
+    def handle(self, *args, **options):
+        field = AttachedFile._meta.get_field("file")
+        storage, directory = field.storage, field.upload_to.rstrip("/")
+
+        root = os.path.abspath(storage.path(directory))
+        if options["quarantine"] and os.path.abspath(options["quarantine"]).startswith(
+            root
+        ):
+            raise CommandError(f"The quarantine has to be outside of {root}.")
+
+        orphans = 0
+        for name in find_orphans(storage, directory, options["min_age"]):
+            orphans += 1
+            if options["delete"]:
+                storage.delete(name)
+            elif options["quarantine"]:
+                quarantine(storage, name, options["quarantine"])
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Orphaned: {name}")
+
+        missing = 0
+        for name in find_missing(storage):
+            missing += 1
+            self.stdout.write(f"Missing: {name}")
+
+        if options["delete"]:
+            action = "deleted"
+        elif options["quarantine"]:
+            action = "quarantined"
+        else:
+            action = "found"
+        self.stdout.write(f"Orphaned files {action}: {orphans}")
+        self.stdout.write(f"Missing files: {missing}")
@@ -0,0 +1,456 @@
+import csv
+import datetime
+import io
+import random
+import time
+from collections import defaultdict
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from django_school.apps.classes.models import Class
+from django_school.apps.common.management.commands.populatedb import (
+    GRADE_CATEGORIES, SUBJECTS)
+from django_school.apps.events.models import Event, EventStatus
+from django_school.apps.grades.models import Grade, GradeCategory
+from django_school.apps.lessons.models import (Attendance, Homework,
+                                               HomeworkRealisation, Lesson,
+                                               LessonSession, Subject)
+from django_school.apps.lessons.utils import invalidate_teaching_assignments
+from django_school.apps.messages.models import Message, MessageStatus
+from django_school.apps.schools.models import School
+from django_school.apps.users.backends import invalidate_all_request_users
+from django_school.apps.users.models import ROLES
+
+User = get_user_model()
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri"]
+ATTENDANCE_STATUSES = ["present"] * 16 + ["absent", "absent", "exempt", "excused"]
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _copy_rows(model, fields, rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    quote_name = connection.ops.quote_name
+    table = quote_name(model._meta.db_table)
+    columns = ", ".join(quote_name(model._meta.get_field(f).column) for f in fields)
+
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH CSV", buffer)
+
+
+def insert_rows(model, fields, rows, batch_size):
+    """
+    Inserts the rows (tuples of values of the given fields) in chunks, so they are
+    never kept in memory at once. Uses COPY on PostgreSQL, bulk_create elsewhere.
+    Returns the number of inserted rows.
+    """
+    count = 0
+
+    for chunk in chunked(rows, batch_size):
+        if connection.vendor == "postgresql":
+            _copy_rows(model, fields, chunk)
+        else:
+            model.objects.bulk_create(
+                [model(**dict(zip(fields, row))) for row in chunk]
+            )
+        count += len(chunk)
+
+    return count
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a synthetic school of the given size, "
+        "e.g. to profile the application against a realistic amount of data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--classes", type=int, default=10)
+        parser.add_argument("--students-per-class", type=int, default=25)
+        parser.add_argument("--teachers", type=int, default=20)
+        parser.add_argument("--lessons-per-subject", type=int, default=2)
+        parser.add_argument(
+            "--weeks", type=int, default=4, help="Weeks of lesson sessions history."
+        )
+        parser.add_argument("--grades-per-subject", type=int, default=5)
+        parser.add_argument("--homeworks-per-class", type=int, default=5)
+        parser.add_argument("--messages-per-user", type=int, default=2)
+        parser.add_argument("--events-per-class", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--prefix",
+            default="gen",
+            help="Prefix of generated usernames, class numbers and slugs.",
+        )
+        parser.add_argument(
+            "--password", default="password", help="Password of all generated users."
+        )
+        parser.add_argument(
+            "--domain",
+            help="The host the school is served at, <prefix>.localhost by default.",
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.options = options
+        self.batch_size = options["batch_size"]
+        self.prefix = options["prefix"]
+        self.today = timezone.now().date()
+
+        with transaction.atomic():
+            for step in [
+                self.create_school,
+                self.create_subjects,
+                self.create_teachers,
+                self.create_classes,
+                self.create_students_and_parents,
+                self.create_lessons,
+                self.create_lesson_sessions_and_attendances,
+                self.create_grades,
+                self.create_homeworks,
+                self.create_events,
+                self.create_messages,
+            ]:
+                start = time.perf_counter()
+                result = step()
+                elapsed = time.perf_counter() - start
+                self.stdout.write(f"{step.__name__}: {result} ({elapsed:.2f}s)")
+
+        # bulk inserts do not send signals
+        invalidate_teaching_assignments()
+        invalidate_all_request_users()
+
+    def create_school(self):
+        self.school = School.objects.create(
+            name=f"{self.prefix} school",
+            slug=self.prefix,
+            domain=self.options["domain"] or f"{self.prefix}.localhost",
+        )
+
+        return f"school {self.school.domain}"
+
+    def create_subjects(self):
+        self.subjects = [
+            Subject.objects.get_or_create(school=self.school, name=name)[0]
+            for name in SUBJECTS
+        ]
+
+        return f"{len(self.subjects)} subjects"
+
+    def _make_user(self, username, role, **kwargs):
+        return User(
+            username=username,
+            slug=username,
+            first_name=username.split("-")[-2].capitalize(),
+            last_name=username.split("-")[-1],
+            role=role,
+            password=self.password,
+            school=self.school,
+            **kwargs,
+        )
+
+    def create_teachers(self):
+        self.password = make_password(self.options["password"])
+        self.teachers = User.objects.bulk_create(
+            [
+                self._make_user(f"{self.prefix}-teacher-{i}", ROLES.TEACHER)
+                for i in range(self.options["teachers"])
+            ]
+        )
+
+        return f"{len(self.teachers)} teachers"
+
+    def create_classes(self):
+        classes = []
+        for i in range(self.options["classes"]):
+            number = f"{self.prefix}-{i}"
+            tutor = self.teachers[i] if i < len(self.teachers) else None
+            classes.append(
+                Class(number=number, slug=number, tutor=tutor, school=self.school)
+            )
+
+        self.classes = Class.objects.bulk_create(classes)
+
+        return f"{len(self.classes)} classes"
+
+    def create_students_and_parents(self):
+        self.students_ids = {}
+
+        for school_class in self.classes:
+            students = User.objects.bulk_create(
+                [
+                    self._make_user(
+                        f"{self.prefix}-student-{school_class.pk}_{i}",
+                        ROLES.STUDENT,
+                        school_class=school_class,
+                    )
+                    for i in range(self.options["students_per_class"])
+                ],
+                batch_size=self.batch_size,
+            )
+            self.students_ids[school_class.pk] = [student.pk for student in students]
+
+        students_count = sum(len(ids) for ids in self.students_ids.values())
+        parents = (
+            self._make_user(
+                f"{self.prefix}-parent-{student_id}", ROLES.PARENT, child_id=student_id
+            )
+            for ids in self.students_ids.values()
+            for student_id in ids
+        )
+        for chunk in chunked(parents, self.batch_size):
+            User.objects.bulk_create(chunk)
+
+        return f"{students_count} students and parents"
+
+    def create_lessons(self):
+        slots = [
+            (lesson_time, weekday)
+            for lesson_time, _ in Lesson.LESSONS_TIMES
+            for weekday in WEEKDAYS
+        ]
+        busy_teachers = set()
+        lessons = []
+
+        for school_class in self.classes:
+            class_slots = iter(self.random.sample(slots, len(slots)))
+
+            for subject in self.subjects:
+                for _ in range(self.options["lessons_per_subject"]):
+                    lesson_time, weekday = next(class_slots, (None, None))
+                    if lesson_time is None:
+                        break
+
+                    teachers = self.random.sample(self.teachers, len(self.teachers))
+                    teacher = next(
+                        (
+                            t
+                            for t in teachers
+                            if (t.pk, lesson_time, weekday) not in busy_teachers
+                        ),
+                        None,
+                    )
+                    if teacher is None:
+                        continue
+
+                    busy_teachers.add((teacher.pk, lesson_time, weekday))
+                    lessons.append(
+                        Lesson(
+                            time=lesson_time,
+                            weekday=weekday,
+                            classroom=self.random.randint(1, 100),
+                            subject=subject,
+                            teacher=teacher,
+                            school_class=school_class,
+                        )
+                    )
+
+        self.lessons = Lesson.objects.bulk_create(lessons, batch_size=self.batch_size)
+
+        return f"{len(self.lessons)} lessons"
+
+    def _get_lesson_dates(self, lesson):
+        monday = self.today - datetime.timedelta(days=self.today.weekday())
+        offset = WEEKDAYS.index(lesson.weekday)
+
+        for week in range(self.options["weeks"]):
+            date = monday - datetime.timedelta(weeks=week) + datetime.timedelta(offset)
+            if date <= self.today:
+                yield date
+
+    def create_lesson_sessions_and_attendances(self):
+        sessions_count = 0
+        attendances_count = 0
+
+        for lessons in chunked(self.lessons, max(self.batch_size // 10, 1)):
+            sessions = LessonSession.objects.bulk_create(
+                [
+                    LessonSession(lesson=lesson, date=date, topic=f"Topic {date}")
+                    for lesson in lessons
+                    for date in self._get_lesson_dates(lesson)
+                ]
+            )
+            attendances = (
+                (student_id, session.pk, self.random.choice(ATTENDANCE_STATUSES))
+                for session in sessions
+                for student_id in self.students_ids[session.lesson.school_class_id]
+            )
+            sessions_count += len(sessions)
+            attendances_count += insert_rows(
+                Attendance,
+                ["student_id", "lesson_session_id", "status"],
+                attendances,
+                self.batch_size,
+            )
+
+        return f"{sessions_count} lesson sessions, {attendances_count} attendances"
+
+    def create_grades(self):
+        taught = {
+            (lesson.school_class_id, lesson.subject_id): lesson.teacher_id
+            for lesson in self.lessons
+        }
+        categories = GradeCategory.objects.bulk_create(
+            [
+                GradeCategory(
+                    name=GRADE_CATEGORIES[i % len(GRADE_CATEGORIES)],
+                    school_class_id=school_class_id,
+                    subject_id=subject_id,
+                )
+                for school_class_id, subject_id in taught
+                for i in range(self.options["grades_per_subject"])
+            ],
+            batch_size=self.batch_size,
+        )
+        now = timezone.now()
+        grades = (
+            (
+                self.random.choice(Grade.GRADES)[0],
+                self.random.randint(1, 5),
+                now,
+                False,
+                False,
+                category.pk,
+                category.subject_id,
+                student_id,
+                taught[(category.school_class_id, category.subject_id)],
+            )
+            for category in categories
+            for student_id in self.students_ids[category.school_class_id]
+        )
+        grades_count = insert_rows(
+            Grade,
+            [
+                "grade",
+                "weight",
+                "created",
+                "seen_by_student",
+                "seen_by_parent",
+                "category_id",
+                "subject_id",
+                "student_id",
+                "teacher_id",
+            ],
+            grades,
+            self.batch_size,
+        )
+
+        return f"{len(categories)} grade categories, {grades_count} grades"
+
+    def create_homeworks(self):
+        lessons_by_class = defaultdict(list)
+        for lesson in self.lessons:
+            lessons_by_class[lesson.school_class_id].append(lesson)
+
+        homeworks = Homework.objects.bulk_create(
+            [
+                Homework(
+                    title=f"Homework {i}",
+                    description=f"Homework {i} of {lesson.subject.name}",
+                    completion_date=self.today
+                    + datetime.timedelta(days=self.random.randint(-14, 14)),
+                    teacher_id=lesson.teacher_id,
+                    school_class_id=school_class_id,
+                    subject_id=lesson.subject_id,
+                )
+                for school_class_id, lessons in lessons_by_class.items()
+                for i in range(self.options["homeworks_per_class"])
+                for lesson in [self.random.choice(lessons)]
+            ],
+            batch_size=self.batch_size,
+        )
+        now = timezone.now()
+        realisations = (
+            (now, homework.pk, student_id)
+            for homework in homeworks
+            for student_id in self.students_ids[homework.school_class_id]
+            if self.random.random() < 0.5
+        )
+        realisations_count = insert_rows(
+            HomeworkRealisation,
+            ["submission_date", "homework_id", "student_id"],
+            realisations,
+            self.batch_size,
+        )
+
+        return f"{len(homeworks)} homeworks, {realisations_count} realisations"
+
+    def create_events(self):
+        events = Event.objects.bulk_create(
+            [
+                Event(
+                    title=f"Event {i}",
+                    description=f"Event {i} of class {school_class.number}",
+                    date=self.today
+                    + datetime.timedelta(days=self.random.randint(-30, 30)),
+                    teacher=self.random.choice(self.teachers),
+                    school_class=school_class,
+                    school=self.school,
+                )
+                for school_class in self.classes
+                for i in range(self.options["events_per_class"])
+            ],
+            batch_size=self.batch_size,
+        )
+        statuses = (
+            (event.pk, student_id, self.random.random() < 0.5)
+            for event in events
+            for student_id in self.students_ids[event.school_class_id]
+        )
+        statuses_count = insert_rows(
+            EventStatus, ["event_id", "user_id", "seen"], statuses, self.batch_size
+        )
+
+        return f"{len(events)} events, {statuses_count} event statuses"
+
+    def create_messages(self):
+        users_ids = [teacher.pk for teacher in self.teachers] + [
+            student_id for ids in self.students_ids.values() for student_id in ids
+        ]
+        messages_count = 0
+        statuses_count = 0
+
+        senders = (
+            sender_id
+            for sender_id in users_ids
+            for _ in range(self.options["messages_per_user"])
+        )
+        for chunk in chunked(senders, self.batch_size):
+            messages = Message.objects.bulk_create(
+                [
+                    Message(
+                        topic=f"Message from {sender_id}",
+                        content="Generated message",
+                        sender_id=sender_id,
+                    )
+                    for sender_id in chunk
+                ]
+            )
+            statuses = (
+                (message.pk, receiver_id, self.random.random() < 0.5)
+                for message in messages
+                for receiver_id in self.random.sample(users_ids, min(3, len(users_ids)))
+            )
+            messages_count += len(messages)
+            statuses_count += insert_rows(
+                MessageStatus,
+                ["message_id", "receiver_id", "is_read"],
+                statuses,
+                self.batch_size,
+            )
+
+        return f"{messages_count} messages, {statuses_count} message statuses"
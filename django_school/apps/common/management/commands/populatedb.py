@@ -1,5 +1,6 @@
 import datetime
 import random
+from collections import defaultdict
 
 from django.contrib.auth import get_user_model
 from django.core.management import BaseCommand
@@ -10,7 +11,8 @@ from django_school.apps.events.models import Event, EventStatus
 from django_school.apps.grades.models import Grade, GradeCategory
 from django_school.apps.lessons.models import (Attendance, Lesson,
                                                LessonSession, Subject)
-from django_school.apps.lessons.utils import find_closest_future_date
+from django_school.apps.lessons.utils import (find_closest_future_date,
+                                              invalidate_teaching_assignments)
 from django_school.apps.users.models import ROLES
 
 User = get_user_model()
@@ -340,11 +342,17 @@ class Command(BaseCommand):
         )
 
         Lesson.objects.bulk_create(lessons)
+        # bulk_create does not send signals
+        invalidate_teaching_assignments()
 
         self.create_lesson_sessions_and_attendances(lessons)
 
     @staticmethod
     def create_lesson_sessions_and_attendances(lessons):
+        students = defaultdict(list)
+        for student in User.students.filter(school_class__isnull=False):
+            students[student.school_class_id].append(student)
+
         lesson_sessions = []
         attendances = []
         for lesson in lessons:
@@ -356,7 +364,7 @@ class Command(BaseCommand):
                 Attendance(
                     student=student, lesson_session=lesson_session, status=status
                 )
-                for student in lesson.school_class.students.all()
+                for student in students[lesson.school_class_id]
             ]
 
         LessonSession.objects.bulk_create(lesson_sessions)
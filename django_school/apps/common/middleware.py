@@ -0,0 +1,232 @@
+import hashlib
+import re
+from functools import lru_cache
+
+import brotli
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from django.utils.module_loading import import_string
+from django.utils.text import compress_string
+
+from django_school.apps.common.cache import get_model_versions, is_cache_shared
+from django_school.apps.common.routers import (current_replica, get_replica,
+                                               is_read_only)
+from django_school.apps.common.utils import get_etag_models
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_PRIMARY_COOKIE = "use_primary_db"
+
+# the responses are compressed on the fly, so a faster level is used
+BROTLI_QUALITY = 4
+MIN_COMPRESSED_LENGTH = 200
+COMPRESSED_CONTENT_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+)
+ACCEPT_ENCODING_RE = re.compile(r"^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*$")
+
+
+class ReplicaMiddleware:
+    """
+    Uses a replica for the GET requests of read-only views. After the client
+    changes something, its reads go to the primary for REPLICA_STICKINESS_SECONDS,
+    so it sees its own writes despite the replication lag.
+    The views with the ETags made of the model versions read from the primary,
+    the versions are bumped when the primary commits, so a page rendered from
+    a lagging replica could get the ETag of the newer rows. The clients having
+    the page get 304 without calling the view anyway.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            # the context of the thread is reused by the next requests
+            current_replica.set(None)
+
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                STICKY_PRIMARY_COOKIE,
+                "1",
+                max_age=settings.REPLICA_STICKINESS_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in SAFE_METHODS
+            and STICKY_PRIMARY_COOKIE not in request.COOKIES
+            and is_read_only(view_func)
+            and not has_versions_etag(view_func)
+        ):
+            current_replica.set(get_replica())
+
+
+def get_accepted_encodings(header):
+    """Returns the content codings accepted by the client, e.g. {"br", "gzip"}."""
+    accepted = set()
+    for item in header.split(","):
+        match = ACCEPT_ENCODING_RE.match(item)
+        if not match:
+            continue
+        try:
+            quality = float(match[2]) if match[2] else 1
+        except ValueError:
+            continue
+        if quality > 0:
+            accepted.add(match[1].lower())
+
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Compresses the text responses with Brotli or gzip, whichever the client
+    accepts, preferring Brotli. Has to be placed before the middleware
+    which reads or changes the content of the responses.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or len(response.content) < MIN_COMPRESSED_LENGTH
+            or not response.get("Content-Type", "").startswith(COMPRESSED_CONTENT_TYPES)
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        accepted = get_accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if "br" in accepted:
+            encoding = "br"
+            content = brotli.compress(
+                response.content, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY
+            )
+        elif "gzip" in accepted:
+            encoding = "gzip"
+            content = compress_string(response.content)
+        else:
+            return response
+
+        if len(content) >= len(response.content):
+            return response
+
+        response.content = content
+        response["Content-Length"] = str(len(content))
+        response["Content-Encoding"] = encoding
+        # the compressed content isn't byte-for-byte the same
+        etag = response.get("ETag")
+        if etag and not etag.startswith("W/"):
+            response["ETag"] = f"W/{etag}"
+
+        return response
+
+
+def has_versions_etag(view_func):
+    # the versions kept in the memory of a worker aren't bumped by the changes
+    # made by the other workers, so it would answer 304 for changed pages
+    return bool(get_etag_models(view_func)) and is_cache_shared()
+
+
+@lru_cache(maxsize=None)
+def _get_etag_context_processors():
+    return [import_string(path) for path in settings.ETAG_CONTEXT_PROCESSORS]
+
+
+def get_versions_etag(request, models):
+    """
+    Returns the weak ETag of the page showing the rows of the models to the user.
+    The pages also show the numbers of unseen items in the navigation bar, which
+    are counted by ETAG_CONTEXT_PROCESSORS, and the CSRF token.
+    """
+    parts = [
+        request.user.pk,
+        request.META.get("CSRF_COOKIE"),
+        get_model_versions(models),
+    ]
+    for processor in _get_etag_context_processors():
+        parts.append(sorted(processor(request).items()))
+
+    return f'W/"{hashlib.sha1(repr(parts).encode()).hexdigest()}"'
+
+
+def _etag_matches(etag, if_none_match):
+    # the weak comparison, the front-end server may drop the W/ prefix
+    etags = [
+        tag[2:] if tag.startswith("W/") else tag for tag in parse_etags(if_none_match)
+    ]
+    return "*" in etags or etag[2:] in etags
+
+
+class VersionETagMiddleware:
+    """
+    Adds the ETags made of the versions of the shown models to the GET responses
+    of the views marked with etag_from_versions, and responds with 304 Not Modified
+    before calling the view if the client has the page with the same ETag.
+    The ETags are only sent with a cache shared by the workers.
+    Has to be placed after ReplicaMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        etag = getattr(request, "versions_etag", None)
+        if (
+            etag is not None
+            and response.status_code == 200
+            and not response.has_header("ETag")
+            # the page may have been rendered from data older than the versions
+            and current_replica.get() is None
+            # or with the CSRF token set by the view
+            and request.META.get("CSRF_COOKIE") == request.versions_etag_csrf_cookie
+        ):
+            response["ETag"] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            not has_versions_etag(view_func)
+            or request.method not in ("GET", "HEAD")
+            # the page the client has wouldn't show the pending messages
+            or len(get_messages(request))
+        ):
+            return None
+
+        request.versions_etag = get_versions_etag(request, get_etag_models(view_func))
+        request.versions_etag_csrf_cookie = request.META.get("CSRF_COOKIE")
+        if _etag_matches(
+            request.versions_etag, request.META.get("HTTP_IF_NONE_MATCH", "")
+        ):
+            response = HttpResponseNotModified()
+            response["ETag"] = request.versions_etag
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return None
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.7 on 2026-10-19 03:28
+
+import os
+
+from django.db import migrations, models
+import django_school.apps.common.storage
+
+
+def set_filenames(apps, schema_editor):
+    AttachedFile = apps.get_model("common", "AttachedFile")
+
+    # the files stored before keep their names, so only the rows are updated
+    attached_files = list(AttachedFile.objects.only("file"))
+    for attached_file in attached_files:
+        attached_file.filename = os.path.basename(attached_file.file.name)
+    AttachedFile.objects.bulk_update(attached_files, ["filename"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0005_auto_20261019_0317'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachedfile',
+            name='filename',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='attachedfile',
+            name='file',
+            field=models.FileField(db_index=True, max_length=255, storage=django_school.apps.common.storage.ContentAddressedStorage(), upload_to='attached_files/'),
+        ),
+        migrations.RunPython(set_filenames, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.7 on 2026-10-19 04:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0006_auto_20261019_0328'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencykey',
+            name='request_hash',
+            field=models.CharField(default='', max_length=64),
+            preserve_default=False,
+        ),
+    ]
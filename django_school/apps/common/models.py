@@ -1,9 +1,14 @@
+import os
+
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.urls import reverse
 
+from django_school.apps.common.previews import get_preview_name
+from django_school.apps.common.storage import attachment_storage
+
 
 class Address(models.Model):
     street = models.CharField(max_length=128)
@@ -25,7 +30,14 @@ class Address(models.Model):
 
 
 class AttachedFile(models.Model):
-    file = models.FileField(upload_to="attached_files/")
+    # the same content is stored once, the rows share the file
+    file = models.FileField(
+        upload_to="attached_files/",
+        storage=attachment_storage,
+        max_length=255,
+        db_index=True,
+    )
+    filename = models.CharField(max_length=255, blank=True)
     creator = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     related_object_content_type = models.ForeignKey(
         ContentType, on_delete=models.CASCADE
@@ -39,6 +51,49 @@ class AttachedFile(models.Model):
     def __str__(self):
         return self.file.name
 
+    def save(self, *args, **kwargs):
+        if not self.filename:
+            # the name of the upload, the stored file is named after its content,
+            # has to be set explicitly for bulk_create
+            self.filename = os.path.basename(self.file.name)
+
+        super().save(*args, **kwargs)
+
+    @property
+    def download_url(self):
+        return reverse("attached_file_download", args=[self.pk])
+
+    @property
+    def preview_url(self):
+        return reverse("attached_file_preview", args=[self.pk])
+
+    @property
+    def has_preview(self):
+        return self.file.storage.exists(get_preview_name(self.file.name))
+
     @property
     def delete_url(self):
         return reverse("attached_file_delete", args=[self.pk])
+
+
+class IdempotencyKey(models.Model):
+    """The response to a request, returned again when the request is retried."""
+
+    key = models.CharField(max_length=64)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # the SHA-256 of the method, path and body, a key reused for another request
+    # is rejected instead of returning the response to the first one
+    request_hash = models.CharField(max_length=64)
+    created = models.DateTimeField(auto_now_add=True)
+    response = models.JSONField(null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="unique_idempotency_key"
+            )
+        ]
+        indexes = [models.Index(fields=["created"])]
+
+    def __str__(self):
+        return self.key
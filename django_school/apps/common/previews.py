@@ -0,0 +1,145 @@
+"""
+The previews of the attached images and PDFs are generated by a pool
+of threads after the files are committed and stored next to the files,
+e.g. attached_files/3a/3a7bd3e2...c1f4.pdf.preview.jpg. Like the files, they
+are named after the content and shared by the rows attaching the same file.
+"""
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+from PIL import Image, UnidentifiedImageError
+
+from django_school.apps.common.storage import TEMP_FILE_PREFIX
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_SUFFIX = ".preview.jpg"
+
+IMAGE_EXTENSIONS = {".bmp", ".gif", ".jpeg", ".jpg", ".png", ".tif", ".tiff", ".webp"}
+PDF_EXTENSIONS = {".pdf"}
+
+_executor = None
+
+
+def get_preview_name(name):
+    return f"{name}{PREVIEW_SUFFIX}"
+
+
+def get_original_name(name):
+    if name.endswith(PREVIEW_SUFFIX):
+        return name[: -len(PREVIEW_SUFFIX)]
+
+    return name
+
+
+def is_previewable(name):
+    extension = os.path.splitext(name)[1].lower()
+    # the PDFs are rendered by pdftoppm of poppler-utils, if it's installed
+    return extension in IMAGE_EXTENSIONS or (
+        extension in PDF_EXTENSIONS and shutil.which("pdftoppm") is not None
+    )
+
+
+def _render_pdf_page(path, output_path, size):
+    prefix = os.path.splitext(output_path)[0]
+    subprocess.run(
+        [
+            "pdftoppm",
+            "-jpeg",
+            "-f",
+            "1",
+            "-l",
+            "1",
+            "-scale-to",
+            str(max(size)),
+            "-singlefile",
+            path,
+            prefix,
+        ],
+        check=True,
+        capture_output=True,
+        timeout=60,
+    )
+
+
+def generate_preview(storage, name):
+    """Saves the preview of the stored file, returns its name or None."""
+    preview_name = get_preview_name(name)
+    if not is_previewable(name) or storage.exists(preview_name):
+        return None
+
+    preview_path = storage.path(preview_name)
+    fd, temp_path = tempfile.mkstemp(
+        prefix=TEMP_FILE_PREFIX, dir=os.path.dirname(preview_path)
+    )
+    os.close(fd)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            image_path = storage.path(name)
+            if os.path.splitext(name)[1].lower() in PDF_EXTENSIONS:
+                image_path = os.path.join(directory, "page.jpg")
+                _render_pdf_page(
+                    storage.path(name), image_path, settings.ATTACHMENT_PREVIEW_SIZE
+                )
+
+            with Image.open(image_path) as image:
+                # JPEGs are decoded at a reduced scale right away
+                image.draft("RGB", settings.ATTACHMENT_PREVIEW_SIZE)
+                image.thumbnail(settings.ATTACHMENT_PREVIEW_SIZE)
+                image.convert("RGB").save(temp_path, "JPEG", quality=80)
+
+        os.chmod(temp_path, storage.file_permissions_mode or 0o644)
+        os.replace(temp_path, preview_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return preview_name
+
+
+def _generate_preview(storage, name):
+    try:
+        generate_preview(storage, name)
+    except (
+        OSError,
+        Image.DecompressionBombError,
+        UnidentifiedImageError,
+        subprocess.SubprocessError,
+    ):
+        logger.exception("The preview of %s couldn't be generated.", name)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.ATTACHMENT_PREVIEW_WORKERS,
+            thread_name_prefix="previews",
+        )
+
+    return _executor
+
+
+def schedule_previews(attached_files):
+    """Generates the previews in the background after the files are committed."""
+    names = {
+        attached_file.file.name
+        for attached_file in attached_files
+        if is_previewable(attached_file.file.name)
+    }
+    if not names:
+        return
+
+    storage = attached_files[0].file.storage
+
+    def submit():
+        for name in names:
+            _get_executor().submit(_generate_preview, storage, name)
+
+    transaction.on_commit(submit)
@@ -0,0 +1,89 @@
+import itertools
+import logging
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# the replica chosen for the current request, None means the primary database
+current_replica = ContextVar("current_replica", default=None)
+
+# sessions are read right after they are written (e.g. after logging in),
+# so they must never be read from a lagging replica
+PRIMARY_ONLY_APPS = {"sessions"}
+
+_replicas_counter = itertools.count()
+_unhealthy_until = {}
+
+
+def read_only(view):
+    """
+    Marks the view, which only shows the data, so its queries can be sent to the
+    replicas. Writes performed by the view still go to the primary database.
+    """
+    view.read_only = True
+    return view
+
+
+def is_read_only(view_func):
+    view_class = getattr(view_func, "view_class", None)
+
+    return getattr(view_func, "read_only", False) or getattr(
+        view_class, "read_only", False
+    )
+
+
+def _is_healthy(alias):
+    if _unhealthy_until.get(alias, 0) > time.monotonic():
+        return False
+
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError:
+        logger.warning("The replica %s is unavailable", alias, exc_info=True)
+        _unhealthy_until[alias] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        return False
+
+    return True
+
+
+def get_replica():
+    """
+    Returns the next healthy replica (round-robin) or None if there is none.
+    An unavailable replica is skipped for REPLICA_RETRY_SECONDS.
+    """
+    replicas = settings.DATABASE_REPLICAS
+    if not replicas:
+        return None
+
+    start = next(_replicas_counter)
+    for i in range(len(replicas)):
+        alias = replicas[(start + i) % len(replicas)]
+        if _is_healthy(alias):
+            return alias
+
+    return None
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of the read-only views to the replica chosen for the request.
+    Everything else uses the primary database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return "default"
+
+        return current_replica.get()
+
+    def db_for_write(self, model, **hints):
+        # otherwise objects read from a replica would be saved to it
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas are copies of the primary database
+        return True
@@ -0,0 +1,40 @@
+import os
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from django_school.apps.common.models import AttachedFile
+from django_school.apps.common.previews import (get_preview_name,
+                                                schedule_previews)
+
+
+def _delete_unreferenced_file(storage, name):
+    # the storage touches a blob it reuses, a recently modified one may belong
+    # to an upload whose row hasn't been committed yet and is left to gc_attachments
+    try:
+        modified = os.path.getmtime(storage.path(name))
+    except FileNotFoundError:
+        return
+    if modified > time.time() - settings.ATTACHMENTS_GC_MIN_AGE:
+        return
+
+    if not AttachedFile.objects.filter(file=name).exists():
+        storage.delete(name)
+        storage.delete(get_preview_name(name))
+
+
+@receiver(post_save, sender=AttachedFile)
+def generate_preview(sender, instance, created, **kwargs):
+    # bulk_create doesn't send the signal, schedule_previews is called instead
+    if created:
+        schedule_previews([instance])
+
+
+@receiver(post_delete, sender=AttachedFile)
+def delete_file(sender, instance, **kwargs):
+    # the file may be shared by other rows, it's deleted with the last one
+    storage, name = instance.file.storage, instance.file.name
+    transaction.on_commit(lambda: _delete_unreferenced_file(storage, name))
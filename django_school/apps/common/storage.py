@@ -0,0 +1,120 @@
+import hashlib
+import os
+import posixpath
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import brotli
+import zopfli.gzip
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+TEMP_FILE_PREFIX = ".upload-"
+
+COMPRESSED_EXTENSIONS = {".css", ".js", ".json", ".map", ".svg", ".txt", ".xml"}
+# smaller files don't get smaller enough to be worth another request to the disk
+MIN_COMPRESSED_SIZE = 256
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores each file once under the SHA-256 digest of its content, e.g.
+    attached_files/3a/3a7bd3e2...c1f4.pdf.
+    The upload is hashed while it's written to a temporary file, which is then
+    renamed to the digest or dropped if the same content is stored already.
+    The files never change, so their names don't have to be made unique.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        directory, filename = posixpath.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        os.makedirs(self.path(directory), exist_ok=True)
+
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(
+            prefix=TEMP_FILE_PREFIX, dir=self.path(directory)
+        )
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+
+            hexdigest = digest.hexdigest()
+            name = posixpath.join(directory, hexdigest[:2], hexdigest + extension)
+            full_path = self.path(name)
+            if os.path.exists(full_path):
+                # tells the garbage collector the blob is being used again
+                os.utime(full_path)
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                os.replace(temp_path, full_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return name
+
+
+attachment_storage = ContentAddressedStorage()
+
+
+def compress_static_file(path):
+    """
+    Writes the Brotli and gzip variants of the file next to it, e.g. main.css.br
+    and main.css.gz, unless they aren't smaller. Returns the written paths.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+
+    written = []
+    for extension, compress in [
+        (".br", lambda data: brotli.compress(data, quality=11)),
+        # zopfli output is a valid gzip stream, a few percent smaller
+        (".gz", zopfli.gzip.compress),
+    ]:
+        compressed = compress(data)
+        if len(compressed) < len(data):
+            with open(f"{path}{extension}", "wb") as file:
+                file.write(compressed)
+            written.append(f"{path}{extension}")
+
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Stores the static files under the names with the hashes of their content,
+    so they can be cached forever, and precompresses them by worker processes
+    for the front-end server to send the .br or .gz variant as is.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        names = [
+            name
+            for name in self.hashed_files.values()
+            if os.path.splitext(name)[1] in COMPRESSED_EXTENSIONS
+            and self.size(name) >= MIN_COMPRESSED_SIZE
+        ]
+        with ProcessPoolExecutor(
+            max_workers=settings.STATICFILES_COMPRESS_WORKERS
+        ) as executor:
+            for name, written in zip(
+                names, executor.map(compress_static_file, map(self.path, names))
+            ):
+                for path in written:
+                    yield name, f"{name}{os.path.splitext(path)[1]}", True
@@ -1,11 +1,20 @@
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import zipfile
 from functools import wraps
+from urllib.parse import quote
 
+from django.conf import settings
 from django.core.exceptions import PermissionDenied
-from django.http import Http404
-from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, transaction
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
 
-from django_school.apps.classes.models import Class
-from django_school.apps.lessons.models import Lesson, Subject
+from django_school.apps.common.models import IdempotencyKey
+from django_school.apps.lessons.models import Lesson
+from django_school.apps.lessons.utils import get_teaching_assignments
 
 
 def RolesRequiredMixin(*roles):
@@ -33,12 +42,52 @@ def roles_required(*roles):
     return decorator
 
 
+def etag_from_versions(*models):
+    """
+    Declares the models whose rows the view shows. The ETag of its GET responses
+    is made of their versions, so the view isn't called again to render the page
+    the client has if none of the rows has changed. Works with function
+    and class-based views.
+    """
+
+    def decorator(view):
+        view.etag_models = models
+        return view
+
+    return decorator
+
+
+def get_etag_models(view_func):
+    models = getattr(view_func, "etag_models", None)
+    if models is None and hasattr(view_func, "view_class"):
+        models = getattr(view_func.view_class, "etag_models", None)
+
+    return models
+
+
 def does_the_teacher_teach_the_subject_to_the_class(teacher, subject, school_class):
-    return Lesson.objects.filter(
-        school_class=school_class,
-        subject=subject,
-        teacher=teacher,
-    ).exists()
+    return (school_class.pk, subject.pk) in get_teaching_assignments(teacher)
+
+
+def get_school_class_and_subject_or_404(teacher, class_slug, subject_slug):
+    """
+    Returns the class and the subject using a single query. Raises Http404 if any
+    of them does not exist or if the teacher does not teach the subject to the class.
+    """
+    lesson = (
+        Lesson.objects.filter(
+            teacher=teacher,
+            school_class__slug=class_slug,
+            subject__slug=subject_slug,
+        )
+        .select_related("school_class", "subject")
+        .first()
+    )
+
+    if lesson is None:
+        raise Http404
+
+    return lesson.school_class, lesson.subject
 
 
 class GetObjectCacheMixin:
@@ -79,18 +128,223 @@ def ajax_required(func):
     return wrapper
 
 
+def _get_request_hash(request):
+    request_hash = hashlib.sha256(
+        f"{request.method} {request.get_full_path()}\n".encode()
+    )
+    request_hash.update(request.body)
+
+    return request_hash.hexdigest()
+
+
+def idempotent(func):
+    """
+    Makes retries of a JSON view no-ops. The successful response is stored
+    with the key sent by the client in the Idempotency-Key header and returned
+    again for the same key, without calling the view. The changes made by
+    a failed request are rolled back, so it can be retried with the same key.
+    A key reused for a different request is answered with 422. The expired
+    keys are deleted by the delete_expired_idempotency_keys command.
+    """
+
+    @wraps(func)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get("Idempotency-Key", "")
+        max_length = IdempotencyKey._meta.get_field("key").max_length
+        if not key or len(key) > max_length:
+            return JsonResponse(
+                {
+                    "errors": [
+                        f"The Idempotency-Key header of up to {max_length} "
+                        f"characters is required."
+                    ]
+                },
+                status=400,
+            )
+
+        request_hash = _get_request_hash(request)
+        with transaction.atomic():
+            try:
+                # a concurrent request with the same key waits here until
+                # the first one commits
+                with transaction.atomic():
+                    idempotency_key = IdempotencyKey.objects.create(
+                        user=request.user, key=key, request_hash=request_hash
+                    )
+            except IntegrityError:
+                stored = IdempotencyKey.objects.get(user=request.user, key=key)
+                if stored.request_hash != request_hash:
+                    return JsonResponse(
+                        {
+                            "errors": [
+                                "The Idempotency-Key has been used "
+                                "for a different request."
+                            ]
+                        },
+                        status=422,
+                    )
+
+                return JsonResponse(stored.response)
+
+            response = func(request, *args, **kwargs)
+
+            if response.status_code == 200:
+                idempotency_key.response = json.loads(response.content)
+                idempotency_key.save(update_fields=["response"])
+            else:
+                transaction.set_rollback(True)
+
+        return response
+
+    return wrapper
+
+
+ZIP_CHUNK_SIZE = 64 * 1024
+
+
+class _ZipStream:
+    """A write-only file the archive is written to, emptied after each chunk."""
+
+    def __init__(self):
+        self._data = bytearray()
+
+    def write(self, data):
+        self._data += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = bytes(self._data)
+        self._data.clear()
+        return data
+
+
+def stream_zip(entries):
+    """
+    Yields a ZIP archive of the files built on the fly, so neither the archive
+    nor the files are held in memory. The entries are tuples of the name
+    in the archive, the FieldFile and the modification datetime. The files are
+    stored without compression, the attachments are mostly compressed already.
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_STORED) as archive:
+        for name, file, modified in entries:
+            info = zipfile.ZipInfo(name, modified.timetuple()[:6])
+            info.file_size = file.size
+            with file.open("rb"), archive.open(info, "w") as entry:
+                for chunk in file.chunks(ZIP_CHUNK_SIZE):
+                    entry.write(chunk)
+                    yield stream.pop()
+        yield stream.pop()
+    yield stream.pop()
+
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class _FileRange:
+    """The part of the file between the first and the last byte."""
+
+    def __init__(self, file, first, last):
+        file.seek(first)
+        self.file = file
+        self.remaining = last - first + 1
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _parse_range(header, size):
+    """
+    Returns the first and the last byte of a single range of the Range header,
+    or None if the whole file should be sent. The multiple ranges aren't
+    supported, they're answered with the whole file as the RFC allows.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or not any(match.groups()):
+        return None
+
+    first, last = match.groups()
+    if not first:
+        # the suffix range, e.g. the last 500 bytes
+        return max(size - int(last), 0), size - 1
+
+    return int(first), min(int(last), size - 1) if last else size - 1
+
+
+def _file_response(request, storage, name, filename, as_attachment):
+    size = storage.size(name)
+    byte_range = _parse_range(request.headers.get("Range", ""), size)
+
+    if byte_range is None:
+        response = FileResponse(
+            storage.open(name, "rb"), as_attachment=as_attachment, filename=filename
+        )
+        response["Content-Length"] = size
+    else:
+        first, last = byte_range
+        if first > last:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        response = FileResponse(
+            _FileRange(storage.open(name, "rb"), first, last),
+            status=206,
+            as_attachment=as_attachment,
+            filename=filename,
+        )
+        response["Content-Range"] = f"bytes {first}-{last}/{size}"
+        response["Content-Length"] = last - first + 1
+
+    response["Accept-Ranges"] = "bytes"
+
+    return response
+
+
+def serve_protected_file(request, storage, name, filename=None, as_attachment=True):
+    """
+    Sends the stored file, the permissions have to be checked by the view.
+    The transfer is handed to the front-end server if PROTECTED_FILES_HEADER
+    is set, otherwise Django streams the file itself.
+    """
+    filename = filename or os.path.basename(name)
+    header = settings.PROTECTED_FILES_HEADER
+    if not header:
+        return _file_response(request, storage, name, filename, as_attachment)
+
+    content_type, _ = mimetypes.guess_type(filename)
+    response = HttpResponse(content_type=content_type or "application/octet-stream")
+    if header == "X-Accel-Redirect":
+        response[header] = quote(f"{settings.PROTECTED_FILES_INTERNAL_URL}{name}")
+    else:
+        response[header] = storage.path(name)
+    disposition = "attachment" if as_attachment else "inline"
+    response[
+        "Content-Disposition"
+    ] = f"{disposition}; filename*=utf-8''{quote(filename)}"
+
+    return response
+
+
 class SubjectAndSchoolClassRelatedMixin:
     school_class = None
     subject = None
 
     def dispatch(self, request, *args, **kwargs):
-        self.school_class = get_object_or_404(Class, slug=self.kwargs["class_slug"])
-        self.subject = get_object_or_404(Subject, slug=self.kwargs["subject_slug"])
-
-        if not does_the_teacher_teach_the_subject_to_the_class(
-            self.request.user, self.subject, self.school_class
-        ):
-            raise Http404
+        self.school_class, self.subject = get_school_class_and_subject_or_404(
+            self.request.user, self.kwargs["class_slug"], self.kwargs["subject_slug"]
+        )
 
         return super().dispatch(request, *args, **kwargs)
 
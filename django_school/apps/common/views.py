@@ -1,15 +1,20 @@
-import os
-
 from django.contrib.auth.decorators import login_required
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.utils.cache import patch_cache_control
 
 from django_school.apps.common.models import AttachedFile
-from django_school.apps.common.utils import ajax_required, roles_required
+from django_school.apps.common.previews import get_preview_name
+from django_school.apps.common.routers import read_only
+from django_school.apps.common.utils import (ajax_required, roles_required,
+                                             serve_protected_file)
+from django_school.apps.monitoring.utils import query_budget
 from django_school.apps.users.models import ROLES
 
 
+@query_budget(4)
 def index(request):
     user = request.user
     if not request.user.is_authenticated:
@@ -22,6 +27,71 @@ def index(request):
         return redirect(user.grades_url)
 
 
+def _get_attached_file_or_404(user, pk):
+    attached_file = get_object_or_404(AttachedFile, pk=pk)
+
+    if not user.is_superuser:
+        # the file is visible with the lesson session, the homework
+        # or the homework realisation it's attached to
+        model = ContentType.objects.get_for_id(
+            attached_file.related_object_content_type_id
+        ).model_class()
+        if not (
+            hasattr(model.objects, "visible_to_user")
+            and model.objects.visible_to_user(user)
+            .filter(pk=attached_file.related_object_id)
+            .exists()
+        ):
+            raise Http404
+
+    return attached_file
+
+
+def _cache_forever(response):
+    # the files are stored by their content and never change
+    patch_cache_control(
+        response, private=True, max_age=365 * 24 * 60 * 60, immutable=True
+    )
+
+    return response
+
+
+@query_budget(5)
+@read_only
+@login_required
+def attached_file_download_view(request, pk):
+    attached_file = _get_attached_file_or_404(request.user, pk)
+
+    return _cache_forever(
+        serve_protected_file(
+            request,
+            attached_file.file.storage,
+            attached_file.file.name,
+            attached_file.filename,
+        )
+    )
+
+
+@query_budget(5)
+@read_only
+@login_required
+def attached_file_preview_view(request, pk):
+    attached_file = _get_attached_file_or_404(request.user, pk)
+
+    if not attached_file.has_preview:
+        raise Http404
+
+    return _cache_forever(
+        serve_protected_file(
+            request,
+            attached_file.file.storage,
+            get_preview_name(attached_file.file.name),
+            as_attachment=False,
+        )
+    )
+
+
+@query_budget(6)
 @login_required
 @roles_required(ROLES.TEACHER)
 @ajax_required
@@ -32,8 +102,6 @@ def attached_file_delete_view(request, pk):
         raise PermissionDenied
 
     if request.method == "POST":
-        path = attached_file.file.path
         attached_file.delete()
-        os.remove(path)
 
     return HttpResponse()
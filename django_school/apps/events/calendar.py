@@ -4,6 +4,8 @@ from collections import defaultdict
 
 from django.template.loader import get_template
 
+from django_school.apps.monitoring.metrics import span
+
 
 class EventCalendar(HTMLCalendar):
     event_template = get_template("events/event.html")
@@ -21,6 +23,7 @@ class EventCalendar(HTMLCalendar):
 
         super().__init__()
 
+    @span("events.calendar.formatday")
     def formatday(self, day, weekday):
         if not (self.year and self.month) or day == 0:
             return super().formatday(day, weekday)
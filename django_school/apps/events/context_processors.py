@@ -1,6 +1,8 @@
 from django_school.apps.events.models import EventStatus
+from django_school.apps.monitoring.metrics import span
 
 
+@span("context_processors.unseen_events_count")
 def unseen_events_count(request):
     if not request.user.is_authenticated:
         return {}
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.7 on 2026-10-19 02:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schools", "0001_initial"),
+        ("events", "0004_eventstatus"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="school",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="schools.school",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["school", "date"], name="events_even_school__bed229_idx"
+            ),
+        ),
+    ]
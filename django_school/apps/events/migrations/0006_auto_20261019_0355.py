@@ -0,0 +1,22 @@
+# Generated by Django 3.2.7 on 2026-10-19 03:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_auto_20261019_0252'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['school', 'updated_at'], name='events_even_school__4d1dfb_idx'),
+        ),
+    ]
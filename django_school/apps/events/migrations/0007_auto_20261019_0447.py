@@ -0,0 +1,26 @@
+# Generated by Django 3.2.7 on 2026-10-19 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_auto_20261019_0355'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='events_even_school__4d1dfb_idx',
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='updated_xid',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['school', 'updated_xid'], name='events_even_school__4d9e77_idx'),
+        ),
+    ]
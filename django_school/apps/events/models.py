@@ -7,6 +7,8 @@ from django.urls import reverse
 from django.utils import timezone
 
 from django_school.apps.classes.models import Class
+from django_school.apps.schools.models import (SchoolScopedManager,
+                                               SchoolScopedModel)
 
 User = get_user_model()
 
@@ -39,11 +41,15 @@ class EventQuerySet(models.QuerySet):
         return qs
 
 
-class Event(models.Model):
+class Event(SchoolScopedModel):
     title = models.CharField(max_length=32)
     description = models.TextField(max_length=256, blank=True, null=True)
     date = models.DateField()
     created = models.DateTimeField(auto_now_add=True)
+    # also set by a trigger on bulk updates, see the sync app
+    updated_at = models.DateTimeField(auto_now=True)
+    # the transaction which has written the row last, set by the trigger
+    updated_xid = models.BigIntegerField(default=0, editable=False)
     teacher = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -58,7 +64,13 @@ class Event(models.Model):
         null=True,
     )
 
-    objects = EventQuerySet.as_manager()
+    objects = SchoolScopedManager.from_queryset(EventQuerySet)()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["school", "date"]),
+            models.Index(fields=["school", "updated_xid"]),
+        ]
 
     def clean(self):
         super().clean()
@@ -90,7 +102,9 @@ class EventStatusManager(models.Manager):
                 | Q(child__school_class_id=event.school_class_id)
             )
             if event.school_class
-            else User.objects.exclude(pk=event.teacher_id)
+            else User.objects.filter(school_id=event.school_id).exclude(
+                pk=event.teacher_id
+            )
         )
         statuses = [EventStatus(event=event, user=user) for user in users_qs]
         self.model.objects.bulk_create(statuses)
@@ -12,9 +12,11 @@ from django_school.apps.common.utils import (AjaxRequiredMixin,
 from django_school.apps.events.calendar import EventCalendar
 from django_school.apps.events.forms import EventForm
 from django_school.apps.events.models import Event, EventStatus
+from django_school.apps.monitoring.utils import query_budget
 from django_school.apps.users.models import ROLES
 
 
+@query_budget(12)
 class EventsCalendarView(LoginRequiredMixin, TemplateView):
     template_name = "events/events.html"
 
@@ -73,6 +75,7 @@ class EventsCalendarView(LoginRequiredMixin, TemplateView):
         return year, month
 
 
+@query_budget(10)
 class EventCreateView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER),
@@ -91,6 +94,7 @@ class EventCreateView(
         return kwargs
 
 
+@query_budget(10)
 class EventUpdateView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER),
@@ -114,6 +118,7 @@ class EventUpdateView(
         return kwargs
 
 
+@query_budget(8)
 class EventDeleteView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER),
@@ -1,11 +1,19 @@
 from django.contrib import admin
 
+from django_school.apps.common.cache import bump_model_versions
 from django_school.apps.grades.models import Grade, GradeCategory
 
 
 @admin.register(Grade)
 class GradeAdmin(admin.ModelAdmin):
-    pass
+    # the grades don't send post_delete, see grades.signals
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        bump_model_versions(Grade)
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        bump_model_versions(Grade)
 
 
 @admin.register(GradeCategory)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GradesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "django_school.apps.grades"
+
+    def ready(self):
+        from . import signals
@@ -1,6 +1,8 @@
 from django_school.apps.grades.models import Grade
+from django_school.apps.monitoring.metrics import span
 
 
+@span("context_processors.unseen_grades_count")
 def unseen_grades_count(request):
     if not request.user.is_authenticated or request.user.is_teacher:
         return {}
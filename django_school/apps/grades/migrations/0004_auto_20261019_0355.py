@@ -0,0 +1,22 @@
+# Generated by Django 3.2.7 on 2026-10-19 03:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grades', '0003_auto_20220218_1449'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grade',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['student', 'updated_at'], name='grades_grad_student_22e6f8_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.7 on 2026-10-19 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grades', '0004_auto_20261019_0355'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='grade',
+            name='grades_grad_student_22e6f8_idx',
+        ),
+        migrations.AddField(
+            model_name='grade',
+            name='updated_xid',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['student', 'updated_xid'], name='grades_grad_student_9ee7b5_idx'),
+        ),
+    ]
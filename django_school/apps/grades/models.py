@@ -39,6 +39,16 @@ class GradeCategory(models.Model):
         return reverse("grades:add_in_bulk", args=[self.pk])
 
 
+class GradeQuerySet(models.QuerySet):
+    def visible_to_user(self, user):
+        if user.is_teacher:
+            return self.filter(teacher=user)
+        elif user.is_student:
+            return self.filter(student=user)
+        elif user.is_parent:
+            return self.filter(student_id=user.child_id)
+
+
 class Grade(models.Model):
     GRADES = [
         (1.0, "1"),
@@ -63,6 +73,10 @@ class Grade(models.Model):
     weight = models.PositiveIntegerField()
     comment = models.TextField(null=True, blank=True)
     created = models.DateTimeField(auto_now_add=True)
+    # also set by a trigger on bulk updates, see the sync app
+    updated_at = models.DateTimeField(auto_now=True)
+    # the transaction which has written the row last, set by the trigger
+    updated_xid = models.BigIntegerField(default=0, editable=False)
     seen_by_student = models.BooleanField(default=False)
     seen_by_parent = models.BooleanField(default=False)
     category = models.ForeignKey(
@@ -80,6 +94,11 @@ class Grade(models.Model):
         related_name="grades_added",
     )
 
+    objects = GradeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=["student", "updated_xid"])]
+
     def __str__(self):
         return f"{self.student}: {self.subject} - {self.grade}"
 
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from django_school.apps.common.cache import bump_model_versions
+from django_school.apps.grades.models import Grade, GradeCategory
+
+
+# a receiver of post_delete would make the rollover fetch each of the deleted
+# grades, the views deleting them bump the version instead
+@receiver(post_save, sender=Grade)
+@receiver([post_save, post_delete], sender=GradeCategory)
+def bump_grades_version(sender, **kwargs):
+    bump_model_versions(sender)
@@ -12,20 +12,25 @@ from django.views.generic import (CreateView, DeleteView, DetailView,
                                   TemplateView, UpdateView)
 
 from django_school.apps.classes.models import Class
+from django_school.apps.common.cache import bump_model_versions
+from django_school.apps.common.routers import read_only
 from django_school.apps.common.utils import (
     AjaxRequiredMixin, GetObjectCacheMixin, RolesRequiredMixin,
     SubjectAndSchoolClassRelatedMixin,
-    does_the_teacher_teach_the_subject_to_the_class, roles_required)
+    does_the_teacher_teach_the_subject_to_the_class, etag_from_versions,
+    get_school_class_and_subject_or_404, roles_required)
 from django_school.apps.grades.forms import (BulkGradeCreationCommonInfoForm,
                                              BulkGradeCreationFormSet,
                                              GradeCategoryForm, GradeForm)
 from django_school.apps.grades.models import Grade, GradeCategory
-from django_school.apps.lessons.models import Subject
+from django_school.apps.lessons.models import Lesson, Subject
+from django_school.apps.monitoring.utils import query_budget
 from django_school.apps.users.models import ROLES
 
 User = get_user_model()
 
 
+@query_budget(14)
 class GradeCreateView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER),
@@ -61,6 +66,7 @@ class GradeCreateView(
         )
 
 
+@query_budget(12)
 @login_required
 @roles_required(ROLES.TEACHER)
 def grade_bulk_create_view(request, category_pk):
@@ -124,6 +130,9 @@ def grade_bulk_create_view(request, category_pk):
     )
 
 
+@query_budget(12)
+@read_only
+@etag_from_versions(Grade, GradeCategory, Lesson, Subject, Class, User)
 class ClassGradesView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER),
@@ -150,6 +159,7 @@ class ClassGradesView(
         return context
 
 
+@query_budget(14)
 class StudentGradesView(LoginRequiredMixin, DetailView):
     model = User
     slug_url_kwarg = "student_slug"
@@ -225,6 +235,7 @@ class SingleGradeMixin:
         )
 
 
+@query_budget(10)
 class GradeUpdateView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER),
@@ -237,6 +248,7 @@ class GradeUpdateView(
     template_name = "grades/grade_update.html"
 
 
+@query_budget(8)
 class GradeDeleteView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER),
@@ -249,19 +261,19 @@ class GradeDeleteView(
 
     def delete(self, *args, **kwargs):
         messages.success(self.request, self.success_message)
-        return super().delete(*args, **kwargs)
+        response = super().delete(*args, **kwargs)
+        bump_model_versions(Grade)
 
+        return response
 
+
+@query_budget(8)
 @login_required
 @roles_required(ROLES.TEACHER)
 def grade_categories_view(request, class_slug, subject_slug):
-    school_class = get_object_or_404(Class, slug=class_slug)
-    subject = get_object_or_404(Subject, slug=subject_slug)
-
-    if not does_the_teacher_teach_the_subject_to_the_class(
-        request.user, subject, school_class
-    ):
-        raise Http404
+    school_class, subject = get_school_class_and_subject_or_404(
+        request.user, class_slug, subject_slug
+    )
 
     if request.method == "POST":
         form = GradeCategoryForm(
@@ -305,6 +317,7 @@ class GradeCategoryAccessMixin:
         return category
 
 
+@query_budget(2)
 class GradeCategoryFormTemplateView(TemplateView):
     template_name = "grades/partials/grade_category_form.html"
 
@@ -315,6 +328,7 @@ class GradeCategoryFormTemplateView(TemplateView):
         return context
 
 
+@query_budget(8)
 class GradeCategoryDetailView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER),
@@ -326,6 +340,7 @@ class GradeCategoryDetailView(
     context_object_name = "category"
 
 
+@query_budget(8)
 class GradeCategoryDeleteView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER),
@@ -347,6 +362,7 @@ class GradeCategoryDeleteView(
         return redirect_url
 
 
+@query_budget(8)
 class GradeCategoryUpdateView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER),
@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from django_school.apps.common.cache import bump_model_versions
 from django_school.apps.lessons.models import (Attendance, Lesson,
                                                LessonSession, Subject)
 
@@ -11,7 +12,10 @@ class SubjectAdmin(admin.ModelAdmin):
 
 @admin.register(Lesson)
 class LessonAdmin(admin.ModelAdmin):
-    pass
+    list_select_related = (
+        "school_class",
+        "subject",
+    )
 
 
 @admin.register(LessonSession)
@@ -29,4 +33,11 @@ class LessonSessionAdmin(admin.ModelAdmin):
 
 @admin.register(Attendance)
 class AttendanceAdmin(admin.ModelAdmin):
-    pass
+    # the attendances don't send post_delete, see lessons.signals
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        bump_model_versions(Attendance)
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        bump_model_versions(Attendance)
@@ -3,7 +3,9 @@ import datetime
 from django import forms
 from django.core.exceptions import ValidationError
 
+from django_school.apps.common.cache import bump_model_versions
 from django_school.apps.common.models import AttachedFile
+from django_school.apps.common.previews import schedule_previews
 from django_school.apps.events.models import Event, EventStatus
 from django_school.apps.grades.models import GradeCategory
 from django_school.apps.lessons.models import (Attendance, Homework,
@@ -38,11 +40,15 @@ class LessonSessionForm(forms.ModelForm):
             lesson_session.save()
             files = [
                 AttachedFile(
-                    file=file, creator=self.teacher, related_object=lesson_session
+                    file=file,
+                    filename=file.name,
+                    creator=self.teacher,
+                    related_object=lesson_session,
                 )
                 for file in self.files.getlist("attached_files")
             ]
             AttachedFile.objects.bulk_create(files)
+            schedule_previews(files)
 
         return lesson_session
 
@@ -53,12 +59,71 @@ class AttendanceForm(forms.ModelForm):
         fields = ["status"]
 
 
+class FormSetObjectChoiceField(forms.ModelChoiceField):
+    """Looks up the posted object among the ones loaded by the formset."""
+
+    def __init__(self, formset, *args, **kwargs):
+        self.formset = formset
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+
+        try:
+            obj = self.formset._existing_object(
+                self.formset.model._meta.pk.to_python(value)
+            )
+        except ValidationError:
+            obj = None
+
+        if obj is None:
+            raise ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            )
+
+        return obj
+
+
 class BaseAttendanceFormSet(forms.BaseInlineFormSet):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         self.queryset = self.queryset.select_related("student")
 
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+
+        # ModelChoiceField would query every posted attendance again
+        pk_name = self.model._meta.pk.name
+        pk_field = form.fields[pk_name]
+        form.fields[pk_name] = FormSetObjectChoiceField(
+            self,
+            pk_field.queryset,
+            initial=pk_field.initial,
+            required=False,
+            widget=pk_field.widget,
+        )
+
+    def save_existing_objects(self, commit=True):
+        # only the changed statuses are saved, all with a single query
+        self.changed_objects = []
+        self.deleted_objects = []
+
+        saved_instances = []
+        for form in self.initial_forms:
+            if form.has_changed():
+                self.changed_objects.append((form.instance, form.changed_data))
+                saved_instances.append(form.instance)
+
+        if commit:
+            Attendance.objects.bulk_update(saved_instances, ["status"])
+            bump_model_versions(Attendance)
+
+        return saved_instances
+
 
 AttendanceFormSet = forms.inlineformset_factory(
     LessonSession,
@@ -120,10 +185,16 @@ class HomeworkForm(forms.ModelForm):
             )
             EventStatus.objects.create_multiple(event)
             files = [
-                AttachedFile(file=file, creator=self.teacher, related_object=homework)
+                AttachedFile(
+                    file=file,
+                    filename=file.name,
+                    creator=self.teacher,
+                    related_object=homework,
+                )
                 for file in self.files.getlist("attached_files")
             ]
             AttachedFile.objects.bulk_create(files)
+            schedule_previews(files)
 
             if self.cleaned_data["create_category"]:
                 GradeCategory.objects.create(
@@ -153,10 +224,14 @@ class HomeworkRealisationForm(forms.Form):
 
         files = [
             AttachedFile(
-                file=file, creator=self.instance.student, related_object=self.instance
+                file=file,
+                filename=file.name,
+                creator=self.instance.student,
+                related_object=self.instance,
             )
             for file in self.files.getlist("attached_files")
         ]
         AttachedFile.objects.bulk_create(files)
+        schedule_previews(files)
 
         return self.instance
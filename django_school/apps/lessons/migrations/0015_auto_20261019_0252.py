@@ -0,0 +1,44 @@
+# Generated by Django 3.2.7 on 2026-10-19 02:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schools", "0001_initial"),
+        ("lessons", "0014_alter_homework_completion_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="subject",
+            name="school",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="schools.school",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="subject",
+            name="slug",
+            field=models.SlugField(max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name="subject",
+            constraint=models.UniqueConstraint(
+                fields=("school", "slug"), name="unique_subject_slug_in_school"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="subject",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("school", None)),
+                fields=("slug",),
+                name="unique_subject_slug_without_school",
+            ),
+        ),
+    ]
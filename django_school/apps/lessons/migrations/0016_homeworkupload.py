@@ -0,0 +1,30 @@
+# Generated by Django 3.2.7 on 2026-10-19 03:37
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_auto_20261019_0252'),
+        ('lessons', '0015_auto_20261019_0252'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HomeworkUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.PositiveBigIntegerField()),
+                ('part_size', models.PositiveIntegerField()),
+                ('received_parts', django.contrib.postgres.fields.ArrayField(base_field=models.PositiveIntegerField(), default=list, size=None)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('homework', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to='lessons.homework')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.user')),
+            ],
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.7 on 2026-10-19 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lessons', '0017_auto_20261019_0355'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='attendance',
+            name='lessons_att_student_d3e497_idx',
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='updated_xid',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['student', 'updated_xid'], name='lessons_att_student_6968a8_idx'),
+        ),
+    ]
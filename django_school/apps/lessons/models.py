@@ -1,38 +1,36 @@
 import datetime
+import math
+import os
+import uuid
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.postgres.fields import ArrayField
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models import Count, Prefetch
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils.text import slugify
 
 from django_school.apps.classes.models import Class
 from django_school.apps.common.models import AttachedFile
+from django_school.apps.schools.models import (SchoolScopedManager,
+                                               SchoolScopedModel,
+                                               unique_in_school_constraints)
 
 
-class SubjectQuerySet(models.QuerySet):
-    def with_does_the_teacher_teach_the_subject_to_the_class(
-        self, teacher, school_class
-    ):
-        return self.prefetch_related(
-            Prefetch(
-                "lessons",
-                queryset=Lesson.objects.filter(
-                    teacher=teacher, school_class=school_class
-                ),
-                to_attr="does_the_teacher_teach_the_subject_to_the_class",
-            )
-        )
+class Subject(SchoolScopedModel):
+    name = models.CharField(max_length=64)
+    slug = models.SlugField(max_length=64)
 
+    objects = SchoolScopedManager()
 
-class Subject(models.Model):
-    name = models.CharField(max_length=64)
-    slug = models.SlugField(max_length=64, unique=True)
+    unique_in_school = ["slug"]
 
-    objects = SubjectQuerySet.as_manager()
+    class Meta:
+        constraints = unique_in_school_constraints("subject", "slug")
 
     def __str__(self):
         return self.name
@@ -145,6 +143,18 @@ class LessonSession(models.Model):
         return reverse("lessons:session_detail", args=[self.pk])
 
 
+class AttendanceQuerySet(models.QuerySet):
+    def visible_to_user(self, user):
+        if user.is_teacher:
+            return self.filter(lesson_session__lesson__teacher=user)
+        elif user.is_student:
+            return self.filter(student=user)
+        elif user.is_parent:
+            return self.filter(student_id=user.child_id)
+        else:
+            return self.none()
+
+
 class Attendance(models.Model):
     ATTENDANCE_STATUSES = [
         ("present", "Present"),
@@ -159,14 +169,34 @@ class Attendance(models.Model):
     status = models.CharField(
         max_length=16, choices=ATTENDANCE_STATUSES, default="none"
     )
+    # also set by a trigger on bulk updates, see the sync app
+    updated_at = models.DateTimeField(auto_now=True)
+    # the transaction which has written the row last, set by the trigger
+    updated_xid = models.BigIntegerField(default=0, editable=False)
+
+    objects = AttendanceQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=["student", "updated_xid"])]
 
     def clean(self):
         super().clean()
 
-        if self.student.school_class != self.lesson_session.lesson.school_class:
+        if self.student.school_class_id != self.lesson_session.lesson.school_class_id:
             raise ValidationError("The student is not in class of the lesson session.")
 
 
+def _count_subquery(queryset, outer_field):
+    counts = (
+        queryset.order_by()
+        .values(outer_field)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+
+    return Coalesce(Subquery(counts), 0)
+
+
 class HomeworkQuerySet(models.QuerySet):
     def visible_to_user(self, user):
         if user.is_teacher:
@@ -177,9 +207,17 @@ class HomeworkQuerySet(models.QuerySet):
             return self.none()
 
     def with_realisations_count(self):
+        # counted by separate subqueries, joining both relations would multiply
+        # the rows by the number of realisations times the number of students
         return self.annotate(
-            submitted_count=Count("realisations", distinct=True),
-            total_count=Count("school_class__students"),
+            submitted_count=_count_subquery(
+                HomeworkRealisation.objects.filter(homework=OuterRef("pk")),
+                "homework",
+            ),
+            total_count=_count_subquery(
+                get_user_model().objects.filter(school_class=OuterRef("school_class")),
+                "school_class",
+            ),
         )
 
     def with_realisations(self, user):
@@ -226,6 +264,20 @@ class Homework(models.Model):
     def submit_realisation_url(self):
         return reverse("lessons:submit_homework_realisation", args=[self.pk])
 
+    @property
+    def download_realisations_url(self):
+        return reverse("lessons:homework_realisations_download", args=[self.pk])
+
+
+class HomeworkRealisationQuerySet(models.QuerySet):
+    def visible_to_user(self, user):
+        if user.is_teacher:
+            return self.filter(homework__teacher=user)
+        elif user.is_student:
+            return self.filter(student=user)
+        else:
+            return self.none()
+
 
 class HomeworkRealisation(models.Model):
     submission_date = models.DateTimeField(auto_now_add=True)
@@ -243,5 +295,44 @@ class HomeworkRealisation(models.Model):
         object_id_field="related_object_id",
     )
 
+    objects = HomeworkRealisationQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.homework.title} - {self.student.full_name}"
+
+
+class HomeworkUpload(models.Model):
+    """A file of a homework realisation being uploaded in parts."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    homework = models.ForeignKey(
+        Homework, on_delete=models.CASCADE, related_name="uploads"
+    )
+    student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    part_size = models.PositiveIntegerField()
+    received_parts = ArrayField(models.PositiveIntegerField(), default=list)
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.filename} - {self.student}"
+
+    @property
+    def path(self):
+        return os.path.join(settings.HOMEWORK_UPLOAD_DIR, f"{self.pk}.part")
+
+    @property
+    def parts_count(self):
+        return math.ceil(self.size / self.part_size)
+
+    @property
+    def missing_parts(self):
+        return sorted(set(range(self.parts_count)) - set(self.received_parts))
+
+    def get_part_size(self, index):
+        return min(self.part_size, self.size - index * self.part_size)
+
+    @property
+    def detail_url(self):
+        return reverse("lessons:homework_upload_detail", args=[self.pk])
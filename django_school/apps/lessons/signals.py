@@ -1,12 +1,43 @@
 import datetime
+import os
 
-from django.db.models.signals import pre_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from django_school.apps.lessons.models import LessonSession
+from django_school.apps.common.cache import bump_model_versions
+from django_school.apps.lessons.models import (Attendance, HomeworkUpload,
+                                               Lesson, LessonSession, Subject)
+from django_school.apps.lessons.utils import invalidate_teaching_assignments
 
 
 @receiver(pre_save, sender=LessonSession)
 def default_date(sender, instance, **kwargs):
     if instance.date is None:
         instance.date = datetime.datetime.today()
+
+
+@receiver([post_save, post_delete], sender=Lesson)
+def lesson_changed(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_teaching_assignments)
+    bump_model_versions(Lesson)
+
+
+# the attendances are deleted in bulk with their sessions or by the rollover,
+# which a receiver of post_delete would make fetch each of them
+@receiver(post_save, sender=Attendance)
+@receiver([post_save, post_delete], sender=LessonSession)
+@receiver([post_save, post_delete], sender=Subject)
+def bump_lessons_version(sender, **kwargs):
+    bump_model_versions(sender)
+
+
+def _delete_upload_file(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+@receiver(post_delete, sender=HomeworkUpload)
+def delete_upload_file(sender, instance, **kwargs):
+    path = instance.path
+    transaction.on_commit(lambda: _delete_upload_file(path))
@@ -0,0 +1,186 @@
+"""
+The homework realisations can be uploaded in parts of a fixed size, so a large
+file isn't sent in a single request. Each part is streamed to a temporary
+file and copied to its offset in the file of the upload, so the parts can be
+sent in any order and again after a disconnect. The file is attached to
+the realisation once all the parts have been received.
+"""
+import datetime
+import json
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from django.db.models import F, Func, OuterRef, Value
+from django.utils import timezone
+
+from django_school.apps.common.models import AttachedFile
+from django_school.apps.lessons.models import (Homework, HomeworkRealisation,
+                                               HomeworkUpload, _count_subquery)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_upload(body):
+    """
+    Returns the filename and the size of the file from the JSON request body.
+    Raises ValidationError if the body is invalid.
+    """
+    try:
+        data = json.loads(body)
+    except ValueError:
+        raise ValidationError("The request body is not valid JSON.")
+    if not isinstance(data, dict):
+        raise ValidationError("The request body has to be an object.")
+
+    filename = data.get("filename")
+    if not isinstance(filename, str) or not os.path.basename(filename):
+        raise ValidationError('"filename" has to be the name of the file.')
+    filename = os.path.basename(filename)
+    if len(filename) > HomeworkUpload._meta.get_field("filename").max_length:
+        raise ValidationError('"filename" is too long.')
+
+    size = data.get("size")
+    if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+        raise ValidationError('"size" has to be a positive number of bytes.')
+    if size > settings.HOMEWORK_UPLOAD_MAX_SIZE:
+        raise ValidationError(
+            f"The file can't be larger than {settings.HOMEWORK_UPLOAD_MAX_SIZE} bytes."
+        )
+
+    return filename, size
+
+
+def delete_expired_uploads():
+    expired = timezone.now() - datetime.timedelta(seconds=settings.HOMEWORK_UPLOAD_TTL)
+    HomeworkUpload.objects.filter(created__lt=expired).delete()
+
+
+def start_upload(homework, student, filename, size):
+    """
+    Reserves the file of the upload. Raises ValidationError if the student
+    has too many unfinished uploads, each of which takes up to the size
+    of the file on the disk.
+    """
+    delete_expired_uploads()
+
+    with transaction.atomic():
+        # the uploads of the student are started one at a time, the row
+        # of the student is locked by the same query which counts them
+        open_uploads = (
+            get_user_model()
+            .objects.select_for_update()
+            .filter(pk=student.pk)
+            .annotate(
+                open_uploads=_count_subquery(
+                    HomeworkUpload.objects.filter(student=OuterRef("pk")), "student"
+                )
+            )
+            .values_list("open_uploads", flat=True)
+            .get()
+        )
+        if open_uploads >= settings.HOMEWORK_UPLOAD_MAX_OPEN:
+            raise ValidationError(
+                f"You can't have more than {settings.HOMEWORK_UPLOAD_MAX_OPEN} "
+                f"unfinished uploads."
+            )
+
+        upload = HomeworkUpload.objects.create(
+            homework=homework,
+            student=student,
+            filename=filename,
+            size=size,
+            part_size=settings.HOMEWORK_UPLOAD_PART_SIZE,
+        )
+    os.makedirs(settings.HOMEWORK_UPLOAD_DIR, exist_ok=True)
+    with open(upload.path, "wb") as file:
+        # sparse on most filesystems, the parts fill it in
+        file.truncate(size)
+
+    return upload
+
+
+def write_part(upload, index, stream):
+    """
+    Streams the part from the request to its offset in the file and marks
+    it as received. Raises ValidationError if the part has a wrong size.
+    """
+    if not 0 <= index < upload.parts_count:
+        raise ValidationError(f"The upload has no part {index}.")
+
+    expected = upload.get_part_size(index)
+    received = 0
+    # the part is copied to its offset only once it has the right size,
+    # so a broken resend doesn't overwrite the part received before
+    with tempfile.TemporaryFile(dir=settings.HOMEWORK_UPLOAD_DIR) as part:
+        # one byte more than expected is read to tell that the part is too large
+        while received <= expected:
+            chunk = stream.read(min(CHUNK_SIZE, expected + 1 - received))
+            if not chunk:
+                break
+            part.write(chunk[: expected - received])
+            received += len(chunk)
+
+        if received != expected:
+            raise ValidationError(f"Part {index} has to have {expected} bytes.")
+
+        part.seek(0)
+        with open(upload.path, "r+b") as file:
+            file.seek(index * upload.part_size)
+            shutil.copyfileobj(part, file, CHUNK_SIZE)
+
+    # appended in the database, the parts may be sent concurrently
+    HomeworkUpload.objects.filter(pk=upload.pk).exclude(
+        received_parts__contains=[index]
+    ).update(
+        received_parts=Func(F("received_parts"), Value(index), function="array_append")
+    )
+    if index not in upload.received_parts:
+        upload.received_parts.append(index)
+
+
+def complete_upload(upload):
+    """
+    Attaches the uploaded file to a new realisation of the homework.
+    Raises ValidationError if some of the parts are missing or the student
+    has submitted the realisation meanwhile.
+    """
+    upload = (
+        HomeworkUpload.objects.select_related("student").filter(pk=upload.pk).first()
+    )
+    if upload is None:
+        raise ValidationError("The upload has been completed already.")
+
+    missing = upload.missing_parts
+    if missing:
+        raise ValidationError(f"{len(missing)} parts haven't been received yet.")
+
+    # the file is hashed and copied to the storage before any row is locked,
+    # a blob left by a concurrent completion is collected by gc_attachments
+    attached_file = AttachedFile(filename=upload.filename, creator=upload.student)
+    with open(upload.path, "rb") as file:
+        attached_file.file.save(upload.filename, File(file), save=False)
+
+    with transaction.atomic():
+        # the realisations of the homework are created one at a time
+        homework = Homework.objects.select_for_update().get(pk=upload.homework_id)
+        if not HomeworkUpload.objects.filter(pk=upload.pk).delete()[0]:
+            raise ValidationError("The upload has been completed already.")
+
+        # the upload is started only before the realisation is submitted,
+        # so it can't be attached to a realisation submitted meanwhile
+        if homework.realisations.filter(student=upload.student).exists():
+            raise ValidationError("The realisation has been submitted already.")
+
+        realisation = HomeworkRealisation.objects.create(
+            homework=homework, student=upload.student
+        )
+        attached_file.related_object = realisation
+        attached_file.save()
+
+    return attached_file
@@ -1,17 +1,14 @@
 from django.urls import path
 
-from django_school.apps.lessons.views import (ClassSubjectListView,
-                                              ClassTimetableView,
-                                              HomeworkDetailView,
-                                              HomeworkListView,
-                                              LessonSessionListView,
-                                              SetHomeworkView,
-                                              TeacherTimetableView,
-                                              class_attendance_summary_view,
-                                              lesson_session_detail_view,
-                                              student_attendance_summary_view,
-                                              submit_homework_realisation_view,
-                                              timetable_list_view)
+from django_school.apps.lessons.views import (
+    ClassSubjectListView, ClassTimetableView, HomeworkDetailView,
+    HomeworkListView, LessonSessionListView, SetHomeworkView,
+    TeacherTimetableView, attendance_bulk_update_view,
+    class_attendance_summary_view, homework_realisations_download_view,
+    homework_upload_complete_view, homework_upload_create_view,
+    homework_upload_detail_view, homework_upload_part_view,
+    lesson_session_detail_view, student_attendance_summary_view,
+    submit_homework_realisation_view, timetable_list_view)
 
 app_name = "lessons"
 
@@ -42,6 +39,11 @@ urlpatterns = [
         ClassSubjectListView.as_view(),
         name="class_subject_list",
     ),
+    path(
+        "attendance/bulk_update/",
+        attendance_bulk_update_view,
+        name="attendance_bulk_update",
+    ),
     path(
         "attendance/student/<slug:student_slug>/",
         student_attendance_summary_view,
@@ -68,4 +70,29 @@ urlpatterns = [
         submit_homework_realisation_view,
         name="submit_homework_realisation",
     ),
+    path(
+        "homeworks/<int:homework_pk>/download_realisations/",
+        homework_realisations_download_view,
+        name="homework_realisations_download",
+    ),
+    path(
+        "homeworks/<int:homework_pk>/uploads/",
+        homework_upload_create_view,
+        name="homework_upload_create",
+    ),
+    path(
+        "uploads/<uuid:upload_pk>/",
+        homework_upload_detail_view,
+        name="homework_upload_detail",
+    ),
+    path(
+        "uploads/<uuid:upload_pk>/parts/<int:index>/",
+        homework_upload_part_view,
+        name="homework_upload_part",
+    ),
+    path(
+        "uploads/<uuid:upload_pk>/complete/",
+        homework_upload_complete_view,
+        name="homework_upload_complete",
+    ),
 ]
@@ -1,6 +1,16 @@
 import datetime
+import json
 
-from django_school.apps.lessons.models import Attendance, LessonSession
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+
+from django_school.apps.common.cache import (bump_model_versions, bump_version,
+                                             can_be_cached, get_version)
+from django_school.apps.lessons.models import Attendance, Lesson, LessonSession
+
+TEACHING_ASSIGNMENTS_VERSION = "lessons:teaching_assignments"
+TEACHING_ASSIGNMENTS_TIMEOUT = 60 * 60
 
 
 def create_lesson_session(lesson, date=None):
@@ -12,6 +22,7 @@ def create_lesson_session(lesson, date=None):
     ]
 
     Attendance.objects.bulk_create(attendances)
+    bump_model_versions(Attendance)
 
 
 def find_closest_future_date(weekday):
@@ -28,3 +39,68 @@ def find_closest_future_date(weekday):
 
     delta = (weekday_number - today.weekday()) % 7
     return today + datetime.timedelta(days=delta)
+
+
+def invalidate_teaching_assignments():
+    bump_version(TEACHING_ASSIGNMENTS_VERSION)
+
+
+def get_teaching_assignments(teacher):
+    """Returns a set of (school_class_id, subject_id) pairs taught by the teacher."""
+    version = get_version(TEACHING_ASSIGNMENTS_VERSION)
+    cache_key = f"lessons:teaching_assignments:{version}:{teacher.pk}"
+    assignments = cache.get(cache_key)
+
+    if assignments is None:
+        assignments = frozenset(
+            Lesson.objects.filter(teacher=teacher)
+            .values_list("school_class_id", "subject_id")
+            .distinct()
+        )
+        if can_be_cached():
+            cache.set(cache_key, assignments, timeout=TEACHING_ASSIGNMENTS_TIMEOUT)
+
+    return assignments
+
+
+def get_taught_classes_ids(teacher):
+    return {school_class_id for school_class_id, _ in get_teaching_assignments(teacher)}
+
+
+def parse_attendance_entries(body):
+    """
+    Returns a dict mapping (lesson_session_id, student_id) to the status
+    of the entries of the JSON request body. Raises ValidationError
+    if the body is invalid.
+    """
+    try:
+        data = json.loads(body)
+    except ValueError:
+        raise ValidationError("The request body is not valid JSON.")
+
+    entries = data.get("attendances") if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        raise ValidationError('"attendances" has to be a list.')
+    if len(entries) > settings.ATTENDANCE_BULK_UPDATE_MAX_ENTRIES:
+        raise ValidationError(
+            f"At most {settings.ATTENDANCE_BULK_UPDATE_MAX_ENTRIES} attendances "
+            f"can be sent at once."
+        )
+
+    statuses = {status for status, _ in Attendance.ATTENDANCE_STATUSES}
+    result = {}
+    for index, entry in enumerate(entries):
+        try:
+            key = (int(entry["session"]), int(entry["student"]))
+            status = entry["status"]
+        except (TypeError, KeyError, ValueError):
+            raise ValidationError(
+                f"Attendance {index} has to contain session, student and status."
+            )
+
+        if not isinstance(status, str) or status not in statuses:
+            raise ValidationError(f"Attendance {index} has an invalid status.")
+
+        result[key] = status
+
+    return result
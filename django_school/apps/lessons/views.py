@@ -5,21 +5,33 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.core.exceptions import PermissionDenied
-from django.http import Http404
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
+from django.views.decorators.http import (require_GET, require_http_methods,
+                                          require_POST)
 from django.views.generic import CreateView, DetailView, ListView
 
 from django_school.apps.classes.models import Class
+from django_school.apps.common.cache import bump_model_versions
+from django_school.apps.common.routers import read_only
 from django_school.apps.common.utils import (RolesRequiredMixin,
                                              SubjectAndSchoolClassRelatedMixin,
-                                             ajax_required, roles_required)
+                                             ajax_required, etag_from_versions,
+                                             idempotent, roles_required,
+                                             stream_zip)
 from django_school.apps.lessons.forms import (AttendanceFormSet, HomeworkForm,
                                               HomeworkRealisationForm,
                                               LessonSessionForm)
-from django_school.apps.lessons.models import (Homework, Lesson, LessonSession,
-                                               Subject)
+from django_school.apps.lessons.models import (Attendance, Homework,
+                                               HomeworkUpload, Lesson,
+                                               LessonSession, Subject)
+from django_school.apps.lessons.uploads import (complete_upload, parse_upload,
+                                                start_upload, write_part)
+from django_school.apps.lessons.utils import (get_teaching_assignments,
+                                              parse_attendance_entries)
+from django_school.apps.monitoring.utils import query_budget
 from django_school.apps.users.models import ROLES
 
 User = get_user_model()
@@ -34,6 +46,9 @@ class TimetableContextMixin:
         return context
 
 
+@query_budget(6)
+@read_only
+@etag_from_versions(Class, Lesson, Subject, User)
 class ClassTimetableView(TimetableContextMixin, DetailView):
     model = Class
     slug_url_kwarg = "class_slug"
@@ -48,6 +63,9 @@ class ClassTimetableView(TimetableContextMixin, DetailView):
         )
 
 
+@query_budget(6)
+@read_only
+@etag_from_versions(Lesson, Subject, Class, User)
 class TeacherTimetableView(TimetableContextMixin, DetailView):
     model = User
     slug_url_kwarg = "teacher_slug"
@@ -66,6 +84,9 @@ class TeacherTimetableView(TimetableContextMixin, DetailView):
         return user
 
 
+@query_budget(4)
+@read_only
+@etag_from_versions(Class, User)
 def timetable_list_view(request):
     teachers = User.teachers.order_by("first_name")
     school_classes = Class.objects.order_by("number")
@@ -77,6 +98,7 @@ def timetable_list_view(request):
     )
 
 
+@query_budget(10)
 class LessonSessionListView(
     LoginRequiredMixin, RolesRequiredMixin(ROLES.TEACHER, ROLES.STUDENT), ListView
 ):
@@ -112,6 +134,7 @@ class LessonSessionListView(
         return context
 
 
+@query_budget(14)
 @login_required
 @roles_required(ROLES.TEACHER, ROLES.STUDENT)
 def lesson_session_detail_view(request, session_pk):
@@ -160,6 +183,53 @@ def lesson_session_detail_view(request, session_pk):
     )
 
 
+@query_budget(12)
+@require_POST
+@login_required
+@roles_required(ROLES.TEACHER)
+@idempotent
+def attendance_bulk_update_view(request):
+    try:
+        statuses = parse_attendance_entries(request.body)
+    except ValidationError as e:
+        return JsonResponse({"errors": e.messages}, status=400)
+
+    # the sessions not taught by the teacher are filtered out in the same query
+    attendances = {
+        (attendance.lesson_session_id, attendance.student_id): attendance
+        for attendance in Attendance.objects.filter(
+            lesson_session__in=LessonSession.objects.visible_to_user(request.user),
+            lesson_session_id__in={session_id for session_id, _ in statuses},
+            student_id__in={student_id for _, student_id in statuses},
+        )
+    }
+
+    missing = sorted(statuses.keys() - attendances.keys())
+    if missing:
+        errors = [
+            f"There is no attendance of student {student_id} in your "
+            f"lesson session {session_id}."
+            for session_id, student_id in missing
+        ]
+        return JsonResponse({"errors": errors}, status=400)
+
+    changed = []
+    for key, status in statuses.items():
+        attendance = attendances[key]
+        if attendance.status != status:
+            attendance.status = status
+            changed.append(attendance)
+
+    Attendance.objects.bulk_update(changed, ["status"])
+    if changed:
+        bump_model_versions(Attendance)
+
+    return JsonResponse(
+        {"updated": len(changed), "unchanged": len(statuses) - len(changed)}
+    )
+
+
+@query_budget(10)
 class ClassSubjectListView(
     LoginRequiredMixin, RolesRequiredMixin(ROLES.TEACHER), ListView
 ):
@@ -177,9 +247,6 @@ class ClassSubjectListView(
         return (
             super()
             .get_queryset()
-            .with_does_the_teacher_teach_the_subject_to_the_class(
-                teacher=self.request.user, school_class=self.school_class
-            )
             .filter(lessons__school_class=self.school_class)
             .distinct()
         )
@@ -188,11 +255,21 @@ class ClassSubjectListView(
         context = super().get_context_data(**kwargs)
         context["school_class"] = self.school_class
 
+        assignments = get_teaching_assignments(self.request.user)
+        for subject in context["subjects"]:
+            subject.does_the_teacher_teach_the_subject_to_the_class = (
+                self.school_class.pk,
+                subject.pk,
+            ) in assignments
+
         return context
 
 
+@query_budget(10)
+@read_only
 @login_required
 def student_attendance_summary_view(request, student_slug):
+    # the sessions of the closed years are summed up by the archive views
     subject_name = request.GET.get("subject", None)
     subject = (
         get_object_or_404(Subject, name__iexact=subject_name) if subject_name else None
@@ -223,9 +300,13 @@ def student_attendance_summary_view(request, student_slug):
     return render(request, "lessons/student_attendance.html", ctx)
 
 
+@query_budget(10)
+@read_only
+@etag_from_versions(Attendance, LessonSession, Lesson, Class, User)
 @login_required
 @roles_required(ROLES.TEACHER)
 def class_attendance_summary_view(request, class_slug):
+    # only the open school year, the closed years are archived per student
     school_class = get_object_or_404(
         Class.objects.visible_to_user(request.user), slug=class_slug
     )
@@ -240,6 +321,7 @@ def class_attendance_summary_view(request, class_slug):
     return render(request, "lessons/class_attendance.html", ctx)
 
 
+@query_budget(12)
 class SetHomeworkView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER),
@@ -266,6 +348,7 @@ class SetHomeworkView(
         return kwargs
 
 
+@query_budget(12)
 class HomeworkListView(
     LoginRequiredMixin, RolesRequiredMixin(ROLES.TEACHER, ROLES.STUDENT), ListView
 ):
@@ -290,6 +373,7 @@ class HomeworkListView(
             return qs.with_realisations(self.request.user)
 
 
+@query_budget(12)
 class HomeworkDetailView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER, ROLES.STUDENT),
@@ -325,6 +409,56 @@ class HomeworkDetailView(
         return ctx
 
 
+def _get_realisations_archive_entries(realisations):
+    folders = set()
+    for realisation in realisations:
+        folder = realisation.student.full_name
+        if folder in folders:
+            # students of the same name
+            folder = f"{folder} ({realisation.student.slug})"
+        folders.add(folder)
+
+        filenames = set()
+        for attached_file in realisation.attached_files.all():
+            filename = attached_file.filename
+            if filename in filenames:
+                filename = f"{attached_file.pk}-{filename}"
+            filenames.add(filename)
+
+            yield (
+                f"{folder}/{filename}",
+                attached_file.file,
+                realisation.submission_date,
+            )
+
+
+@query_budget(6)
+@read_only
+@login_required
+@roles_required(ROLES.TEACHER)
+def homework_realisations_download_view(request, homework_pk):
+    homework = get_object_or_404(
+        Homework.objects.visible_to_user(request.user), pk=homework_pk
+    )
+    # evaluated here, the archive is streamed after the view has returned
+    realisations = list(
+        homework.realisations.select_related("student")
+        .prefetch_related("attached_files")
+        .order_by("student__last_name", "student__first_name", "student__pk")
+    )
+
+    response = StreamingHttpResponse(
+        stream_zip(_get_realisations_archive_entries(realisations)),
+        content_type="application/zip",
+    )
+    response[
+        "Content-Disposition"
+    ] = f'attachment; filename="homework-{homework.pk}-realisations.zip"'
+
+    return response
+
+
+@query_budget(10)
 @login_required
 @roles_required(ROLES.STUDENT)
 @ajax_required
@@ -353,3 +487,82 @@ def submit_homework_realisation_view(request, homework_pk):
 
     ctx = {"form": form}
     return render(request, "lessons/modals/homework_realisation_create.html", ctx)
+
+
+def _upload_data(upload):
+    return {
+        "id": str(upload.pk),
+        "filename": upload.filename,
+        "size": upload.size,
+        "part_size": upload.part_size,
+        "parts": upload.parts_count,
+        "missing_parts": upload.missing_parts,
+        "url": upload.detail_url,
+    }
+
+
+@query_budget(10)
+@require_POST
+@login_required
+@roles_required(ROLES.STUDENT)
+def homework_upload_create_view(request, homework_pk):
+    homework = get_object_or_404(
+        Homework.objects.visible_to_user(request.user), pk=homework_pk
+    )
+
+    if homework.realisations.filter(student=request.user).exists():
+        raise PermissionDenied()
+
+    try:
+        filename, size = parse_upload(request.body)
+        upload = start_upload(homework, request.user, filename, size)
+    except ValidationError as e:
+        return JsonResponse({"errors": e.messages}, status=400)
+
+    return JsonResponse(_upload_data(upload), status=201)
+
+
+@query_budget(4)
+@require_GET
+@login_required
+@roles_required(ROLES.STUDENT)
+def homework_upload_detail_view(request, upload_pk):
+    upload = get_object_or_404(HomeworkUpload, pk=upload_pk, student=request.user)
+
+    return JsonResponse(_upload_data(upload))
+
+
+@query_budget(6)
+@require_http_methods(["PUT"])
+@login_required
+@roles_required(ROLES.STUDENT)
+def homework_upload_part_view(request, upload_pk, index):
+    upload = get_object_or_404(HomeworkUpload, pk=upload_pk, student=request.user)
+
+    try:
+        # the body is read from the request stream, it's never held in memory
+        write_part(upload, index, request)
+    except ValidationError as e:
+        return JsonResponse({"errors": e.messages}, status=400)
+
+    return JsonResponse(_upload_data(upload))
+
+
+@query_budget(13)
+@require_POST
+@login_required
+@roles_required(ROLES.STUDENT)
+def homework_upload_complete_view(request, upload_pk):
+    upload = get_object_or_404(HomeworkUpload, pk=upload_pk, student=request.user)
+
+    try:
+        attached_file = complete_upload(upload)
+    except ValidationError as e:
+        return JsonResponse({"errors": e.messages}, status=400)
+
+    return JsonResponse(
+        {
+            "file": attached_file.download_url,
+            "homework": reverse("lessons:homework_detail", args=[upload.homework_id]),
+        }
+    )
@@ -1,6 +1,8 @@
 from django_school.apps.messages.models import MessageStatus
+from django_school.apps.monitoring.metrics import span
 
 
+@span("context_processors.unread_messages_count")
 def unread_messages_count(request):
     if not request.user.is_authenticated:
         return {}
@@ -0,0 +1,22 @@
+# Generated by Django 3.2.7 on 2026-10-19 03:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school_messages', '0003_remove_messagestatus_read_datetime'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='messagestatus',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='messagestatus',
+            index=models.Index(fields=['receiver', 'updated_at'], name='school_mess_receive_9c5956_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.7 on 2026-10-19 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school_messages', '0004_auto_20261019_0355'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='messagestatus',
+            name='school_mess_receive_9c5956_idx',
+        ),
+        migrations.AddField(
+            model_name='messagestatus',
+            name='updated_xid',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='messagestatus',
+            index=models.Index(fields=['receiver', 'updated_xid'], name='school_mess_receive_285d3b_idx'),
+        ),
+    ]
@@ -48,6 +48,11 @@ class Message(models.Model):
         return reverse("messages:send") + f"?reply_to={self.pk}"
 
 
+class MessageStatusQuerySet(models.QuerySet):
+    def visible_to_user(self, user):
+        return self.filter(receiver=user)
+
+
 class MessageStatusManager(models.Manager):
     def create_multiple(self, message, receivers):
         statuses = [
@@ -64,5 +69,12 @@ class MessageStatus(models.Model):
     )
     receiver = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     is_read = models.BooleanField(default=False)
+    # also set by a trigger on bulk updates, see the sync app
+    updated_at = models.DateTimeField(auto_now=True)
+    # the transaction which has written the row last, set by the trigger
+    updated_xid = models.BigIntegerField(default=0, editable=False)
+
+    objects = MessageStatusManager.from_queryset(MessageStatusQuerySet)()
 
-    objects = MessageStatusManager()
+    class Meta:
+        indexes = [models.Index(fields=["receiver", "updated_xid"])]
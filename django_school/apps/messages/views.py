@@ -10,6 +10,7 @@ from django_school.apps.classes.models import Class
 from django_school.apps.common.utils import GetObjectCacheMixin
 from django_school.apps.messages.forms import MessageForm
 from django_school.apps.messages.models import Message
+from django_school.apps.monitoring.utils import query_budget
 
 User = get_user_model()
 
@@ -24,6 +25,7 @@ class MessageListView(LoginRequiredMixin, ListView):
         return super().get_queryset().select_related("sender")
 
 
+@query_budget(12)
 class ReceivedMessageListView(MessageListView):
     template_name = "messages/received_list.html"
 
@@ -36,6 +38,7 @@ class ReceivedMessageListView(MessageListView):
         )
 
 
+@query_budget(10)
 class SentMessageListView(MessageListView):
     template_name = "messages/sent_list.html"
 
@@ -43,6 +46,7 @@ class SentMessageListView(MessageListView):
         return super().get_queryset().sent(self.request.user)
 
 
+@query_budget(12)
 class MessageCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
     model = Message
     form_class = MessageForm
@@ -89,6 +93,7 @@ class MessageCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
         return context
 
 
+@query_budget(12)
 class MessageDetailView(LoginRequiredMixin, GetObjectCacheMixin, DetailView):
     model = Message
     pk_url_kwarg = "message_pk"
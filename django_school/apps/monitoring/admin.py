@@ -0,0 +1,54 @@
+from django.contrib import admin
+from django.utils.html import format_html
+
+from django_school.apps.monitoring.models import ProfileReport, SlowQuery
+
+
+@admin.register(ProfileReport)
+class ProfileReportAdmin(admin.ModelAdmin):
+    list_display = (
+        "created",
+        "method",
+        "path",
+        "user",
+        "status_code",
+        "duration",
+        "queries_count",
+        "sql_duration",
+    )
+    list_filter = ("view_name",)
+    list_select_related = ("user",)
+    search_fields = ("path",)
+    exclude = ("file_name",)
+    readonly_fields = ("report",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Report")
+    def report(self, obj):
+        return format_html("<pre>{}</pre>", obj.read())
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = (
+        "sql_shape",
+        "calls",
+        "total_duration",
+        "max_duration",
+        "view_name",
+        "location",
+        "last_seen",
+    )
+    list_filter = ("view_name",)
+    search_fields = ("sql_shape", "location")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,168 @@
+import math
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from django_school.apps.classes.models import Class
+from django_school.apps.grades.models import Grade
+from django_school.apps.lessons.models import Attendance, LessonSession
+from django_school.apps.monitoring.utils import (
+    QueryCounter, execute_wrapper_on_all_databases)
+from django_school.apps.schools.models import School
+
+User = get_user_model()
+
+METRICS = ["p50_ms", "p95_ms", "queries", "peak_memory_kb"]
+
+# the number of queries doesn't depend on the machine, so any increase is reported
+EXACT_METRICS = {"queries"}
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+
+    return ordered[index]
+
+
+def get_dataset_size(prefix):
+    """Returns the numbers of rows of the school generated with the prefix."""
+    school = School.objects.filter(slug=prefix).first()
+
+    return {
+        "classes": Class.objects.filter(school=school).count(),
+        "students": User.students.filter(school=school).count(),
+        "lesson_sessions": LessonSession.objects.filter(
+            lesson__school_class__school=school
+        ).count(),
+        "attendances": Attendance.objects.filter(student__school=school).count(),
+        "grades": Grade.objects.filter(student__school=school).count(),
+    }
+
+
+def get_benchmark_cases(prefix):
+    """
+    Returns a dict of name: (user, url) of the hot views, using the school
+    created by the generate_school command with the given prefix.
+    """
+    session = (
+        LessonSession.objects.filter(lesson__school_class__slug=f"{prefix}-0")
+        .select_related("lesson__teacher", "lesson__school_class", "lesson__subject")
+        .order_by("-date", "pk")
+        .first()
+    )
+    if session is None:
+        raise BenchmarkError(f'There is no school generated with the "{prefix}" prefix')
+
+    lesson = session.lesson
+    teacher, school_class = lesson.teacher, lesson.school_class
+    student = User.students.filter(school_class=school_class).order_by("pk").first()
+
+    return {
+        "class_grades": (
+            teacher,
+            reverse(
+                "grades:class_grades", args=[school_class.slug, lesson.subject.slug]
+            ),
+        ),
+        "student_grades": (
+            student,
+            reverse("grades:student_grades", args=[student.slug]),
+        ),
+        "lesson_session_list": (
+            teacher,
+            f"{reverse('lessons:session_list')}?date={session.date:%Y-%m-%d}",
+        ),
+        "lesson_session_detail": (
+            teacher,
+            reverse("lessons:session_detail", args=[session.pk]),
+        ),
+        "class_attendance": (
+            teacher,
+            reverse("lessons:class_attendance", args=[school_class.slug]),
+        ),
+        "events_calendar": (student, reverse("events:calendar")),
+        "received_messages": (student, reverse("messages:received")),
+        "homework_list": (student, reverse("lessons:homework_list")),
+    }
+
+
+def get(client, url):
+    response = client.get(url)
+    if response.status_code != 200:
+        raise BenchmarkError(f"GET {url} returned {response.status_code}")
+
+    return response
+
+
+def run_benchmark(user, url, iterations, warmup=1):
+    # the requests are sent to the host of the user's school
+    host = user.school.domain if user.school_id else "localhost"
+
+    with override_settings(ALLOWED_HOSTS=[host]):
+        # the requests don't go through the network, and the debug toolbar would
+        # be rendered for the default client's address, distorting the results
+        client = Client(SERVER_NAME=host, REMOTE_ADDR="192.0.2.1")
+
+        return _measure(client, user, url, iterations, warmup)
+
+
+def _measure(client, user, url, iterations, warmup):
+    client.force_login(user)
+
+    # fills the caches, so the steady state is measured
+    for _ in range(warmup):
+        get(client, url)
+
+    durations = []
+    queries = []
+    for _ in range(iterations):
+        counter = QueryCounter()
+        with execute_wrapper_on_all_databases(counter):
+            start = time.perf_counter()
+            get(client, url)
+            durations.append(time.perf_counter() - start)
+        queries.append(counter.count)
+
+    # tracing slows the code down, so the memory is measured in a separate request
+    tracemalloc.start()
+    try:
+        get(client, url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": round(percentile(durations, 50) * 1000, 2),
+        "p95_ms": round(percentile(durations, 95) * 1000, 2),
+        "queries": max(queries),
+        "peak_memory_kb": peak // 1024,
+    }
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """
+    Returns the list of regressions - metrics greater than in the baseline by more
+    than the threshold (a fraction, e.g. 0.2 allows them to grow by 20%).
+    """
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        for metric in METRICS:
+            old, new = baseline[name][metric], result[metric]
+            allowed = old if metric in EXACT_METRICS else old * (1 + threshold)
+
+            if new > allowed:
+                regressions.append(f"{name}: {metric} increased from {old} to {new}")
+
+    return regressions
@@ -0,0 +1,133 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError, call_command
+from django.db import connection
+from django.db.backends.base.creation import TEST_DATABASE_PREFIX
+from django.utils.text import slugify
+
+from django_school.apps.monitoring.benchmarks import (BenchmarkError,
+                                                      compare_with_baseline,
+                                                      get_benchmark_cases,
+                                                      get_dataset_size,
+                                                      run_benchmark)
+from django_school.apps.schools.models import School
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures latency, number of queries and peak memory of the hot views "
+        "against a synthetic school and compares them with the baseline. "
+        "The school is generated in the test database if it does not exist."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--prefix", default="bench")
+        parser.add_argument("--classes", type=int, default=20)
+        parser.add_argument("--students-per-class", type=int, default=25)
+        parser.add_argument("--weeks", type=int, default=10)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--only", nargs="+", default=None, help="Names of benchmarks to run."
+        )
+        parser.add_argument(
+            "--baseline", type=Path, default=settings.BENCHMARK_BASELINE_PATH
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=settings.BENCHMARK_THRESHOLD,
+            help="Allowed relative increase of latency and memory, e.g. 0.25.",
+        )
+        parser.add_argument(
+            "--allow-any-database",
+            action="store_true",
+            help=(
+                "Runs against a database without the test_ prefix in its name, "
+                "e.g. a dedicated benchmark database. The school is written to it."
+            ),
+        )
+        parser.add_argument(
+            "--save",
+            action="store_true",
+            help="Saves the results as the new baseline instead of comparing them.",
+        )
+
+    def handle(self, *args, **options):
+        prefix = slugify(options["prefix"])
+
+        database = connection.settings_dict["NAME"]
+        if not (
+            options["allow_any_database"] or database.startswith(TEST_DATABASE_PREFIX)
+        ):
+            raise CommandError(
+                f'The school would be generated in the "{database}" database, '
+                "use --allow-any-database to run against it anyway"
+            )
+
+        if not School.objects.filter(slug=prefix).exists():
+            self.stdout.write("Generating the school...")
+            call_command(
+                "generate_school",
+                prefix=prefix,
+                classes=options["classes"],
+                students_per_class=options["students_per_class"],
+                teachers=max(options["classes"], 15),
+                weeks=options["weeks"],
+                stdout=self.stdout,
+            )
+
+        try:
+            cases = get_benchmark_cases(prefix)
+        except BenchmarkError as e:
+            raise CommandError(e)
+
+        path = options["baseline"]
+        baseline = None
+        if not options["save"] and path.exists():
+            baseline = json.loads(path.read_text())
+            dataset = get_dataset_size(prefix)
+
+            if baseline["dataset"] != dataset:
+                raise CommandError(
+                    "The baseline was recorded against a different dataset: "
+                    f"{baseline['dataset']}, now: {dataset}"
+                )
+
+        if options["only"]:
+            cases = {name: cases[name] for name in options["only"] if name in cases}
+
+        results = {}
+        for name, (user, url) in cases.items():
+            try:
+                results[name] = run_benchmark(
+                    user, url, options["iterations"], options["warmup"]
+                )
+            except BenchmarkError as e:
+                raise CommandError(f"{name}: {e}")
+
+            self.stdout.write(
+                f"{name}: " + ", ".join(f"{k}={v}" for k, v in results[name].items())
+            )
+
+        if options["save"]:
+            data = {"dataset": get_dataset_size(prefix), "results": results}
+            path.write_text(json.dumps(data, indent=2, sort_keys=True))
+            self.stdout.write(self.style.SUCCESS(f"The baseline saved to {path}"))
+            return
+
+        if baseline is None:
+            self.stdout.write(
+                f"There is no baseline in {path}, use --save to create it"
+            )
+            return
+
+        regressions = compare_with_baseline(
+            results, baseline["results"], options["threshold"]
+        )
+        if regressions:
+            raise CommandError("Regressions found:\n" + "\n".join(regressions))
+
+        self.stdout.write(self.style.SUCCESS("No regressions found"))
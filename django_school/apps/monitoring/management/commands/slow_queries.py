@@ -0,0 +1,44 @@
+from django.core.management import BaseCommand
+
+from django_school.apps.monitoring.models import SlowQuery
+
+ORDERINGS = {
+    "total": "-total_duration",
+    "calls": "-calls",
+    "max": "-max_duration",
+}
+
+
+class Command(BaseCommand):
+    help = "Lists the slow queries ranked by their total time."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--order-by", choices=ORDERINGS.keys(), default="total")
+        parser.add_argument(
+            "--explain", action="store_true", help="Prints the query plans."
+        )
+        parser.add_argument(
+            "--clear", action="store_true", help="Deletes the recorded queries."
+        )
+
+    def handle(self, *args, **options):
+        if options["clear"]:
+            count, _ = SlowQuery.objects.all().delete()
+            self.stdout.write(f"Deleted {count} slow queries")
+            return
+
+        queries = SlowQuery.objects.order_by(ORDERINGS[options["order_by"]])
+
+        for query in queries[: options["limit"]]:
+            self.stdout.write(
+                f"{query.total_duration:.3f}s total, {query.calls} calls, "
+                f"{query.average_duration * 1000:.1f}ms avg, "
+                f"{query.max_duration * 1000:.1f}ms max | "
+                f"{query.view_name or '-'} {query.location or '-'}"
+            )
+            self.stdout.write(f"    {query.sql_shape}")
+
+            if options["explain"] and query.explain:
+                for line in query.explain.splitlines():
+                    self.stdout.write(f"        {line}")
@@ -0,0 +1,160 @@
+import bisect
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERIES_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+REGISTRY = []
+
+current_request_metrics = ContextVar("current_request_metrics", default=None)
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Thread-safe histogram with a single label, rendered in the Prometheus text
+    format. The values are kept in the memory of the process.
+    """
+
+    def __init__(self, name, documentation, label_name, buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_name = label_name
+        self.buckets = tuple(buckets)
+        self._counts = defaultdict(lambda: [0] * (len(self.buckets) + 1))
+        self._sums = defaultdict(float)
+        self._lock = threading.Lock()
+
+        REGISTRY.append(self)
+
+    def observe(self, label_value, value):
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            self._counts[label_value][index] += 1
+            self._sums[label_value] += value
+
+    def get_count(self, label_value):
+        with self._lock:
+            return sum(self._counts.get(label_value, []))
+
+    def get_sum(self, label_value):
+        with self._lock:
+            return self._sums.get(label_value, 0)
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+
+        with self._lock:
+            samples = [
+                (label_value, list(counts), self._sums[label_value])
+                for label_value, counts in sorted(self._counts.items())
+            ]
+
+        for label_value, counts, total in samples:
+            label = f'{self.label_name}="{_escape(label_value)}"'
+            cumulative = 0
+
+            for bound, count in zip([*self.buckets, "+Inf"], counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+
+            lines.append(f"{self.name}_sum{{{label}}} {_format_number(total)}")
+            lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+
+        return "\n".join(lines)
+
+
+def render_metrics():
+    return "\n".join(histogram.render() for histogram in REGISTRY) + "\n"
+
+
+request_duration = Histogram(
+    "django_request_duration_seconds", "Total time of handling the request.", "view"
+)
+request_sql_duration = Histogram(
+    "django_request_sql_duration_seconds", "Time spent on SQL queries.", "view"
+)
+request_sql_queries = Histogram(
+    "django_request_sql_queries",
+    "Number of SQL queries per request.",
+    "view",
+    buckets=QUERIES_BUCKETS,
+)
+request_template_duration = Histogram(
+    "django_request_template_duration_seconds",
+    "Time spent on rendering templates, including context processors.",
+    "view",
+)
+response_size = Histogram(
+    "django_response_size_bytes", "Size of the response body.", "view", SIZE_BUCKETS
+)
+span_duration = Histogram(
+    "django_span_duration_seconds", "Time spent in the instrumented code.", "span"
+)
+
+
+class RequestMetrics:
+    """Collects the metrics of the request being handled."""
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_duration = 0
+        self.spans = defaultdict(float)
+        self.active_spans = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_duration += time.perf_counter() - start
+            self.sql_count += 1
+
+
+@contextmanager
+def span(name):
+    """
+    Measures the time of the block (or the function, if used as a decorator).
+    Nested spans of the same name, e.g. templates rendered while rendering
+    a template, are counted once.
+    """
+    request_metrics = current_request_metrics.get()
+
+    if request_metrics is not None and name in request_metrics.active_spans:
+        yield
+        return
+
+    if request_metrics is not None:
+        request_metrics.active_spans.add(name)
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        span_duration.observe(name, duration)
+
+        if request_metrics is not None:
+            request_metrics.spans[name] += duration
+            request_metrics.active_spans.discard(name)
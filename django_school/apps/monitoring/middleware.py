@@ -0,0 +1,131 @@
+import logging
+import time
+
+from django.conf import settings
+from django.urls import reverse
+
+from django_school.apps.monitoring import metrics
+from django_school.apps.monitoring.profiler import (RequestProfiler,
+                                                    is_profiling_requested)
+from django_school.apps.monitoring.slow_queries import (SlowQueryCollector,
+                                                        record_slow_queries)
+from django_school.apps.monitoring.utils import (
+    QueryCounter, execute_wrapper_on_all_databases, get_query_budget)
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+
+        with execute_wrapper_on_all_databases(counter):
+            response = self.get_response(request)
+
+        budget = getattr(request, "query_budget", None)
+        if budget is not None:
+            view_name = request.resolver_match.view_name
+            logger.debug(
+                "%s: %d queries, the most repeated one %d times",
+                view_name,
+                counter.count,
+                counter.most_repeated_shape()[1],
+            )
+            budget.check(counter, view_name)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func)
+
+
+class MetricsMiddleware:
+    """
+    Records latency, SQL time and count, template render time and response size
+    of requests per the resolved URL name.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_metrics = metrics.RequestMetrics()
+        token = metrics.current_request_metrics.set(request_metrics)
+        start = time.perf_counter()
+
+        try:
+            with execute_wrapper_on_all_databases(request_metrics):
+                response = self.get_response(request)
+        finally:
+            metrics.current_request_metrics.reset(token)
+
+        duration = time.perf_counter() - start
+        # unresolved requests are grouped, so 404s don't create new series
+        view = getattr(request.resolver_match, "view_name", None) or "<unresolved>"
+
+        metrics.request_duration.observe(view, duration)
+        metrics.request_sql_duration.observe(view, request_metrics.sql_duration)
+        metrics.request_sql_queries.observe(view, request_metrics.sql_count)
+        metrics.request_template_duration.observe(
+            view, request_metrics.spans["template"]
+        )
+        if not response.streaming:
+            metrics.response_size.observe(view, len(response.content))
+
+        return response
+
+
+class ProfilerMiddleware:
+    """
+    Profiles the request if a staff member adds the "profile" query parameter
+    or the X-Profile header. The report is linked in the X-Profile-Report header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not is_profiling_requested(request):
+            return self.get_response(request)
+
+        profiler = RequestProfiler()
+        response = profiler(self.get_response, request)
+
+        # the profiling overhead and the EXPLAIN queries would distort the budget
+        request.query_budget = None
+
+        report = profiler.save_report(request, response)
+        response["X-Profile-Report"] = reverse(
+            "admin:monitoring_profilereport_change", args=[report.pk]
+        )
+
+        return response
+
+
+class SlowQueryLogMiddleware:
+    """
+    Aggregates the queries slower than SLOW_QUERY_LOG_THRESHOLD (in seconds)
+    in the SlowQuery table. Setting the threshold to None disables the log.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        threshold = settings.SLOW_QUERY_LOG_THRESHOLD
+        if threshold is None:
+            return self.get_response(request)
+
+        collector = SlowQueryCollector(threshold)
+        with execute_wrapper_on_all_databases(collector):
+            response = self.get_response(request)
+
+        # recorded after the wrapper is removed, so its own queries aren't logged
+        if collector.queries:
+            view_name = getattr(request.resolver_match, "view_name", None) or ""
+            record_slow_queries(collector.queries, view_name)
+
+        return response
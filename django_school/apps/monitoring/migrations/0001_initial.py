@@ -0,0 +1,50 @@
+# Generated by Django 3.2.7 on 2026-10-19 02:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("users", "0009_auto_20220227_1607"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfileReport",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("method", models.CharField(max_length=8)),
+                ("path", models.CharField(max_length=255)),
+                ("view_name", models.CharField(blank=True, max_length=128)),
+                ("status_code", models.PositiveSmallIntegerField()),
+                ("duration", models.FloatField(help_text="In seconds.")),
+                ("queries_count", models.PositiveIntegerField()),
+                ("sql_duration", models.FloatField(help_text="In seconds.")),
+                ("file_name", models.CharField(max_length=64, unique=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="users.user",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created"],
+            },
+        ),
+    ]
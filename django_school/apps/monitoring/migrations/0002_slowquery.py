@@ -0,0 +1,42 @@
+# Generated by Django 3.2.7 on 2026-10-19 02:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("monitoring", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("fingerprint", models.CharField(max_length=40, unique=True)),
+                ("sql_shape", models.TextField()),
+                ("example_sql", models.TextField()),
+                ("explain", models.TextField(blank=True)),
+                ("view_name", models.CharField(blank=True, max_length=128)),
+                ("location", models.CharField(blank=True, max_length=255)),
+                ("calls", models.PositiveIntegerField(default=1)),
+                ("total_duration", models.FloatField(help_text="In seconds.")),
+                ("max_duration", models.FloatField(help_text="In seconds.")),
+                ("first_seen", models.DateTimeField(auto_now_add=True)),
+                ("last_seen", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "slow queries",
+                "ordering": ["-total_duration"],
+            },
+        ),
+    ]
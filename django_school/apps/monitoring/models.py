@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.db import models
+
+
+class ProfileReport(models.Model):
+    """
+    Index of the profiling reports. The reports themselves are stored on disk
+    in PROFILER_REPORTS_DIR, only the last PROFILER_MAX_REPORTS are kept.
+    """
+
+    created = models.DateTimeField(auto_now_add=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True
+    )
+    method = models.CharField(max_length=8)
+    path = models.CharField(max_length=255)
+    view_name = models.CharField(max_length=128, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration = models.FloatField(help_text="In seconds.")
+    queries_count = models.PositiveIntegerField()
+    sql_duration = models.FloatField(help_text="In seconds.")
+    file_name = models.CharField(max_length=64, unique=True)
+
+    class Meta:
+        ordering = ["-created"]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration:.3f}s)"
+
+    @property
+    def file_path(self):
+        return settings.PROFILER_REPORTS_DIR / self.file_name
+
+    def read(self):
+        try:
+            return self.file_path.read_text()
+        except FileNotFoundError:
+            return ""
+
+
+class SlowQuery(models.Model):
+    """
+    Aggregate of the slow queries of the same shape. The plan is captured on the
+    first occurrence, only SLOW_QUERY_LOG_MAX_SHAPES of the most expensive shapes
+    are kept.
+    """
+
+    fingerprint = models.CharField(max_length=40, unique=True)
+    sql_shape = models.TextField()
+    example_sql = models.TextField()
+    explain = models.TextField(blank=True)
+    view_name = models.CharField(max_length=128, blank=True)
+    location = models.CharField(max_length=255, blank=True)
+    calls = models.PositiveIntegerField(default=1)
+    total_duration = models.FloatField(help_text="In seconds.")
+    max_duration = models.FloatField(help_text="In seconds.")
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-total_duration"]
+        verbose_name_plural = "slow queries"
+
+    def __str__(self):
+        return self.sql_shape[:100]
+
+    @property
+    def average_duration(self):
+        return self.total_duration / self.calls
@@ -0,0 +1,141 @@
+import cProfile
+import io
+import pstats
+import time
+import uuid
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from django.utils import timezone
+
+from django_school.apps.monitoring.models import ProfileReport
+from django_school.apps.monitoring.utils import \
+    execute_wrapper_on_all_databases
+
+
+def is_profiling_requested(request):
+    requested = "profile" in request.GET or "X-Profile" in request.headers
+
+    return requested and request.user.is_staff
+
+
+class SQLRecorder:
+    """Database execute wrapper recording the queries with their durations."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            alias = context["connection"].alias
+            self.queries.append((duration, sql, params, many, alias))
+
+    @property
+    def duration(self):
+        return sum(query[0] for query in self.queries)
+
+    def get_slowest_selects(self, limit):
+        selects = [
+            query
+            for query in self.queries
+            if not query[3] and query[1].lstrip().upper().startswith("SELECT")
+        ]
+
+        return sorted(selects, key=lambda query: query[0], reverse=True)[:limit]
+
+
+def explain(sql, params, analyze=False, using=DEFAULT_DB_ALIAS):
+    """Explains the query in the database it was executed in, e.g. a replica."""
+    connection = connections[using]
+    options = {"analyze": True} if analyze else {}
+    prefix = connection.ops.explain_query_prefix(**options)
+
+    try:
+        # the savepoint keeps the transaction usable if the EXPLAIN fails
+        with transaction.atomic(using), connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}", params)
+            rows = cursor.fetchall()
+    except DatabaseError as e:
+        return f"EXPLAIN failed: {e}"
+
+    return "\n".join(" ".join(str(column) for column in row) for row in rows)
+
+
+class RequestProfiler:
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.sql_recorder = SQLRecorder()
+        self.duration = None
+
+    def __call__(self, get_response, request):
+        start = time.perf_counter()
+
+        with execute_wrapper_on_all_databases(self.sql_recorder):
+            self.profile.enable()
+            try:
+                return get_response(request)
+            finally:
+                self.profile.disable()
+                self.duration = time.perf_counter() - start
+
+    def get_report(self, request, response):
+        stats = io.StringIO()
+        pstats.Stats(self.profile, stream=stats).sort_stats("cumulative").print_stats(
+            settings.PROFILER_STATS_LIMIT
+        )
+
+        sections = [
+            f"{request.method} {request.get_full_path()} -> {response.status_code}",
+            f"User: {request.user}",
+            f"Total time: {self.duration:.4f}s",
+            f"SQL: {len(self.sql_recorder.queries)} queries, "
+            f"{self.sql_recorder.duration:.4f}s",
+            "",
+            "=== Profile ===",
+            stats.getvalue(),
+            "=== Slowest queries ===",
+        ]
+
+        slowest = self.sql_recorder.get_slowest_selects(
+            settings.PROFILER_EXPLAIN_QUERIES
+        )
+        for duration, sql, params, _, using in slowest:
+            sections += [
+                f"--- {duration:.4f}s ({using}) ---",
+                sql,
+                f"Params: {params}",
+                explain(sql, params, using=using),
+                "",
+            ]
+
+        return "\n".join(sections)
+
+    def save_report(self, request, response):
+        directory = settings.PROFILER_REPORTS_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        file_name = f"{timezone.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.txt"
+        (directory / file_name).write_text(self.get_report(request, response))
+
+        resolver_match = request.resolver_match
+        report = ProfileReport.objects.create(
+            user=request.user,
+            method=request.method,
+            path=request.get_full_path()[:255],
+            view_name=resolver_match.view_name if resolver_match else "",
+            status_code=response.status_code,
+            duration=self.duration,
+            queries_count=len(self.sql_recorder.queries),
+            sql_duration=self.sql_recorder.duration,
+            file_name=file_name,
+        )
+
+        # ring buffer - the files of the old reports are removed in the signal
+        max_reports = settings.PROFILER_MAX_REPORTS
+        for old_report in ProfileReport.objects.all()[max_reports:]:
+            old_report.delete()
+
+        return report
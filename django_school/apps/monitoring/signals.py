@@ -0,0 +1,9 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from django_school.apps.monitoring.models import ProfileReport
+
+
+@receiver(post_delete, sender=ProfileReport)
+def delete_report_file(sender, instance, **kwargs):
+    instance.file_path.unlink(missing_ok=True)
@@ -0,0 +1,122 @@
+import hashlib
+import inspect
+import os
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from django_school.apps.monitoring.models import SlowQuery
+from django_school.apps.monitoring.profiler import explain
+from django_school.apps.monitoring.utils import normalize_sql
+
+APPS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MONITORING_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CapturedQuery = namedtuple(
+    "CapturedQuery",
+    "sql params many duration location using",
+    defaults=[DEFAULT_DB_ALIAS],
+)
+
+
+def get_fingerprint(shape):
+    return hashlib.sha1(shape.encode()).hexdigest()
+
+
+def get_location():
+    """Returns file:line of the innermost frame in the project's apps."""
+    frame = inspect.currentframe()
+
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APPS_DIR) and not filename.startswith(MONITORING_DIR):
+            return f"{os.path.relpath(filename, settings.BASE_DIR)}:{frame.f_lineno}"
+
+        frame = frame.f_back
+
+    return ""
+
+
+class SlowQueryCollector:
+    """Database execute wrapper collecting the queries slower than the threshold."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            if duration >= self.threshold:
+                self.queries.append(
+                    CapturedQuery(
+                        sql,
+                        params,
+                        many,
+                        duration,
+                        get_location(),
+                        context["connection"].alias,
+                    )
+                )
+
+
+def _update_aggregate(fingerprint, duration):
+    return SlowQuery.objects.filter(fingerprint=fingerprint).update(
+        calls=F("calls") + 1,
+        total_duration=F("total_duration") + duration,
+        max_duration=Greatest("max_duration", Value(duration)),
+        last_seen=timezone.now(),
+    )
+
+
+def _explain(query):
+    if query.many or not query.sql.lstrip().upper().startswith("SELECT"):
+        return ""
+
+    return explain(
+        query.sql,
+        query.params,
+        analyze=settings.SLOW_QUERY_LOG_EXPLAIN_ANALYZE,
+        using=query.using,
+    )
+
+
+def record_slow_queries(queries, view_name=""):
+    created = False
+
+    for query in queries:
+        shape = normalize_sql(query.sql)
+        fingerprint = get_fingerprint(shape)
+
+        if _update_aggregate(fingerprint, query.duration):
+            continue
+
+        try:
+            with transaction.atomic():
+                SlowQuery.objects.create(
+                    fingerprint=fingerprint,
+                    sql_shape=shape,
+                    example_sql=query.sql,
+                    explain=_explain(query),
+                    view_name=view_name,
+                    location=query.location[:255],
+                    total_duration=query.duration,
+                    max_duration=query.duration,
+                )
+            created = True
+        except IntegrityError:
+            # the shape has just been recorded by another process
+            _update_aggregate(fingerprint, query.duration)
+
+    if created:
+        max_shapes = settings.SLOW_QUERY_LOG_MAX_SHAPES
+        excess = SlowQuery.objects.values_list("pk", flat=True)[max_shapes:]
+        SlowQuery.objects.filter(pk__in=list(excess)).delete()
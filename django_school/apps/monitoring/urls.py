@@ -0,0 +1,9 @@
+from django.urls import path
+
+from django_school.apps.monitoring.views import metrics_view
+
+app_name = "monitoring"
+
+urlpatterns = [
+    path("", metrics_view, name="metrics"),
+]
@@ -0,0 +1,118 @@
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+PLACEHOLDERS_LIST_RE = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def normalize_sql(sql):
+    """
+    Returns the shape of the query - literals and lists of parameters are replaced,
+    so the queries differing only in the parameters have the same shape.
+    """
+    sql = STRING_LITERAL_RE.sub("?", sql)
+    sql = NUMBER_LITERAL_RE.sub("?", sql)
+    sql = PLACEHOLDERS_LIST_RE.sub("(...)", sql)
+
+    return " ".join(sql.split())
+
+
+@contextmanager
+def execute_wrapper_on_all_databases(wrapper):
+    """
+    Installs the execute wrapper on the connections to all the databases,
+    the queries of the read-only views are sent to the replicas.
+    """
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(wrapper))
+        yield
+
+
+class QueryCounter:
+    """Database execute wrapper counting the queries and their shapes."""
+
+    def __init__(self):
+        self.count = 0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        self.shapes[normalize_sql(sql)] += 1
+
+        return execute(sql, params, many, context)
+
+    def most_repeated_shape(self):
+        if not self.shapes:
+            return None, 0
+
+        return self.shapes.most_common(1)[0]
+
+
+class QueryBudget:
+    def __init__(self, max_queries, max_duplicates=None):
+        self.max_queries = max_queries
+        self.max_duplicates = max_duplicates
+
+    def get_violations(self, counter):
+        violations = []
+        max_duplicates = self.max_duplicates or settings.QUERY_BUDGET_MAX_DUPLICATES
+
+        if counter.count > self.max_queries:
+            violations.append(
+                f"{counter.count} queries executed, the budget is {self.max_queries}"
+            )
+
+        shape, repetitions = counter.most_repeated_shape()
+        if repetitions > max_duplicates:
+            violations.append(
+                f"the query repeated {repetitions} times "
+                f"(at most {max_duplicates} allowed): {shape}"
+            )
+
+        return violations
+
+    def check(self, counter, view_name):
+        violations = self.get_violations(counter)
+        if not violations:
+            return
+
+        message = f"Query budget of {view_name} exceeded: {'; '.join(violations)}"
+
+        if settings.QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceeded(message)
+
+        logger.warning(message)
+
+
+def query_budget(max_queries, max_duplicates=None):
+    """
+    Declares how many queries the view may perform and how many times the same query
+    shape may be repeated (N+1 detection). Works with function and class-based views.
+    """
+
+    def decorator(view):
+        view.query_budget = QueryBudget(max_queries, max_duplicates)
+        return view
+
+    return decorator
+
+
+def get_query_budget(view_func):
+    budget = getattr(view_func, "query_budget", None)
+    if budget is None and hasattr(view_func, "view_class"):
+        budget = getattr(view_func.view_class, "query_budget", None)
+
+    return budget
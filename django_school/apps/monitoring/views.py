@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from django_school.apps.monitoring.metrics import render_metrics
+from django_school.apps.monitoring.utils import query_budget
+
+
+def has_metrics_token(request):
+    # the requests come from the front-end server's address behind a proxy,
+    # so the scraper is told apart by the token only
+    scheme, _, token = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+
+    return (
+        bool(settings.METRICS_TOKEN)
+        and scheme.lower() == "bearer"
+        and constant_time_compare(token, settings.METRICS_TOKEN)
+    )
+
+
+@query_budget(0)
+def metrics_view(request):
+    if not has_metrics_token(request):
+        raise PermissionDenied
+
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
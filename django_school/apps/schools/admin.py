@@ -0,0 +1,16 @@
+from django.contrib import admin
+
+from django_school.apps.schools.models import School, SchoolYear
+
+
+@admin.register(School)
+class SchoolAdmin(admin.ModelAdmin):
+    list_display = ("name", "domain")
+    prepopulated_fields = {"slug": ("name",)}
+
+
+@admin.register(SchoolYear)
+class SchoolYearAdmin(admin.ModelAdmin):
+    list_display = ("name", "school", "start_date", "end_date", "is_closed")
+    list_filter = ("school", "is_closed")
+    readonly_fields = ("is_closed",)
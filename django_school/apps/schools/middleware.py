@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.http import Http404
+from django.http.request import split_domain_port
+
+from django_school.apps.schools.models import current_school
+from django_school.apps.schools.utils import get_school_for_host, schools_exist
+
+
+class SchoolMiddleware:
+    """
+    Resolves the school from the host of the request. The querysets of
+    the school-scoped models are limited to it while the request is handled.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        host, _ = split_domain_port(request.get_host())
+        school = get_school_for_host(host)
+
+        # without any school, all the rows belong to the single one served
+        if school is None and settings.SCHOOL_REQUIRED and schools_exist():
+            raise Http404("There is no school at this address.")
+
+        request.school = school
+        token = current_school.set(school)
+        try:
+            return self.get_response(request)
+        finally:
+            current_school.reset(token)
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.7 on 2026-10-19 02:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='School',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=128)),
+                ('slug', models.SlugField(max_length=64, unique=True)),
+                ('domain', models.CharField(help_text='The host the school is served at.', max_length=255, unique=True)),
+            ],
+        ),
+    ]
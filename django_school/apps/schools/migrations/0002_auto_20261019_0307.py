@@ -0,0 +1,36 @@
+# Generated by Django 3.2.7 on 2026-10-19 03:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchoolYear',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=32)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('is_closed', models.BooleanField(default=False, help_text='The data of a closed year is moved to the archive.')),
+                ('school', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='schools.school')),
+            ],
+            options={
+                'ordering': ['-start_date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='schoolyear',
+            constraint=models.UniqueConstraint(fields=('school', 'name'), name='unique_schoolyear_name_in_school'),
+        ),
+        migrations.AddConstraint(
+            model_name='schoolyear',
+            constraint=models.UniqueConstraint(condition=models.Q(('school', None)), fields=('name',), name='unique_schoolyear_name_without_school'),
+        ),
+    ]
@@ -0,0 +1,133 @@
+from contextvars import ContextVar
+
+from django.core.exceptions import ValidationError
+from django.db import models
+
+# the school of the request being handled, None if the deployment serves one school
+current_school = ContextVar("current_school", default=None)
+
+
+class School(models.Model):
+    name = models.CharField(max_length=128)
+    slug = models.SlugField(max_length=64, unique=True)
+    domain = models.CharField(
+        max_length=255, unique=True, help_text="The host the school is served at."
+    )
+
+    def __str__(self):
+        return self.name
+
+
+class SchoolScopedManager(models.Manager):
+    """
+    Limits the objects to the school of the current request, if there is one.
+    Only the users, classes, subjects, events and school years are scoped. The
+    other rows (grades, lessons, homeworks, notes, messages, ...) belong to them
+    and the views reach them through the visible_to_user querysets or the scoped
+    objects, and the user is authenticated only at the host of their school.
+    """
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        school = current_school.get()
+
+        return qs if school is None else qs.filter(school=school)
+
+
+class SchoolScopedModel(models.Model):
+    school = models.ForeignKey(School, models.CASCADE, null=True, blank=True)
+
+    # names of the fields, which are unique within the school
+    unique_in_school = []
+
+    class Meta:
+        abstract = True
+
+    def save(self, **kwargs):
+        if self.school_id is None:
+            self.school = current_school.get()
+        super().save(**kwargs)
+
+    def validate_unique(self, exclude=None):
+        super().validate_unique(exclude)
+
+        # the uniqueness among the objects without a school is a conditional
+        # constraint, which isn't validated by Django
+        if self.school_id is not None:
+            return
+
+        errors = {}
+        for field_name in self.unique_in_school:
+            value = getattr(self, field_name)
+            if (exclude and field_name in exclude) or value in (None, ""):
+                continue
+
+            duplicates = (
+                type(self)
+                ._base_manager.filter(school=None, **{field_name: value})
+                .exclude(pk=self.pk)
+            )
+            if duplicates.exists():
+                errors[field_name] = [
+                    self.unique_error_message(type(self), [field_name])
+                ]
+
+        if errors:
+            raise ValidationError(errors)
+
+
+def unique_in_school_constraints(model_name, *field_names):
+    """
+    Returns the constraints making the fields unique within the school
+    and among the objects without a school.
+    """
+    constraints = []
+
+    for field_name in field_names:
+        constraints += [
+            models.UniqueConstraint(
+                fields=["school", field_name],
+                name=f"unique_{model_name}_{field_name}_in_school",
+            ),
+            models.UniqueConstraint(
+                fields=[field_name],
+                condition=models.Q(school=None),
+                name=f"unique_{model_name}_{field_name}_without_school",
+            ),
+        ]
+
+    return constraints
+
+
+class SchoolYearQuerySet(models.QuerySet):
+    def open(self):
+        return self.filter(is_closed=False)
+
+    def closed(self):
+        return self.filter(is_closed=True)
+
+
+class SchoolYear(SchoolScopedModel):
+    name = models.CharField(max_length=32)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    is_closed = models.BooleanField(
+        default=False, help_text="The data of a closed year is moved to the archive."
+    )
+
+    objects = SchoolScopedManager.from_queryset(SchoolYearQuerySet)()
+
+    unique_in_school = ["name"]
+
+    class Meta:
+        ordering = ["-start_date"]
+        constraints = unique_in_school_constraints("schoolyear", "name")
+
+    def __str__(self):
+        return self.name
+
+    def clean(self):
+        super().clean()
+
+        if self.start_date >= self.end_date:
+            raise ValidationError("The school year has to end after it starts.")
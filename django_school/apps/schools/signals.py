@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from django_school.apps.schools.models import School
+from django_school.apps.schools.utils import invalidate_schools
+
+
+@receiver([post_save, post_delete], sender=School)
+def invalidate_schools_cache(sender, instance, **kwargs):
+    invalidate_schools()
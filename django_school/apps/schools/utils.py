@@ -0,0 +1,39 @@
+from django.core.cache import cache
+
+from django_school.apps.common.cache import (bump_version, can_be_cached,
+                                             get_version)
+from django_school.apps.schools.models import School
+
+SCHOOLS_CACHE_TIMEOUT = 60 * 5
+SCHOOLS_CACHE_VERSION = "schools:host"
+
+
+def invalidate_schools():
+    bump_version(SCHOOLS_CACHE_VERSION)
+
+
+def get_school_for_host(host):
+    cache_key = f"schools:host:{get_version(SCHOOLS_CACHE_VERSION)}:{host}"
+    # wrapped in a tuple, so hosts without a school are cached too
+    cached = cache.get(cache_key)
+
+    if cached is None:
+        cached = (School.objects.filter(domain=host).first(),)
+
+        if can_be_cached():
+            cache.set(cache_key, cached, timeout=SCHOOLS_CACHE_TIMEOUT)
+
+    return cached[0]
+
+
+def schools_exist():
+    cache_key = f"schools:exist:{get_version(SCHOOLS_CACHE_VERSION)}"
+    exist = cache.get(cache_key)
+
+    if exist is None:
+        exist = School.objects.exists()
+
+        if can_be_cached():
+            cache.set(cache_key, exist, timeout=SCHOOLS_CACHE_TIMEOUT)
+
+    return exist
@@ -0,0 +1,329 @@
+"""
+The mobile clients keep a copy of the user's rows and poll for the changes made
+after their cursor. Each synced row and tombstone holds the id of the transaction
+which has written it last, set by the triggers of the sync app's migrations.
+The transactions don't commit in the order of their ids or timestamps, so
+the cursor holds the snapshot of the database taken by the previous request
+instead, and the rows of the transactions not visible in it are sent. A longer
+transaction committing later is sent by the next request even if the rows of
+the newer ones have been sent already. The rows are found by the
+(student, updated_xid) indexes, the transactions before the snapshot's xmin
+are visible in it.
+
+The changes of a collection with more rows than SYNC_PAGE_SIZE are sent in
+pages, the cursor holds the position of the last row sent then. The snapshot
+taken by the first page becomes the snapshot of the cursor after the last one.
+
+The rows which stop being visible to the user aren't deleted. An event moved
+to another class is removed by the tombstone of its previous class. A student
+moved to another class, or a parent assigned another child, sees other rows
+altogether, so all of them are sent again.
+"""
+import base64
+import datetime
+import json
+import re
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import BooleanField, F, Func, Q, Value
+from django.utils import timezone
+
+from django_school.apps.events.models import Event
+from django_school.apps.grades.models import Grade
+from django_school.apps.lessons.models import Attendance
+from django_school.apps.messages.models import MessageStatus
+from django_school.apps.sync.models import Tombstone
+from django_school.apps.users.models import Note
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+TOMBSTONES = "deleted"
+SNAPSHOT_RE = re.compile(r"^\d+:\d+:(\d+(,\d+)*)?$")
+
+
+def _serialize_grade(grade):
+    return {
+        "id": grade.pk,
+        "student": grade.student_id,
+        "subject": grade.subject.name,
+        "category": grade.category.name,
+        "grade": grade.grade,
+        "weight": grade.weight,
+        "comment": grade.comment,
+        "teacher": grade.teacher.full_name,
+        "created": grade.created,
+    }
+
+
+def _serialize_note(note):
+    return {
+        "id": note.pk,
+        "student": note.student_id,
+        "note": note.note,
+        "teacher": note.teacher.full_name,
+        "created": note.created,
+    }
+
+
+def _serialize_event(event):
+    return {
+        "id": event.pk,
+        "title": event.title,
+        "description": event.description,
+        "date": event.date,
+        "is_global": event.school_class_id is None,
+        "teacher": event.teacher.full_name,
+    }
+
+
+def _serialize_attendance(attendance):
+    return {
+        "id": attendance.pk,
+        "student": attendance.student_id,
+        "status": attendance.status,
+        "date": attendance.lesson_session.date,
+        "subject": attendance.lesson_session.lesson.subject.name,
+        "topic": attendance.lesson_session.topic,
+    }
+
+
+def _serialize_message_status(status):
+    return {
+        "id": status.pk,
+        "message": status.message_id,
+        "topic": status.message.topic,
+        "content": status.message.content,
+        "sender": status.message.sender.full_name,
+        "created": status.message.created,
+        "is_read": status.is_read,
+    }
+
+
+# name: (model, related objects, serializer)
+COLLECTIONS = {
+    "grades": (Grade, ["subject", "category", "teacher"], _serialize_grade),
+    "notes": (Note, ["teacher"], _serialize_note),
+    "events": (Event, ["teacher"], _serialize_event),
+    "attendances": (
+        Attendance,
+        ["lesson_session__lesson__subject"],
+        _serialize_attendance,
+    ),
+    "message_statuses": (
+        MessageStatus,
+        ["message__sender"],
+        _serialize_message_status,
+    ),
+}
+COLLECTIONS_BY_LABEL = {
+    model._meta.label_lower: name for name, (model, _, _) in COLLECTIONS.items()
+}
+
+
+class _NotVisibleIn(Func):
+    """Whether the transaction hadn't committed when the snapshot was taken."""
+
+    template = "NOT txid_visible_in_snapshot(%(expressions)s::txid_snapshot)"
+    output_field = BooleanField()
+
+
+def _get_snapshot():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT txid_current_snapshot()::text")
+        return cursor.fetchone()[0]
+
+
+def _to_microseconds(value):
+    return (value - EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def _from_microseconds(value):
+    return EPOCH + datetime.timedelta(microseconds=value)
+
+
+def _encode_snapshot(value):
+    if value is None:
+        return None
+
+    snapshot, taken_at = value
+    return [snapshot, _to_microseconds(taken_at)]
+
+
+def encode_cursor(state):
+    data = {
+        "since": _encode_snapshot(state["since"]),
+        "run": _encode_snapshot(state["run"]),
+        "positions": state["positions"],
+    }
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def _decode_snapshot(value):
+    if value is None:
+        return None
+    if not (
+        isinstance(value, list)
+        and len(value) == 2
+        and isinstance(value[0], str)
+        and SNAPSHOT_RE.match(value[0])
+        and type(value[1]) is int
+    ):
+        raise ValidationError("The cursor is invalid.")
+    try:
+        return value[0], _from_microseconds(value[1])
+    except OverflowError:
+        raise ValidationError("The cursor is invalid.")
+
+
+def decode_cursor(cursor):
+    """
+    Returns the state stored in the cursor: the snapshot the changes are sent
+    since, the snapshot of the unfinished run of pages and the positions
+    in the collections. Raises ValidationError.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise ValidationError("The cursor is invalid.")
+
+    if not isinstance(data, dict) or sorted(data) != ["positions", "run", "since"]:
+        raise ValidationError("The cursor is invalid.")
+
+    positions = data["positions"]
+    names = [*COLLECTIONS, TOMBSTONES]
+    if not isinstance(positions, dict) or sorted(positions) != sorted(names):
+        raise ValidationError("The cursor is invalid.")
+    for position in positions.values():
+        if not (
+            isinstance(position, list)
+            and len(position) == 2
+            and all(type(value) is int for value in position)
+        ):
+            raise ValidationError("The cursor is invalid.")
+
+    return {
+        "since": _decode_snapshot(data["since"]),
+        "run": _decode_snapshot(data["run"]),
+        "positions": {name: tuple(position) for name, position in positions.items()},
+    }
+
+
+def _changed_since(queryset, snapshot, field):
+    if snapshot is None:
+        return queryset
+
+    xmin = int(snapshot.split(":")[0])
+    return queryset.filter(**{f"{field}__gte": xmin}).filter(
+        _NotVisibleIn(F(field), Value(snapshot))
+    )
+
+
+def _next_page(queryset, position, field):
+    """Returns the rows after the position and whether there are more of them."""
+    xid, pk = position
+    queryset = queryset.filter(
+        Q(**{f"{field}__gt": xid}) | Q(**{field: xid, "pk__gt": pk})
+    )
+    page_size = settings.SYNC_PAGE_SIZE
+    # one more row is fetched to tell whether there's another page
+    limit = page_size + 1
+    rows = list(queryset.order_by(field, "pk")[:limit])
+
+    return rows[:page_size], len(rows) > page_size
+
+
+def _has_visibility_changed(user, snapshot):
+    user_ids = [user.pk]
+    if user.is_parent:
+        user_ids.append(user.child_id)
+
+    return _changed_since(
+        Tombstone.objects.filter(model="users.user", user_id__in=user_ids),
+        snapshot,
+        "xid",
+    ).exists()
+
+
+def get_changes(user, cursor=None):
+    """
+    Returns the changes of the rows visible to the user after the cursor.
+    The rows are sent from the start if there's no cursor, it's older than
+    the tombstones are kept or the user sees other rows since, the client has
+    to drop its copy then ("reset").
+    """
+    now = timezone.now()
+    state = decode_cursor(cursor) if cursor else None
+    reset = state is None
+    if state is not None and state["since"] is not None:
+        since, taken_at = state["since"]
+        reset = taken_at < now - datetime.timedelta(
+            seconds=settings.SYNC_TOMBSTONE_TTL
+        ) or _has_visibility_changed(user, since)
+    if reset:
+        state = {
+            "since": None,
+            "run": None,
+            "positions": dict.fromkeys([*COLLECTIONS, TOMBSTONES], (0, 0)),
+        }
+    # the rows committed after the snapshot may be sent by this request,
+    # and are sent again by the next run
+    run = state["run"] or (_get_snapshot(), now)
+    since = state["since"][0] if state["since"] else None
+
+    changes = {
+        "reset": reset,
+        "has_more": False,
+        "changed": {},
+        "deleted": {name: [] for name in COLLECTIONS},
+    }
+    positions = dict(state["positions"])
+    for name, (model, related, serialize) in COLLECTIONS.items():
+        queryset = _changed_since(
+            model.objects.visible_to_user(user).select_related(*related),
+            since,
+            "updated_xid",
+        )
+        rows, has_more = _next_page(queryset, positions[name], "updated_xid")
+        changes["changed"][name] = [serialize(row) for row in rows]
+        changes["has_more"] |= has_more
+        if rows:
+            positions[name] = (rows[-1].updated_xid, rows[-1].pk)
+
+    # the client without a copy has nothing to delete
+    if since is not None:
+        tombstones, has_more = _next_page(
+            _changed_since(Tombstone.objects.visible_to_user(user), since, "xid"),
+            positions[TOMBSTONES],
+            "xid",
+        )
+        for tombstone in tombstones:
+            changes["deleted"][COLLECTIONS_BY_LABEL[tombstone.model]].append(
+                tombstone.object_id
+            )
+        if changes["deleted"]["events"]:
+            # the events moved to another class, or made global, which are
+            # still visible to the user are sent as changed
+            visible = set(
+                Event.objects.visible_to_user(user)
+                .filter(pk__in=changes["deleted"]["events"])
+                .values_list("pk", flat=True)
+            )
+            changes["deleted"]["events"] = [
+                pk for pk in changes["deleted"]["events"] if pk not in visible
+            ]
+        changes["has_more"] |= has_more
+        if tombstones:
+            positions[TOMBSTONES] = (tombstones[-1].xid, tombstones[-1].pk)
+
+    if changes["has_more"]:
+        next_state = {"since": state["since"], "run": run, "positions": positions}
+    else:
+        next_state = {
+            "since": run,
+            "run": None,
+            "positions": dict.fromkeys(positions, (0, 0)),
+        }
+    changes["cursor"] = encode_cursor(next_state)
+
+    return changes
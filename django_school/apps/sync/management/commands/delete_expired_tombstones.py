@@ -0,0 +1,22 @@
+import datetime
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from django_school.apps.sync.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes the tombstones older than SYNC_TOMBSTONE_TTL, "
+        "the clients with older cursors sync all their rows again."
+    )
+
+    def handle(self, *args, **options):
+        expired = timezone.now() - datetime.timedelta(
+            seconds=settings.SYNC_TOMBSTONE_TTL
+        )
+        count, _ = Tombstone.objects.filter(deleted_at__lt=expired).delete()
+
+        self.stdout.write(f"Deleted {count} tombstones")
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.7 on 2026-10-19 03:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=64)),
+                ('object_id', models.BigIntegerField()),
+                ('user_id', models.BigIntegerField(null=True)),
+                ('school_class_id', models.BigIntegerField(null=True)),
+                ('school_id', models.BigIntegerField(null=True)),
+                ('deleted_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,79 @@
+from django.db import migrations
+
+# (table, model label, column of the student or the receiver of the row)
+SYNCED_TABLES = [
+    ("grades_grade", "grades.grade", "student_id"),
+    ("users_note", "users.note", "student_id"),
+    ("events_event", "events.event", ""),
+    ("lessons_attendance", "lessons.attendance", "student_id"),
+    ("school_messages_messagestatus", "school_messages.messagestatus", "receiver_id"),
+]
+
+# the database clock is used, so the rows changed by the bulk updates, which
+# don't go through Model.save(), are synced too and the web servers' clocks
+# don't have to agree
+CREATE_FUNCTIONS = """
+CREATE FUNCTION sync_touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := clock_timestamp();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION sync_record_tombstone() RETURNS trigger AS $$
+DECLARE
+    old_row jsonb := to_jsonb(OLD);
+BEGIN
+    INSERT INTO sync_tombstone
+        (model, object_id, user_id, school_class_id, school_id, deleted_at)
+    VALUES (
+        TG_ARGV[0],
+        OLD.id,
+        (old_row ->> TG_ARGV[1])::bigint,
+        (old_row ->> 'school_class_id')::bigint,
+        (old_row ->> 'school_id')::bigint,
+        clock_timestamp()
+    );
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+DROP_FUNCTIONS = """
+DROP FUNCTION sync_record_tombstone();
+DROP FUNCTION sync_touch_updated_at();
+"""
+
+CREATE_TRIGGERS = """
+CREATE TRIGGER sync_touch_updated_at BEFORE INSERT OR UPDATE ON {table}
+    FOR EACH ROW EXECUTE PROCEDURE sync_touch_updated_at();
+CREATE TRIGGER sync_record_tombstone AFTER DELETE ON {table}
+    FOR EACH ROW EXECUTE PROCEDURE sync_record_tombstone('{label}', '{column}');
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER sync_record_tombstone ON {table};
+DROP TRIGGER sync_touch_updated_at ON {table};
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0001_initial'),
+        ('events', '0006_auto_20261019_0355'),
+        ('grades', '0004_auto_20261019_0355'),
+        ('lessons', '0017_auto_20261019_0355'),
+        ('school_messages', '0004_auto_20261019_0355'),
+        ('users', '0011_auto_20261019_0355'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_FUNCTIONS, DROP_FUNCTIONS),
+    ] + [
+        migrations.RunSQL(
+            CREATE_TRIGGERS.format(table=table, label=label, column=column),
+            DROP_TRIGGERS.format(table=table),
+        )
+        for table, label, column in SYNCED_TABLES
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.7 on 2026-10-19 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0002_triggers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tombstone',
+            name='xid',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['user_id', 'xid'], name='sync_tombst_user_id_c2fd15_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['school_id', 'school_class_id', 'xid'], name='sync_tombst_school__debc39_idx'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+from django.db import migrations
+
+# the transactions don't commit in the order of their timestamps, a client
+# polling in the meantime would skip the rows of a longer transaction; the
+# rows are found by the ids of the transactions which haven't committed yet
+# when the client's cursor was made, see django_school.apps.sync.changes
+CREATE_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION sync_touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := clock_timestamp();
+    NEW.updated_xid := txid_current();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_record_tombstone() RETURNS trigger AS $$
+DECLARE
+    old_row jsonb := to_jsonb(OLD);
+BEGIN
+    INSERT INTO sync_tombstone
+        (model, object_id, user_id, school_class_id, school_id, deleted_at, xid)
+    VALUES (
+        TG_ARGV[0],
+        OLD.id,
+        (old_row ->> TG_ARGV[1])::bigint,
+        (old_row ->> 'school_class_id')::bigint,
+        (old_row ->> 'school_id')::bigint,
+        clock_timestamp(),
+        txid_current()
+    );
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+RESTORE_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION sync_touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := clock_timestamp();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_record_tombstone() RETURNS trigger AS $$
+DECLARE
+    old_row jsonb := to_jsonb(OLD);
+BEGIN
+    INSERT INTO sync_tombstone
+        (model, object_id, user_id, school_class_id, school_id, deleted_at)
+    VALUES (
+        TG_ARGV[0],
+        OLD.id,
+        (old_row ->> TG_ARGV[1])::bigint,
+        (old_row ->> 'school_class_id')::bigint,
+        (old_row ->> 'school_id')::bigint,
+        clock_timestamp()
+    );
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0003_auto_20261019_0447'),
+        ('events', '0007_auto_20261019_0447'),
+        ('grades', '0005_auto_20261019_0447'),
+        ('lessons', '0018_auto_20261019_0447'),
+        ('school_messages', '0005_auto_20261019_0447'),
+        ('users', '0012_auto_20261019_0447'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_FUNCTIONS, RESTORE_FUNCTIONS),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# the rows which stop being visible to a user aren't deleted: an event moved
+# to another class is removed by a tombstone of its previous class, and
+# the clients of a student moved to another class, or of a parent whose child
+# is changed, get all the rows again (see django_school.apps.sync.changes)
+CREATE_TRIGGERS = """
+CREATE TRIGGER sync_record_visibility_change AFTER UPDATE ON events_event
+    FOR EACH ROW
+    WHEN (
+        OLD.school_class_id IS DISTINCT FROM NEW.school_class_id
+        OR OLD.school_id IS DISTINCT FROM NEW.school_id
+    )
+    EXECUTE PROCEDURE sync_record_tombstone('events.event', '');
+CREATE TRIGGER sync_record_visibility_change AFTER UPDATE ON users_user
+    FOR EACH ROW
+    WHEN (
+        OLD.school_class_id IS DISTINCT FROM NEW.school_class_id
+        OR OLD.child_id IS DISTINCT FROM NEW.child_id
+        OR OLD.school_id IS DISTINCT FROM NEW.school_id
+    )
+    EXECUTE PROCEDURE sync_record_tombstone('users.user', 'id');
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER sync_record_visibility_change ON users_user;
+DROP TRIGGER sync_record_visibility_change ON events_event;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0004_xid_triggers'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
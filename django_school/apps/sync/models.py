@@ -0,0 +1,55 @@
+from django.db import models
+from django.db.models import Q
+
+
+class TombstoneQuerySet(models.QuerySet):
+    def visible_to_user(self, user):
+        if user.is_student:
+            student_id, school_class_id = user.pk, user.school_class_id
+        elif user.is_parent:
+            student_id, school_class_id = user.child_id, user.child.school_class_id
+        else:
+            return self.none()
+
+        return self.filter(
+            Q(
+                model__in=["grades.grade", "users.note", "lessons.attendance"],
+                user_id=student_id,
+            )
+            | Q(model="school_messages.messagestatus", user_id=user.pk)
+            | Q(
+                Q(school_class_id=None) | Q(school_class_id=school_class_id),
+                model="events.event",
+                school_id=user.school_id,
+            )
+        )
+
+
+class Tombstone(models.Model):
+    """
+    A row deleted from one of the synced tables. Recorded by a trigger, so the rows
+    deleted in bulk or by a cascade aren't missed. Also recorded when an event
+    is moved to another class, and when a student or a parent sees other rows
+    after being moved to another class or assigned another child.
+    """
+
+    # the label of the model, e.g. grades.grade, users.user for the users
+    model = models.CharField(max_length=64)
+    object_id = models.BigIntegerField()
+    # not foreign keys, the referenced rows may be deleted with the row, e.g.
+    # the grades of a deleted student; the student or the receiver of the row
+    user_id = models.BigIntegerField(null=True)
+    # the class and the school of a deleted event
+    school_class_id = models.BigIntegerField(null=True)
+    school_id = models.BigIntegerField(null=True)
+    deleted_at = models.DateTimeField(db_index=True)
+    # the transaction which has deleted the row
+    xid = models.BigIntegerField(default=0)
+
+    objects = TombstoneQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user_id", "xid"]),
+            models.Index(fields=["school_id", "school_class_id", "xid"]),
+        ]
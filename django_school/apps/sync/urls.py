@@ -0,0 +1,9 @@
+from django.urls import path
+
+from django_school.apps.sync.views import changes_view
+
+app_name = "sync"
+
+urlpatterns = [
+    path("changes/", changes_view, name="changes"),
+]
@@ -0,0 +1,24 @@
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from django_school.apps.common.utils import roles_required
+from django_school.apps.monitoring.utils import query_budget
+from django_school.apps.sync.changes import get_changes
+from django_school.apps.users.models import ROLES
+
+
+# not read-only, the snapshots in the cursors are taken on the primary, a lagging
+# replica wouldn't have the rows of the transactions committed before them
+@query_budget(12)
+@require_GET
+@login_required
+@roles_required(ROLES.STUDENT, ROLES.PARENT)
+def changes_view(request):
+    try:
+        changes = get_changes(request.user, request.GET.get("since"))
+    except ValidationError as e:
+        return JsonResponse({"errors": e.messages}, status=400)
+
+    return JsonResponse(changes)
@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from django_school.apps.classes.models import Class
+from django_school.apps.common.cache import (bump_version, can_be_cached,
+                                             get_version)
+from django_school.apps.schools.models import current_school
+
+User = get_user_model()
+
+REQUEST_USER_CACHE_TIMEOUT = 60 * 5
+REQUEST_USER_CACHE_VERSION = "users:request_user"
+
+# fields of related objects needed on almost every page (permissions, navbar links)
+CHILD_FIELDS = ["id", "slug", "school_class_id"]
+TEACHER_CLASS_FIELDS = ["id", "slug"]
+
+
+def _get_cache_key(user_pk, version=None):
+    version = version or get_version(REQUEST_USER_CACHE_VERSION)
+    return f"users:request_user:{version}:{user_pk}"
+
+
+def invalidate_request_user(*user_pks):
+    version = get_version(REQUEST_USER_CACHE_VERSION)
+    cache.delete_many([_get_cache_key(pk, version) for pk in user_pks])
+
+
+def invalidate_all_request_users():
+    # classes rarely change, but a change may affect many users (tutor, students,
+    # their parents), so it is cheaper to start a new version of the cache
+    bump_version(REQUEST_USER_CACHE_VERSION)
+
+
+def _fetch_request_user_data(user_pk):
+    user_fields = [field.attname for field in User._meta.concrete_fields]
+    child_fields = [f"child__{field}" for field in CHILD_FIELDS]
+    teacher_class_fields = [f"teacher_class__{field}" for field in TEACHER_CLASS_FIELDS]
+
+    return (
+        User.objects.filter(pk=user_pk)
+        .values(*user_fields, *child_fields, *teacher_class_fields)
+        .first()
+    )
+
+
+def _build_user(data):
+    db = User.objects.db
+    user_fields = [field.attname for field in User._meta.concrete_fields]
+    user = User.from_db(db, user_fields, [data[field] for field in user_fields])
+
+    # the related objects are deferred instances, so any other field is loaded lazily
+    if data["child__id"] is not None:
+        user.child = User.from_db(
+            db, CHILD_FIELDS, [data[f"child__{field}"] for field in CHILD_FIELDS]
+        )
+
+    teacher_class = None
+    if data["teacher_class__id"] is not None:
+        teacher_class = Class.from_db(
+            db,
+            TEACHER_CLASS_FIELDS,
+            [data[f"teacher_class__{field}"] for field in TEACHER_CLASS_FIELDS],
+        )
+    User.teacher_class.related.set_cached_value(user, teacher_class)
+
+    return user
+
+
+def get_request_user(user_pk):
+    cache_key = _get_cache_key(user_pk)
+    data = cache.get(cache_key)
+
+    if data is None:
+        data = _fetch_request_user_data(user_pk)
+        if data is None:
+            return None
+
+        if can_be_cached():
+            cache.set(cache_key, data, timeout=REQUEST_USER_CACHE_TIMEOUT)
+
+    return _build_user(data)
+
+
+class CachedUserBackend(ModelBackend):
+    """
+    Loads the user for the AuthenticationMiddleware from the cache instead of
+    joining the child, class and tutored class on every request.
+    """
+
+    def get_user(self, user_id):
+        user = get_request_user(user_id)
+        if user is None or not self.user_can_authenticate(user):
+            return None
+
+        # the cached user may belong to another school than the requested one
+        school = current_school.get()
+        if school is not None and user.school_id != school.pk:
+            return None
+
+        return user
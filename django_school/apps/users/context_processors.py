@@ -1,6 +1,8 @@
+from django_school.apps.monitoring.metrics import span
 from django_school.apps.users.models import Note
 
 
+@span("context_processors.unseen_notes_count")
 def unseen_notes_count(request):
     if not request.user.is_authenticated or request.user.is_teacher:
         return {}
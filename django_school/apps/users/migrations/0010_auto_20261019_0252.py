@@ -0,0 +1,31 @@
+# Generated by Django 3.2.7 on 2026-10-19 02:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schools", "0001_initial"),
+        ("users", "0009_auto_20220227_1607"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="school",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="schools.school",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["school", "role"], name="users_user_school__74dfae_idx"
+            ),
+        ),
+    ]
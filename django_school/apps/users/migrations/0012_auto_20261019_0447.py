@@ -0,0 +1,26 @@
+# Generated by Django 3.2.7 on 2026-10-19 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_auto_20261019_0355'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='note',
+            name='users_note_student_68ee1e_idx',
+        ),
+        migrations.AddField(
+            model_name='note',
+            name='updated_xid',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['student', 'updated_xid'], name='users_note_student_f1d692_idx'),
+        ),
+    ]
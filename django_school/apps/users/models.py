@@ -9,6 +9,8 @@ from django.utils.text import slugify
 from django_school.apps.classes.models import Class
 from django_school.apps.common.models import Address
 from django_school.apps.grades.models import Grade
+from django_school.apps.schools.models import (SchoolScopedManager,
+                                               SchoolScopedModel)
 
 
 class StudentsQuerySet(models.QuerySet):
@@ -78,25 +80,27 @@ class StudentsQuerySet(models.QuerySet):
         ).exclude(has_grade=1)
 
     def visible_to_user(self, user):
+        from django_school.apps.lessons.utils import get_taught_classes_ids
+
         if user.is_teacher:
-            return self.filter(school_class__lessons__teacher=user).distinct()
+            return self.filter(school_class_id__in=get_taught_classes_ids(user))
         elif user.is_student:
             return self.filter(pk=user.pk)
         elif user.is_parent:
             return self.filter(pk=user.child_id)
 
 
-class StudentsManager(models.Manager):
+class StudentsManager(SchoolScopedManager):
     def get_queryset(self):
-        return StudentsQuerySet(self.model, using=self._db).filter(role=ROLES.STUDENT)
+        return super().get_queryset().filter(role=ROLES.STUDENT)
 
 
-class TeachersManager(models.Manager):
+class TeachersManager(SchoolScopedManager):
     def get_queryset(self):
         return super().get_queryset().filter(role=ROLES.TEACHER)
 
 
-class CustomUserManager(UserManager):
+class CustomUserManager(SchoolScopedManager, UserManager):
     def get(self, *args, **kwargs):
         return (
             super()
@@ -111,7 +115,7 @@ class ROLES(models.TextChoices):
     PARENT = ("PARENT", "Parent")
 
 
-class User(AbstractUser):
+class User(SchoolScopedModel, AbstractUser):
     GENDER_CHOICES = [
         ("male", "male"),
         ("female", "female"),
@@ -137,6 +141,9 @@ class User(AbstractUser):
     students = StudentsManager.from_queryset(StudentsQuerySet)()
     teachers = TeachersManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [models.Index(fields=["school", "role"])]
+
     def __str__(self):
         return self.full_name
 
@@ -198,6 +205,13 @@ class User(AbstractUser):
         elif self.is_parent:
             return reverse("grades:student_grades", args=[self.child.slug])
 
+    @property
+    def archive_url(self):
+        if self.is_student:
+            return reverse("archive:school_year_list", args=[self.slug])
+        elif self.is_parent:
+            return reverse("archive:school_year_list", args=[self.child.slug])
+
 
 class NoteQuerySet(models.QuerySet):
     def visible_to_user(self, user):
@@ -212,6 +226,10 @@ class NoteQuerySet(models.QuerySet):
 class Note(models.Model):
     note = models.CharField(max_length=128)
     created = models.DateTimeField(auto_now_add=True)
+    # also set by a trigger on bulk updates, see the sync app
+    updated_at = models.DateTimeField(auto_now=True)
+    # the transaction which has written the row last, set by the trigger
+    updated_xid = models.BigIntegerField(default=0, editable=False)
     student = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="notes_gotten"
     )
@@ -223,6 +241,9 @@ class Note(models.Model):
 
     objects = NoteQuerySet.as_manager()
 
+    class Meta:
+        indexes = [models.Index(fields=["student", "updated_xid"])]
+
     def __str__(self):
         return self.note
 
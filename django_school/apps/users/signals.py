@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from django_school.apps.classes.models import Class
+from django_school.apps.common.cache import bump_model_versions
+from django_school.apps.users.backends import (invalidate_all_request_users,
+                                               invalidate_request_user)
+
+User = get_user_model()
+
+
+@receiver([post_save, pre_delete], sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    users_pks = [instance.pk]
+    # the parent's cached data contains a copy of the child's class
+    if instance.is_student:
+        users_pks.extend(
+            User.objects.filter(child_id=instance.pk).values_list("pk", flat=True)
+        )
+
+    # invalidated after the commit, like the model versions
+    transaction.on_commit(lambda: invalidate_request_user(*users_pks))
+
+
+@receiver([post_save, post_delete], sender=Class)
+def invalidate_cached_users_of_class(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_all_request_users)
+
+
+@receiver([post_save, post_delete], sender=User)
+def bump_users_version(sender, update_fields=None, **kwargs):
+    # the pages don't show when the users have logged in
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+
+    bump_model_versions(User)
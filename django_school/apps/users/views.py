@@ -9,6 +9,7 @@ from django.views.generic import CreateView, DeleteView, DetailView, ListView
 
 from django_school.apps.common.utils import (AjaxRequiredMixin,
                                              RolesRequiredMixin)
+from django_school.apps.monitoring.utils import query_budget
 from django_school.apps.users.forms import (NoteForm,
                                             SetPasswordWithActivationForm)
 from django_school.apps.users.models import ROLES, Note
@@ -18,6 +19,7 @@ from django_school.apps.users.token_generator import \
 User = get_user_model()
 
 
+@query_budget(10)
 class StudentDetailView(
     LoginRequiredMixin, RolesRequiredMixin(ROLES.TEACHER), DetailView
 ):
@@ -45,11 +47,13 @@ class StudentDetailView(
         ).exists()
 
 
+@query_budget(16)
 class PasswordChangeWithMessageView(SuccessMessageMixin, PasswordChangeView):
     success_url = reverse_lazy("index")
     success_message = "The password has been changed successfully."
 
 
+@query_budget(10)
 class SetPasswordView(SuccessMessageMixin, PasswordResetConfirmView):
     token_generator = set_password_token_generator
     form_class = SetPasswordWithActivationForm
@@ -58,6 +62,7 @@ class SetPasswordView(SuccessMessageMixin, PasswordResetConfirmView):
     success_message = "The password has been set successfully"
 
 
+@query_budget(8)
 class NoteCreateView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER),
@@ -82,6 +87,7 @@ class NoteCreateView(
         return self.object.student.student_detail_url
 
 
+@query_budget(8)
 class NoteDeleteView(
     LoginRequiredMixin,
     RolesRequiredMixin(ROLES.TEACHER),
@@ -100,6 +106,7 @@ class NoteDeleteView(
         return self.object.student.student_detail_url
 
 
+@query_budget(12)
 class NoteListView(
     LoginRequiredMixin, RolesRequiredMixin(ROLES.STUDENT, ROLES.PARENT), ListView
 ):
@@ -41,6 +41,10 @@ INSTALLED_APPS = [
     "django_school.apps.grades",
     "django_school.apps.messages",
     "django_school.apps.events",
+    "django_school.apps.monitoring",
+    "django_school.apps.schools",
+    "django_school.apps.archive",
+    "django_school.apps.sync",
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -53,7 +57,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "django_school.apps.common.middleware.CompressionMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "django_school.apps.schools.middleware.SchoolMiddleware",
+    "django_school.apps.monitoring.middleware.MetricsMiddleware",
+    "django_school.apps.monitoring.middleware.SlowQueryLogMiddleware",
+    "django_school.apps.monitoring.middleware.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -61,13 +70,16 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "django_school.apps.monitoring.middleware.ProfilerMiddleware",
+    "django_school.apps.common.middleware.ReplicaMiddleware",
+    "django_school.apps.common.middleware.VersionETagMiddleware",
 ]
 
 ROOT_URLCONF = "django_school.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "django_school.apps.monitoring.backends.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -102,6 +114,45 @@ DATABASES = {
     }
 }
 
+# Read replicas, e.g. PSQL_REPLICA_HOSTS="replica1.local,replica2.local".
+# To try it locally, point PSQL_REPLICA_NAME to another database on the same host.
+REPLICA_HOSTS = [
+    host for host in environ.get("PSQL_REPLICA_HOSTS", "").split(",") if host
+]
+
+DATABASES.update(
+    {
+        f"replica{i}": {
+            **DATABASES["default"],
+            "NAME": environ.get("PSQL_REPLICA_NAME", DATABASES["default"]["NAME"]),
+            "HOST": host,
+            "TEST": {"MIRROR": "default"},
+        }
+        for i, host in enumerate(REPLICA_HOSTS, start=1)
+    }
+)
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["django_school.apps.common.routers.ReplicaRouter"]
+
+# reads of the client go to the primary for this time after it changed something
+REPLICA_STICKINESS_SECONDS = 10
+# unavailable replicas are skipped for this time
+REPLICA_RETRY_SECONDS = 30
+
+# Cache
+# the cached users, schools, teaching assignments and the versions of the models
+# have to be shared by all the worker processes, e.g. CACHE_LOCATION="10.0.0.5:11211"
+# (memcached); without it the per-process memory is used and they aren't cached
+CACHE_LOCATION = environ.get("CACHE_LOCATION")
+if CACHE_LOCATION:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+            "LOCATION": CACHE_LOCATION.split(","),
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -142,6 +193,17 @@ STATIC_ROOT = "staticfiles"
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
+# collectstatic names the files after their content and writes their .br and .gz
+# variants, the front-end server should send them with far-future cache headers
+# (e.g. nginx "expires max; gzip_static on; brotli_static on;"); enabled in
+# production by STATIC_FILES_MANIFEST=true, the pages can't be rendered without
+# the manifest written by collectstatic
+if environ.get("STATIC_FILES_MANIFEST", "false").lower() == "true":
+    STATICFILES_STORAGE = (
+        "django_school.apps.common.storage.CompressedManifestStaticFilesStorage"
+    )
+# the number of processes compressing the files, the number of CPUs if None
+STATICFILES_COMPRESS_WORKERS = None
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
@@ -156,10 +218,24 @@ LOGOUT_REDIRECT_URL = reverse_lazy("users:login")
 LOGIN_REDIRECT_URL = reverse_lazy("index")
 LOGIN_URL = reverse_lazy("users:login")
 AUTH_USER_MODEL = "users.user"
+AUTHENTICATION_BACKENDS = ["django_school.apps.users.backends.CachedUserBackend"]
 
 # Media
 MEDIA_ROOT = BASE_DIR / "media"
 MEDIA_URL = "/media/"
+# the attached files are only served after checking the permissions, the transfer
+# is handed to the front-end server with the header: "X-Accel-Redirect" (nginx)
+# or "X-Sendfile" (Apache, lighttpd), Django sends the files itself when it's None
+PROTECTED_FILES_HEADER = environ.get("PROTECTED_FILES_HEADER")
+# the internal nginx location aliasing MEDIA_ROOT, used with X-Accel-Redirect
+PROTECTED_FILES_INTERNAL_URL = "/protected/"
+# the attached files modified more recently aren't collected by gc_attachments
+# (in seconds), they may belong to uploads which haven't been committed yet
+ATTACHMENTS_GC_MIN_AGE = 60 * 60
+# the previews of the attached images and PDFs are generated in the background
+# by the threads of each worker process
+ATTACHMENT_PREVIEW_SIZE = (320, 320)
+ATTACHMENT_PREVIEW_WORKERS = 2
 
 # Debug Toolbar
 INTERNAL_IPS = [
@@ -180,3 +256,77 @@ MARTOR_ENABLE_CONFIGS = {
 }
 
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
+
+# Query budgets
+# exceeded budgets raise an exception during development and tests
+# and are only logged in production
+QUERY_BUDGET_RAISE = DEBUG
+QUERY_BUDGET_MAX_DUPLICATES = 5
+
+# Schools
+# requests to hosts without a school return 404 once any school is configured,
+# instead of the unscoped data of all the schools; SCHOOL_REQUIRED=false lets
+# e.g. localhost see everything during development
+SCHOOL_REQUIRED = environ.get("SCHOOL_REQUIRED", "true").lower() != "false"
+# classes of this grade graduate during the school year rollover
+SCHOOL_FINAL_GRADE = 8
+
+# Idempotency keys
+# the responses to the requests sent with the keys are kept for a day (in seconds),
+# the expired keys are deleted by the delete_expired_idempotency_keys command
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
+# Homework uploads
+# the realisations are uploaded in parts of the size (in bytes) to the directory,
+# the unfinished uploads are deleted after the TTL (in seconds)
+HOMEWORK_UPLOAD_DIR = BASE_DIR / "uploads"
+HOMEWORK_UPLOAD_PART_SIZE = 5 * 1024 * 1024
+HOMEWORK_UPLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024
+HOMEWORK_UPLOAD_TTL = 24 * 60 * 60
+# the unfinished uploads of a student, each reserves the size of its file
+HOMEWORK_UPLOAD_MAX_OPEN = 5
+
+# Conditional GET
+# the ETags of the pages are made of the versions of the shown models, and of
+# the numbers of unseen items in the navigation bar counted by these functions
+ETAG_CONTEXT_PROCESSORS = [
+    "django_school.apps.messages.context_processors.unread_messages_count",
+    "django_school.apps.grades.context_processors.unseen_grades_count",
+    "django_school.apps.events.context_processors.unseen_events_count",
+    "django_school.apps.users.context_processors.unseen_notes_count",
+]
+
+# Sync API
+# the mobile clients get the rows changed after their cursor in pages; the
+# tombstones of the deleted rows are kept for SYNC_TOMBSTONE_TTL (in seconds),
+# older cursors get all the rows
+SYNC_PAGE_SIZE = 500
+SYNC_TOMBSTONE_TTL = 30 * 24 * 60 * 60
+
+# Attendance API
+# the maximum number of entries of a single bulk update request
+ATTENDANCE_BULK_UPDATE_MAX_ENTRIES = 1000
+
+# Metrics
+# the scraper sends the header "Authorization: Bearer <METRICS_TOKEN>",
+# the metrics endpoint is disabled without the token
+METRICS_TOKEN = environ.get("METRICS_TOKEN")
+
+# Slow query log
+# queries slower than the threshold (in seconds) are aggregated by their shape
+SLOW_QUERY_LOG_THRESHOLD = 0.1
+SLOW_QUERY_LOG_MAX_SHAPES = 500
+# ANALYZE executes the query again
+SLOW_QUERY_LOG_EXPLAIN_ANALYZE = False
+
+# Profiler
+# reports of the requests profiled by staff members, only the last ones are kept
+PROFILER_REPORTS_DIR = BASE_DIR / "profiles"
+PROFILER_MAX_REPORTS = 50
+PROFILER_EXPLAIN_QUERIES = 5
+PROFILER_STATS_LIMIT = 60
+
+# Benchmarks
+# the results of the benchmark command are compared with this file
+BENCHMARK_BASELINE_PATH = BASE_DIR / "benchmarks.json"
+BENCHMARK_THRESHOLD = 0.25
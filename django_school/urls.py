@@ -14,12 +14,12 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 import debug_toolbar
-from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
-from django_school.apps.common.views import attached_file_delete_view, index
+from django_school.apps.common.views import (attached_file_delete_view,
+                                             attached_file_download_view,
+                                             attached_file_preview_view, index)
 
 urlpatterns = [
     path("", index, name="index"),
@@ -31,12 +31,28 @@ urlpatterns = [
         "messages/", include("django_school.apps.messages.urls", namespace="messages")
     ),
     path("events/", include("django_school.apps.events.urls", namespace="events")),
+    path("archive/", include("django_school.apps.archive.urls", namespace="archive")),
+    path("api/v1/sync/", include("django_school.apps.sync.urls", namespace="sync")),
+    path(
+        "metrics/",
+        include("django_school.apps.monitoring.urls", namespace="monitoring"),
+    ),
     path("admin/", admin.site.urls),
     path("martor/", include("martor.urls")),
+    path(
+        "attached_files/<int:pk>/",
+        attached_file_download_view,
+        name="attached_file_download",
+    ),
+    path(
+        "attached_files/<int:pk>/preview/",
+        attached_file_preview_view,
+        name="attached_file_preview",
+    ),
     path(
         "attached_files/<int:pk>/delete/",
         attached_file_delete_view,
         name="attached_file_delete",
     ),
     path("__debug__", include(debug_toolbar.urls)),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
@@ -0,0 +1,70 @@
+import datetime
+
+from django.test import SimpleTestCase, TestCase
+
+from django_school.apps.archive.attendance import (get_status,
+                                                   get_student_attendance,
+                                                   pack_statuses,
+                                                   unpack_statuses)
+from django_school.apps.archive.models import ArchivedClass
+from tests.utils import SchoolsMixin, UsersMixin
+
+STATUSES = ["present", "absent", "none", "exempt", "excused", "present"]
+
+
+class PackStatusesTestCase(SimpleTestCase):
+    def test_uses_3_bits_per_student(self):
+        self.assertEqual(len(pack_statuses(["present"] * 8)), 3)
+
+    def test_unpacks_packed_statuses(self):
+        data = pack_statuses(STATUSES)
+
+        self.assertEqual(unpack_statuses(data, len(STATUSES)), STATUSES)
+
+    def test_gets_status_of_single_student(self):
+        data = pack_statuses(STATUSES)
+
+        self.assertEqual(
+            [get_status(data, position) for position in range(len(STATUSES))],
+            STATUSES,
+        )
+
+
+class ReadAttendanceTestCase(SchoolsMixin, UsersMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student1 = cls.create_student("student1")
+        cls.student2 = cls.create_student("student2")
+        cls.school_year = cls.create_school_year(
+            "2025/2026", datetime.date(2025, 9, 1), datetime.date(2026, 6, 30)
+        )
+        cls.archived_class = ArchivedClass.objects.create(
+            school_year=cls.school_year,
+            number="1a",
+            student_ids=[cls.student1.pk, cls.student2.pk],
+        )
+        for subject_name, statuses in [
+            ("Math", ["present", "absent"]),
+            ("Math", ["present", "present"]),
+            ("History", ["excused", "present"]),
+        ]:
+            cls.archived_class.sessions.create(
+                date=datetime.date(2026, 1, 12),
+                subject_name=subject_name,
+                statuses=pack_statuses(statuses),
+            )
+
+    def test_counts_statuses_of_student(self):
+        attendance = get_student_attendance(self.school_year, self.student2)
+
+        self.assertEqual(attendance, {"present": 2, "absent": 1})
+
+    def test_counts_statuses_of_student_in_subject(self):
+        attendance = get_student_attendance(self.school_year, self.student1, "Math")
+
+        self.assertEqual(attendance, {"present": 2})
+
+    def test_student_without_archived_lessons_has_no_attendance(self):
+        student = self.create_student("student3")
+
+        self.assertEqual(get_student_attendance(self.school_year, student), {})
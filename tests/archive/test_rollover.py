@@ -0,0 +1,201 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_school.apps.archive.attendance import unpack_statuses
+from django_school.apps.archive.models import ArchivedClass, ArchivedGrade
+from django_school.apps.classes.models import Class
+from django_school.apps.common.models import AttachedFile
+from django_school.apps.events.models import EventStatus
+from django_school.apps.grades.models import Grade, GradeCategory
+from django_school.apps.lessons.models import Attendance, LessonSession
+from django_school.apps.schools.models import SchoolYear
+from tests.utils import (ClassesMixin, EventsMixin, GradesMixin, LessonsMixin,
+                         SchoolsMixin, UsersMixin)
+
+User = get_user_model()
+
+NEW_YEAR_START = datetime.date.today() + datetime.timedelta(days=1)
+
+
+class RolloverCommandTestCase(
+    SchoolsMixin,
+    UsersMixin,
+    ClassesMixin,
+    LessonsMixin,
+    GradesMixin,
+    EventsMixin,
+    TestCase,
+):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school_year = cls.create_school_year(
+            "2025/2026",
+            datetime.date.today() - datetime.timedelta(days=300),
+            datetime.date.today(),
+        )
+        cls.teacher = cls.create_teacher()
+        cls.school_class = cls.create_class("1a")
+        cls.student = cls.create_student(school_class=cls.school_class)
+        cls.subject = cls.create_subject("Math")
+        cls.lesson = cls.create_lesson(cls.subject, cls.teacher, cls.school_class)
+        cls.category = cls.create_grade_category(cls.subject, cls.school_class)
+
+    def call_command(self, name="2026/2027", **kwargs):
+        kwargs.setdefault("start", NEW_YEAR_START)
+        kwargs.setdefault("end", NEW_YEAR_START + datetime.timedelta(days=300))
+        out = StringIO()
+        call_command("rollover_school_year", name, stdout=out, **kwargs)
+
+        return out.getvalue()
+
+    def test_moves_grades_to_archive(self):
+        self.create_grade(self.category, self.subject, self.student, self.teacher, 4)
+
+        self.call_command()
+
+        self.assertFalse(Grade.objects.exists())
+        self.assertFalse(GradeCategory.objects.exists())
+        archived_grade = ArchivedGrade.objects.get()
+        self.assertEqual(archived_grade.school_year, self.school_year)
+        self.assertEqual(archived_grade.student, self.student)
+        self.assertEqual(archived_grade.subject_name, "Math")
+        self.assertEqual(archived_grade.category_name, self.category.name)
+        self.assertEqual(archived_grade.grade, 4)
+
+    def test_packs_attendance_of_closed_year_into_archive(self):
+        student2 = self.create_student("student2", school_class=self.school_class)
+        session = self.create_lesson_session(self.lesson, datetime.date.today())
+        self.create_attendance(session, [self.student], "absent")
+        self.create_attendance(session, [student2], "excused")
+        next_year_session = self.create_lesson_session(self.lesson, NEW_YEAR_START)
+        self.create_attendance(next_year_session, [self.student], "present")
+
+        self.call_command()
+
+        self.assertQuerysetEqual(LessonSession.objects.all(), [next_year_session])
+        self.assertEqual(Attendance.objects.get().status, "present")
+        archived_class = ArchivedClass.objects.get()
+        self.assertEqual(archived_class.number, "1a")
+        self.assertEqual(archived_class.student_ids, [self.student.pk, student2.pk])
+        archived_session = archived_class.sessions.get()
+        self.assertEqual(archived_session.date, datetime.date.today())
+        self.assertEqual(
+            unpack_statuses(archived_session.statuses, 2), ["absent", "excused"]
+        )
+
+    def test_keeps_sessions_with_attached_files(self):
+        session = self.create_lesson_session(self.lesson, datetime.date.today())
+        self.create_attendance(session, [self.student], "absent")
+        self.create_file(session, self.teacher)
+
+        self.call_command()
+
+        self.assertQuerysetEqual(LessonSession.objects.all(), [session])
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_deletes_statuses_of_past_events(self):
+        event = self.create_event(
+            self.teacher, self.school_class, datetime.date.today()
+        )
+        EventStatus.objects.create_multiple(event)
+
+        self.call_command()
+
+        self.assertFalse(EventStatus.objects.exists())
+
+    def test_promotes_classes_and_graduates_final_grade(self):
+        final_class = self.create_class("8a")
+        graduate = self.create_student("graduate", school_class=final_class)
+        self.create_class("7a")
+
+        self.call_command(final_grade=8)
+
+        self.assertCountEqual(
+            Class.objects.values_list("number", "slug"), [("2a", "2a"), ("8a", "8a")]
+        )
+        self.assertNotEqual(Class.objects.get(number="8a"), final_class)
+        graduate.refresh_from_db()
+        self.assertIsNone(graduate.school_class)
+
+    @override_settings(MEDIA_ROOT="temp_dir/")
+    def test_archives_homeworks_and_files_of_graduating_classes(self):
+        final_class = self.create_class("8a")
+        graduate = self.create_student("graduate", school_class=final_class)
+        lesson = self.create_lesson(self.subject, self.teacher, final_class)
+        session = self.create_lesson_session(lesson, datetime.date.today())
+        self.create_attendance(session, [graduate], "present")
+        homework = self.create_homework(self.subject, self.teacher, final_class)
+        realisation = self.create_realisation(homework, graduate)
+        session_file = self.create_file(session, self.teacher)
+        homework_file = self.create_file(homework, self.teacher)
+        realisation_file = self.create_file(realisation, graduate)
+
+        self.call_command(final_grade=8)
+
+        archived_class = ArchivedClass.objects.get(number="8a")
+        self.assertEqual(archived_class.student_ids, [graduate.pk])
+        archived_session = archived_class.sessions.get()
+        archived_homework = archived_class.homeworks.get()
+        self.assertEqual(archived_homework.title, homework.title)
+        self.assertEqual(archived_homework.subject_name, "Math")
+        archived_realisation = archived_homework.realisations.get()
+        self.assertEqual(archived_realisation.student, graduate)
+        for attached_file, related_object in [
+            (session_file, archived_session),
+            (homework_file, archived_homework),
+            (realisation_file, archived_realisation),
+        ]:
+            with self.subTest(model=type(related_object).__name__):
+                attached_file = AttachedFile.objects.get(pk=attached_file.pk)
+                self.assertEqual(attached_file.related_object, related_object)
+                self.assertTrue(
+                    attached_file.file.storage.exists(attached_file.file.name)
+                )
+
+        self.client.force_login(graduate)
+        response = self.client.get(
+            reverse("attached_file_download", args=[realisation_file.pk])
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_closes_previous_year(self):
+        self.call_command()
+
+        self.school_year.refresh_from_db()
+        self.assertTrue(self.school_year.is_closed)
+        self.assertQuerysetEqual(
+            SchoolYear.objects.open().values_list("name", flat=True), ["2026/2027"]
+        )
+
+    def test_raises_error_if_there_is_no_open_year(self):
+        SchoolYear.objects.update(is_closed=True)
+
+        with self.assertRaises(CommandError):
+            self.call_command()
+
+    def test_raises_error_if_new_year_starts_before_closed_one(self):
+        with self.assertRaises(CommandError):
+            self.call_command(start=self.school_year.start_date)
+
+        self.school_year.refresh_from_db()
+        self.assertFalse(self.school_year.is_closed)
+
+    def test_only_rolls_over_given_school(self):
+        school = self.create_school()
+        self.create_school_year(
+            "2025/2026",
+            self.school_year.start_date,
+            self.school_year.end_date,
+            school=school,
+        )
+        other_class = self.create_class("1a", school=school)
+
+        self.call_command(school=school.slug)
+
+        self.assertEqual(Class.objects.get(pk=self.school_class.pk).number, "1a")
+        self.assertEqual(Class.objects.get(pk=other_class.pk).number, "2a")
@@ -0,0 +1,152 @@
+import datetime
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from django_school.apps.archive.attendance import pack_statuses
+from django_school.apps.archive.models import (ArchivedClass, ArchivedGrade,
+                                               ArchivedLessonSession)
+from tests.utils import (ClassesMixin, LoginRequiredTestMixin,
+                         ResourceViewTestMixin, SchoolsMixin, UsersMixin)
+
+
+class ArchiveMixin(SchoolsMixin):
+    @classmethod
+    def create_archived_school_year(cls, student, name="2025/2026"):
+        school_year = cls.create_school_year(
+            name,
+            datetime.date(2025, 9, 1),
+            datetime.date(2026, 6, 30),
+            is_closed=True,
+        )
+        for grade, weight in [(2, 1), (5, 2)]:
+            ArchivedGrade.objects.create(
+                school_year=school_year,
+                student=student,
+                subject_name="Math",
+                category_name="Exam",
+                grade=grade,
+                weight=weight,
+                created=timezone.now(),
+            )
+        archived_class = ArchivedClass.objects.create(
+            school_year=school_year, number="1a", student_ids=[student.pk]
+        )
+        for status in ["present", "present", "absent", "none"]:
+            ArchivedLessonSession.objects.create(
+                archived_class=archived_class,
+                date=datetime.date(2026, 1, 12),
+                subject_name="Math",
+                statuses=pack_statuses([status]),
+            )
+
+        return school_year
+
+
+class SchoolYearListViewTestCase(
+    LoginRequiredTestMixin,
+    ResourceViewTestMixin,
+    ArchiveMixin,
+    UsersMixin,
+    ClassesMixin,
+    TestCase,
+):
+    path_name = "archive:school_year_list"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = cls.create_student(school_class=cls.create_class())
+        cls.school_year = cls.create_archived_school_year(cls.student)
+
+    def get_url(self, student_slug=None):
+        return reverse(self.path_name, args=[student_slug or self.student.slug])
+
+    def get_nonexistent_resource_url(self):
+        return self.get_url(student_slug="does-not-exist")
+
+    def get_permitted_user(self):
+        return self.student
+
+    def test_lists_closed_years_with_archived_data_of_student(self):
+        self.create_school_year(
+            "2026/2027", datetime.date(2026, 9, 1), datetime.date(2027, 6, 30)
+        )
+        self.create_school_year(
+            "2024/2025",
+            datetime.date(2024, 9, 1),
+            datetime.date(2025, 6, 30),
+            is_closed=True,
+        )
+        self.login(self.student)
+
+        response = self.client.get(self.get_url())
+
+        self.assertQuerysetEqual(response.context["school_years"], [self.school_year])
+
+    def test_returns_404_if_student_is_not_visible_to_user(self):
+        self.login(self.create_student("student2"))
+
+        response = self.client.get(self.get_url())
+
+        self.assertEqual(response.status_code, 404)
+
+
+class SchoolYearDetailViewTestCase(
+    LoginRequiredTestMixin,
+    ResourceViewTestMixin,
+    ArchiveMixin,
+    UsersMixin,
+    ClassesMixin,
+    TestCase,
+):
+    path_name = "archive:school_year_detail"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = cls.create_student(school_class=cls.create_class())
+        cls.parent = cls.create_parent(child=cls.student)
+        cls.school_year = cls.create_archived_school_year(cls.student)
+
+    def get_url(self, school_year_pk=None):
+        return reverse(
+            self.path_name,
+            args=[self.student.slug, school_year_pk or self.school_year.pk],
+        )
+
+    def get_nonexistent_resource_url(self):
+        return self.get_url(school_year_pk=self.school_year.pk + 100)
+
+    def get_permitted_user(self):
+        return self.parent
+
+    def test_shows_grades_with_weighted_average(self):
+        self.login(self.parent)
+
+        response = self.client.get(self.get_url())
+
+        [(subject_name, grades, average)] = response.context["subjects"]
+        self.assertEqual(subject_name, "Math")
+        self.assertEqual(len(grades), 2)
+        self.assertEqual(average, 4)
+
+    def test_shows_attendance_summary(self):
+        self.login(self.parent)
+
+        response = self.client.get(self.get_url())
+
+        self.assertEqual(
+            response.context["attendance"],
+            [("Present", 2), ("Absent", 1), ("Exempt", 0), ("Excused", 0)],
+        )
+        self.assertEqual(response.context["total_attendance"], 3)
+
+    def test_returns_404_if_year_is_not_closed(self):
+        open_year = self.create_school_year(
+            "2026/2027", datetime.date(2026, 9, 1), datetime.date(2027, 6, 30)
+        )
+        self.login(self.parent)
+
+        response = self.client.get(self.get_url(school_year_pk=open_year.pk))
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,204 @@
+import datetime
+import os
+import tempfile
+from io import StringIO
+from shutil import rmtree
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from django_school.apps.classes.models import Class
+from django_school.apps.common.models import AttachedFile, IdempotencyKey
+from django_school.apps.common.previews import get_preview_name
+from django_school.apps.events.models import EventStatus
+from django_school.apps.grades.models import Grade, GradeCategory
+from django_school.apps.lessons.models import (Attendance, Homework, Lesson,
+                                               LessonSession, Subject)
+from django_school.apps.messages.models import Message, MessageStatus
+from django_school.apps.schools.models import School
+from django_school.apps.users.models import ROLES
+from tests.utils import ClassesMixin, LessonsMixin, UsersMixin
+
+User = get_user_model()
+
+
+class GenerateSchoolTestCase(TestCase):
+    options = {
+        "classes": 2,
+        "students_per_class": 3,
+        "teachers": 15,
+        "lessons_per_subject": 1,
+        "weeks": 2,
+        "grades_per_subject": 2,
+        "homeworks_per_class": 2,
+        "messages_per_user": 1,
+        "events_per_class": 2,
+        "batch_size": 4,
+    }
+
+    def generate_school(self, **kwargs):
+        call_command("generate_school", stdout=StringIO(), **self.options, **kwargs)
+
+    def test_creates_school_of_given_size(self):
+        self.generate_school()
+
+        self.assertEqual(Class.objects.count(), 2)
+        self.assertEqual(User.teachers.count(), 15)
+        self.assertEqual(User.students.count(), 6)
+        self.assertEqual(User.objects.filter(role=ROLES.PARENT).count(), 6)
+        self.assertEqual(Lesson.objects.count(), 2 * 11)
+        self.assertEqual(GradeCategory.objects.count(), 2 * 11 * 2)
+        self.assertEqual(Grade.objects.count(), 6 * 11 * 2)
+        self.assertEqual(Homework.objects.count(), 2 * 2)
+        self.assertEqual(EventStatus.objects.count(), 2 * 2 * 3)
+        self.assertEqual(Message.objects.count(), 15 + 6)
+        self.assertEqual(MessageStatus.objects.count(), (15 + 6) * 3)
+
+    def test_creates_rows_of_new_school(self):
+        self.generate_school(prefix="first")
+        self.generate_school(prefix="second", domain="second.example.com")
+
+        second = School.objects.get(domain="second.example.com")
+        self.assertEqual(School.objects.count(), 2)
+        self.assertEqual(User.objects.filter(school=second).count(), 15 + 6 + 6)
+        self.assertEqual(Class.objects.filter(school=second).count(), 2)
+        self.assertEqual(Subject.objects.filter(school=second).count(), 11)
+        self.assertFalse(
+            Lesson.objects.filter(school_class__school=second)
+            .exclude(subject__school=second, teacher__school=second)
+            .exists()
+        )
+
+    def test_creates_attendance_for_every_student_of_lesson_session(self):
+        self.generate_school()
+
+        self.assertTrue(LessonSession.objects.exists())
+        self.assertEqual(Attendance.objects.count(), LessonSession.objects.count() * 3)
+        self.assertFalse(
+            Attendance.objects.exclude(
+                student__school_class=F("lesson_session__lesson__school_class")
+            ).exists()
+        )
+
+    def test_generated_users_can_log_in(self):
+        self.generate_school(password="secret")
+
+        self.assertTrue(self.client.login(username="gen-teacher-0", password="secret"))
+
+    def test_is_deterministic_for_given_seed(self):
+        self.generate_school(seed=1, prefix="first")
+        self.generate_school(seed=1, prefix="second")
+
+        first_grades = list(
+            Grade.objects.filter(student__username__startswith="first")
+            .order_by("pk")
+            .values_list("grade", "weight")
+        )
+        second_grades = list(
+            Grade.objects.filter(student__username__startswith="second")
+            .order_by("pk")
+            .values_list("grade", "weight")
+        )
+        self.assertEqual(first_grades, second_grades)
+
+
+@override_settings(MEDIA_ROOT="temp_dir/")
+class GcAttachmentsTestCase(UsersMixin, ClassesMixin, LessonsMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = cls.create_teacher()
+        cls.subject = cls.create_subject()
+        cls.lesson = cls.create_lesson(cls.subject, cls.teacher, cls.create_class())
+        cls.lesson_session = cls.create_lesson_session(cls.lesson)
+
+    def setUp(self):
+        self.storage = AttachedFile._meta.get_field("file").storage
+        self.file = self.create_file(self.lesson_session, self.teacher)
+        self.orphan = self.storage.save(
+            "attached_files/orphan.txt", ContentFile(b"orphan")
+        )
+        self.make_old(self.file.file.name)
+        self.make_old(self.orphan)
+
+    def tearDown(self):
+        rmtree("temp_dir/")
+
+    def make_old(self, name):
+        os.utime(self.storage.path(name), (0, 0))
+
+    def call_command(self, **kwargs):
+        out = StringIO()
+        call_command("gc_attachments", stdout=out, verbosity=2, **kwargs)
+
+        return out.getvalue()
+
+    def test_lists_orphaned_files_without_deleting_them(self):
+        output = self.call_command()
+
+        self.assertIn(f"Orphaned: {self.orphan}", output)
+        self.assertIn("Orphaned files found: 1", output)
+        self.assertTrue(self.storage.exists(self.orphan))
+
+    def test_deletes_orphaned_files(self):
+        self.call_command(delete=True)
+
+        self.assertFalse(self.storage.exists(self.orphan))
+        self.assertTrue(self.storage.exists(self.file.file.name))
+
+    def test_moves_orphaned_files_to_quarantine(self):
+        quarantine = tempfile.mkdtemp()
+        self.addCleanup(rmtree, quarantine)
+
+        self.call_command(quarantine=quarantine)
+
+        self.assertFalse(self.storage.exists(self.orphan))
+        self.assertTrue(os.path.exists(os.path.join(quarantine, self.orphan)))
+
+    def test_raises_error_if_quarantine_is_inside_of_storage(self):
+        with self.assertRaises(CommandError):
+            self.call_command(quarantine="temp_dir/attached_files/quarantine")
+
+    def test_keeps_previews_of_referenced_files(self):
+        preview = get_preview_name(self.file.file.name)
+        with open(self.storage.path(preview), "wb") as file:
+            file.write(b"preview")
+        self.make_old(preview)
+
+        self.call_command(delete=True)
+
+        self.assertTrue(self.storage.exists(preview))
+
+    def test_skips_recently_modified_files(self):
+        recent = self.storage.save("attached_files/recent.txt", ContentFile(b"new"))
+
+        self.call_command(delete=True)
+
+        self.assertTrue(self.storage.exists(recent))
+
+    def test_reports_missing_files(self):
+        self.storage.delete(self.file.file.name)
+
+        output = self.call_command()
+
+        self.assertIn(f"Missing: {self.file.file.name}", output)
+        self.assertIn("Missing files: 1", output)
+
+
+class DeleteExpiredIdempotencyKeysTestCase(UsersMixin, TestCase):
+    def test_deletes_only_expired_keys(self):
+        teacher = self.create_teacher()
+        expired = IdempotencyKey.objects.create(user=teacher, key="expired")
+        IdempotencyKey.objects.filter(pk=expired.pk).update(
+            created=timezone.now() - datetime.timedelta(days=2)
+        )
+        current = IdempotencyKey.objects.create(user=teacher, key="current")
+        out = StringIO()
+
+        call_command("delete_expired_idempotency_keys", stdout=out)
+
+        self.assertQuerysetEqual(IdempotencyKey.objects.all(), [current])
+        self.assertIn("Deleted 1 idempotency keys", out.getvalue())
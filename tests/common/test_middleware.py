@@ -0,0 +1,70 @@
+import gzip
+
+import brotli
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from django_school.apps.common.middleware import (CompressionMiddleware,
+                                                  get_accepted_encodings)
+
+CONTENT = b"<tr><td>Student</td><td>5</td></tr>" * 50
+
+
+class CompressionMiddlewareTestCase(SimpleTestCase):
+    def get_response(self, accept_encoding, response=None):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        middleware = CompressionMiddleware(
+            lambda request: response or HttpResponse(CONTENT)
+        )
+
+        return middleware(request)
+
+    def test_prefers_brotli(self):
+        response = self.get_response("gzip, deflate, br")
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), CONTENT)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_falls_back_to_gzip(self):
+        response = self.get_response("gzip;q=0.8, br;q=0")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), CONTENT)
+
+    def test_does_not_compress_if_client_does_not_accept_encodings(self):
+        response = self.get_response("identity")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, CONTENT)
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_does_not_compress_short_binary_or_streaming_responses(self):
+        responses = [
+            HttpResponse(b"<p>Short</p>"),
+            HttpResponse(CONTENT, content_type="application/pdf"),
+            StreamingHttpResponse([CONTENT]),
+        ]
+
+        for response in responses:
+            with self.subTest(response=response):
+                response = self.get_response("br", response)
+
+                self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_weakens_strong_etag(self):
+        response = HttpResponse(CONTENT)
+        response["ETag"] = '"abc"'
+
+        response = self.get_response("br", response)
+
+        self.assertEqual(response["ETag"], 'W/"abc"')
+
+
+class GetAcceptedEncodingsTestCase(SimpleTestCase):
+    def test_skips_encodings_with_zero_quality_and_invalid_items(self):
+        self.assertEqual(
+            get_accepted_encodings("GZIP;q=0.5, br;q=0, deflate;q=x, ;, *"),
+            {"gzip", "*"},
+        )
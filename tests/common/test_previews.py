@@ -0,0 +1,65 @@
+import os
+import tempfile
+from io import BytesIO
+from shutil import rmtree
+
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, override_settings
+from PIL import Image
+
+from django_school.apps.common.previews import (generate_preview,
+                                                get_original_name,
+                                                get_preview_name)
+from django_school.apps.common.storage import ContentAddressedStorage
+
+
+def create_image(size=(1000, 500), format="PNG"):
+    data = BytesIO()
+    Image.new("RGB", size, "red").save(data, format)
+
+    return ContentFile(data.getvalue())
+
+
+@override_settings(ATTACHMENT_PREVIEW_SIZE=(100, 100))
+class GeneratePreviewTestCase(SimpleTestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.storage = ContentAddressedStorage(location=self.location)
+
+    def tearDown(self):
+        rmtree(self.location)
+
+    def test_saves_thumbnail_of_image_next_to_it(self):
+        name = self.storage.save("attached_files/image.png", create_image())
+
+        preview_name = generate_preview(self.storage, name)
+
+        self.assertEqual(preview_name, f"{name}.preview.jpg")
+        with Image.open(self.storage.path(preview_name)) as preview:
+            self.assertEqual(preview.format, "JPEG")
+            self.assertEqual(preview.size, (100, 50))
+
+    def test_returns_none_if_file_is_not_image(self):
+        name = self.storage.save("attached_files/notes.txt", ContentFile(b"notes"))
+
+        self.assertIsNone(generate_preview(self.storage, name))
+        self.assertFalse(self.storage.exists(get_preview_name(name)))
+
+    def test_raises_error_if_image_is_broken(self):
+        name = self.storage.save("attached_files/image.png", ContentFile(b"broken"))
+
+        with self.assertRaises(OSError):
+            generate_preview(self.storage, name)
+        # the temporary file is removed
+        self.assertEqual(
+            os.listdir(os.path.dirname(self.storage.path(name))), [name.split("/")[-1]]
+        )
+
+    def test_gets_original_name_of_preview(self):
+        self.assertEqual(
+            get_original_name(get_preview_name("attached_files/ab/ab.png")),
+            "attached_files/ab/ab.png",
+        )
+        self.assertEqual(
+            get_original_name("attached_files/ab/ab.png"), "attached_files/ab/ab.png"
+        )
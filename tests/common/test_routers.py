@@ -0,0 +1,274 @@
+import copy
+from collections import defaultdict
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.db import OperationalError, connection, connections
+from django.http import HttpResponse
+from django.test import (RequestFactory, SimpleTestCase, TransactionTestCase,
+                         override_settings)
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.views import View
+
+from django_school.apps.common import middleware, routers
+from django_school.apps.common.middleware import (STICKY_PRIMARY_COOKIE,
+                                                  ReplicaMiddleware)
+from django_school.apps.common.routers import (ReplicaRouter, current_replica,
+                                               get_replica, is_read_only,
+                                               read_only)
+from django_school.apps.common.utils import etag_from_versions
+from django_school.apps.monitoring import middleware as monitoring_middleware
+from tests.utils import SHARED_CACHES, ClassesMixin, UsersMixin
+
+User = get_user_model()
+
+
+class ReadOnlyTestCase(SimpleTestCase):
+    def test_marks_function_view(self):
+        @read_only
+        def view(request):
+            pass
+
+        self.assertTrue(is_read_only(view))
+
+    def test_marks_class_based_view(self):
+        @read_only
+        class ReadOnlyView(View):
+            pass
+
+        self.assertTrue(is_read_only(ReadOnlyView.as_view()))
+
+    def test_views_are_not_read_only_by_default(self):
+        self.assertFalse(is_read_only(View.as_view()))
+
+    def test_read_heavy_views_are_read_only(self):
+        urls = [
+            reverse("lessons:timetables_list"),
+            reverse("lessons:class_attendance", args=["1a"]),
+            reverse("grades:class_grades", args=["1a", "math"]),
+            reverse("classes:summary_pdf", args=["1a"]),
+        ]
+
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertTrue(is_read_only(resolve(url).func))
+
+    def test_views_marking_items_as_seen_are_not_read_only(self):
+        # the unseen counters of the same response would be read from a replica
+        # which hasn't got the write yet
+        urls = [
+            reverse("grades:student_grades", args=["student"]),
+            reverse("events:calendar"),
+            reverse("users:note_list"),
+        ]
+
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertFalse(is_read_only(resolve(url).func))
+
+
+class ReplicaRouterTestCase(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.addCleanup(current_replica.set, None)
+
+    def test_reads_from_primary_if_replica_is_not_chosen(self):
+        self.assertIsNone(self.router.db_for_read(User))
+
+    def test_reads_from_chosen_replica(self):
+        current_replica.set("replica1")
+
+        self.assertEqual(self.router.db_for_read(User), "replica1")
+
+    def test_always_reads_sessions_from_primary(self):
+        current_replica.set("replica1")
+
+        self.assertEqual(self.router.db_for_read(Session), "default")
+
+    def test_always_writes_to_primary(self):
+        current_replica.set("replica1")
+        user = User(username="user")
+        user._state.db = "replica1"
+
+        self.assertEqual(self.router.db_for_write(User, instance=user), "default")
+
+
+@override_settings(DATABASE_REPLICAS=["replica1", "replica2"], REPLICA_RETRY_SECONDS=30)
+class GetReplicaTestCase(SimpleTestCase):
+    def setUp(self):
+        self.connections = defaultdict(MagicMock)
+        patcher = patch.object(routers, "connections", self.connections)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.dict(routers._unhealthy_until, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_chooses_replicas_in_round_robin(self):
+        chosen = {get_replica(), get_replica()}
+
+        self.assertEqual(chosen, {"replica1", "replica2"})
+
+    def test_skips_unavailable_replica(self):
+        self.connections["replica1"].ensure_connection.side_effect = OperationalError
+
+        with self.assertLogs(routers.logger, "WARNING"):
+            chosen = {get_replica() for _ in range(4)}
+
+        self.assertEqual(chosen, {"replica2"})
+        self.assertEqual(self.connections["replica1"].ensure_connection.call_count, 1)
+
+    def test_returns_none_if_all_replicas_are_unavailable(self):
+        for alias in ["replica1", "replica2"]:
+            self.connections[alias].ensure_connection.side_effect = OperationalError
+
+        with self.assertLogs(routers.logger, "WARNING"):
+            self.assertIsNone(get_replica())
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_returns_none_if_there_are_no_replicas(self):
+        self.assertIsNone(get_replica())
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"], REPLICA_STICKINESS_SECONDS=10)
+class ReplicaMiddlewareTestCase(SimpleTestCase):
+    def setUp(self):
+        patcher = patch.object(middleware, "get_replica", return_value="replica1")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_response(self, view, method="get", cookies=None):
+        def get_response(request):
+            replica_middleware.process_view(request, view, (), {})
+            return view(request)
+
+        request = getattr(RequestFactory(), method)("/test")
+        request.COOKIES.update(cookies or {})
+        replica_middleware = ReplicaMiddleware(get_response)
+
+        return replica_middleware(request)
+
+    def get_replica_of_view(self, view, **kwargs):
+        used_replicas = []
+
+        def recording_view(request):
+            used_replicas.append(current_replica.get())
+            return view(request)
+
+        recording_view.read_only = getattr(view, "read_only", False)
+        recording_view.etag_models = getattr(view, "etag_models", None)
+        self.get_response(recording_view, **kwargs)
+
+        return used_replicas[0]
+
+    def test_uses_replica_for_read_only_views(self):
+        @read_only
+        def view(request):
+            return HttpResponse()
+
+        self.assertEqual(self.get_replica_of_view(view), "replica1")
+        self.assertIsNone(current_replica.get())
+
+    def test_does_not_use_replica_for_other_views(self):
+        def view(request):
+            return HttpResponse()
+
+        self.assertIsNone(self.get_replica_of_view(view))
+
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_does_not_use_replica_for_views_with_versions_etag(self):
+        # the ETag of the newer rows could be sent with the page of a lagging replica
+        @read_only
+        @etag_from_versions(User)
+        def view(request):
+            return HttpResponse()
+
+        self.assertIsNone(self.get_replica_of_view(view))
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_uses_replica_for_views_with_versions_etag_if_cache_is_not_shared(self):
+        @read_only
+        @etag_from_versions(User)
+        def view(request):
+            return HttpResponse()
+
+        self.assertEqual(self.get_replica_of_view(view), "replica1")
+
+    def test_does_not_use_replica_for_post_requests(self):
+        @read_only
+        def view(request):
+            return HttpResponse()
+
+        self.assertIsNone(self.get_replica_of_view(view, method="post"))
+
+    def test_sets_sticky_cookie_after_post(self):
+        def view(request):
+            return HttpResponse()
+
+        response = self.get_response(view, method="post")
+
+        self.assertEqual(response.cookies[STICKY_PRIMARY_COOKIE]["max-age"], 10)
+
+    def test_does_not_set_sticky_cookie_after_failed_post(self):
+        def view(request):
+            return HttpResponse(status=400)
+
+        response = self.get_response(view, method="post")
+
+        self.assertNotIn(STICKY_PRIMARY_COOKIE, response.cookies)
+
+    def test_does_not_use_replica_if_client_changed_something_recently(self):
+        @read_only
+        def view(request):
+            return HttpResponse()
+
+        replica = self.get_replica_of_view(view, cookies={STICKY_PRIMARY_COOKIE: "1"})
+
+        self.assertIsNone(replica)
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class ReplicaDatabaseTestCase(ClassesMixin, UsersMixin, TransactionTestCase):
+    """
+    Runs the requests against a second database alias. Unlike a TEST MIRROR,
+    which is set up by the test runner only for the replicas configured with
+    PSQL_REPLICA_HOSTS, the alias has its own connection to the test database,
+    so the test tells which connection each query was sent to.
+    """
+
+    def setUp(self):
+        connections.settings["replica1"] = copy.deepcopy(connection.settings_dict)
+        self.addCleanup(connections.settings.pop, "replica1")
+        self.addCleanup(connections.__delitem__, "replica1")
+        self.addCleanup(lambda: connections["replica1"].close())
+        patcher = patch.dict(routers._unhealthy_until, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.create_class()
+        self.create_teacher()
+
+    def get_timetables(self):
+        with CaptureQueriesContext(connection) as primary_queries:
+            with CaptureQueriesContext(connections["replica1"]) as replica_queries:
+                self.client.get(reverse("lessons:timetables_list"))
+
+        return primary_queries, replica_queries
+
+    def test_read_only_view_reads_from_replica(self):
+        primary_queries, replica_queries = self.get_timetables()
+
+        self.assertIn("classes_class", " ".join(q["sql"] for q in replica_queries))
+        self.assertNotIn("classes_class", " ".join(q["sql"] for q in primary_queries))
+
+    def test_query_budget_counts_queries_of_replica(self):
+        with self.assertLogs(monitoring_middleware.logger, "DEBUG") as logs:
+            _, replica_queries = self.get_timetables()
+
+        # the school is resolved before the budget is counted
+        self.assertEqual(len(replica_queries), 2)
+        self.assertIn("lessons:timetables_list: 2 queries", logs.output[0])
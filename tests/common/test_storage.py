@@ -0,0 +1,113 @@
+import gzip
+import hashlib
+import os
+import tempfile
+from io import StringIO
+from shutil import rmtree
+
+import brotli
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from django_school.apps.common.storage import (ContentAddressedStorage,
+                                               compress_static_file)
+
+
+class ContentAddressedStorageTestCase(SimpleTestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.storage = ContentAddressedStorage(location=self.location)
+
+    def tearDown(self):
+        rmtree(self.location)
+
+    def test_names_file_after_digest_of_content(self):
+        digest = hashlib.sha256(b"content").hexdigest()
+
+        name = self.storage.save(
+            "attached_files/Worksheet.PDF", ContentFile(b"content")
+        )
+
+        self.assertEqual(name, f"attached_files/{digest[:2]}/{digest}.pdf")
+        with self.storage.open(name) as file:
+            self.assertEqual(file.read(), b"content")
+
+    def test_stores_same_content_once(self):
+        name1 = self.storage.save("attached_files/a.txt", ContentFile(b"content"))
+        name2 = self.storage.save("attached_files/b.txt", ContentFile(b"content"))
+        name3 = self.storage.save("attached_files/c.txt", ContentFile(b"other"))
+
+        self.assertEqual(name1, name2)
+        self.assertNotEqual(name1, name3)
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.location, "attached_files"))),
+            sorted({name1.split("/")[1], name3.split("/")[1]}),
+        )
+
+
+class CompressStaticFileTestCase(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(rmtree, self.directory)
+
+    def create_file(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as file:
+            file.write(content)
+
+        return path
+
+    def test_writes_brotli_and_gzip_variants(self):
+        content = b"body { color: red; }\n" * 100
+        path = self.create_file("main.css", content)
+
+        written = compress_static_file(path)
+
+        self.assertEqual(written, [f"{path}.br", f"{path}.gz"])
+        with open(f"{path}.br", "rb") as file:
+            self.assertEqual(brotli.decompress(file.read()), content)
+        with gzip.open(f"{path}.gz") as file:
+            self.assertEqual(file.read(), content)
+
+    def test_skips_variants_which_are_not_smaller(self):
+        path = self.create_file("random.js", os.urandom(1024))
+
+        self.assertEqual(compress_static_file(path), [])
+        self.assertEqual(os.listdir(self.directory), ["random.js"])
+
+
+class CompressedManifestStaticFilesStorageTestCase(SimpleTestCase):
+    def setUp(self):
+        self.static_dir = tempfile.mkdtemp()
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(rmtree, self.static_dir)
+        self.addCleanup(rmtree, self.static_root)
+        with open(os.path.join(self.static_dir, "main.css"), "w") as file:
+            file.write("body { background: url('bg.png'); }\n" * 20)
+        with open(os.path.join(self.static_dir, "bg.png"), "wb") as file:
+            file.write(os.urandom(512))
+
+    def test_collects_hashed_and_compressed_files(self):
+        with override_settings(
+            STATICFILES_STORAGE=(
+                "django_school.apps.common.storage."
+                "CompressedManifestStaticFilesStorage"
+            ),
+            STATICFILES_DIRS=[self.static_dir],
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+            STATIC_ROOT=self.static_root,
+            STATICFILES_COMPRESS_WORKERS=1,
+        ):
+            call_command("collectstatic", interactive=False, stdout=StringIO())
+            hashed_css = staticfiles_storage.stored_name("main.css")
+            hashed_png = staticfiles_storage.stored_name("bg.png")
+
+        files = os.listdir(self.static_root)
+        self.assertNotEqual(hashed_css, "main.css")
+        self.assertIn(f"{hashed_css}.br", files)
+        self.assertIn(f"{hashed_css}.gz", files)
+        self.assertNotIn(f"{hashed_png}.gz", files)
+        with open(os.path.join(self.static_root, hashed_css)) as file:
+            self.assertIn(hashed_png, file.read())
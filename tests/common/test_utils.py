@@ -1,11 +1,12 @@
 from django.core.exceptions import PermissionDenied
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
 from django.test import RequestFactory, TestCase
 from django.views import View
 
 from django_school.apps.common.utils import (
     AjaxRequiredMixin, GetObjectCacheMixin, RolesRequiredMixin, ajax_required,
-    does_the_teacher_teach_the_subject_to_the_class, roles_required)
+    does_the_teacher_teach_the_subject_to_the_class,
+    get_school_class_and_subject_or_404, roles_required)
 from django_school.apps.users.models import ROLES
 from tests.utils import ClassesMixin, LessonsMixin, UsersMixin
 
@@ -88,6 +89,55 @@ class DoesTheTeacherTeachTheSubjectToTheClassTestCase(
         self.assertFalse(result)
 
 
+class GetSchoolClassAndSubjectOr404TestCase(
+    UsersMixin, ClassesMixin, LessonsMixin, TestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = cls.create_teacher()
+        cls.school_class = cls.create_class()
+        cls.subject = cls.create_subject()
+
+    def test_returns_class_and_subject_if_teacher_teaches(self):
+        self.create_lesson(self.subject, self.teacher, self.school_class)
+
+        result = get_school_class_and_subject_or_404(
+            self.teacher, self.school_class.slug, self.subject.slug
+        )
+
+        self.assertEqual(result, (self.school_class, self.subject))
+
+    def test_raises_404_if_teacher_does_not_teach(self):
+        teacher2 = self.create_teacher(username="teacher2")
+        self.create_lesson(self.subject, teacher2, self.school_class)
+
+        with self.assertRaises(Http404):
+            get_school_class_and_subject_or_404(
+                self.teacher, self.school_class.slug, self.subject.slug
+            )
+
+    def test_raises_404_if_class_or_subject_does_not_exist(self):
+        self.create_lesson(self.subject, self.teacher, self.school_class)
+
+        with self.assertRaises(Http404):
+            get_school_class_and_subject_or_404(
+                self.teacher, "does-not-exist", self.subject.slug
+            )
+
+        with self.assertRaises(Http404):
+            get_school_class_and_subject_or_404(
+                self.teacher, self.school_class.slug, "does-not-exist"
+            )
+
+    def test_performs_one_query(self):
+        self.create_lesson(self.subject, self.teacher, self.school_class)
+
+        with self.assertNumQueries(1):
+            get_school_class_and_subject_or_404(
+                self.teacher, self.school_class.slug, self.subject.slug
+            )
+
+
 class GetObjectCacheMixinTestCase(TestCase):
     class DummyBaseView(View):
         get_object_calls_counter = 0
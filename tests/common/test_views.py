@@ -1,13 +1,17 @@
-from os import path
+from io import BytesIO
+from os import path, utime
 from shutil import rmtree
 
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase, override_settings
 from django.urls import reverse
+from PIL import Image
 
 from django_school.apps.common.models import AttachedFile
+from django_school.apps.common.previews import generate_preview
 from tests.utils import (AjaxRequiredTestMixin, ClassesMixin, LessonsMixin,
-                         ResourceViewTestMixin, RolesRequiredTestMixin,
-                         UsersMixin)
+                         LoginRequiredTestMixin, ResourceViewTestMixin,
+                         RolesRequiredTestMixin, UsersMixin)
 
 
 @override_settings(MEDIA_ROOT="temp_dir/")
@@ -79,7 +83,168 @@ class AttachedFileDeleteViewTestCase(
 
     def test_deletes_file(self):
         self.login(self.teacher)
+        utime(self.file.file.path, (0, 0))
 
-        self.client.post(self.get_url())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.get_url())
 
         self.assertFalse(path.exists(self.file.file.path))
+
+    def test_keeps_recently_modified_file_for_gc(self):
+        # the blob may have been reused by an upload which hasn't committed yet
+        self.login(self.teacher)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.get_url())
+
+        self.assertTrue(path.exists(self.file.file.path))
+
+    def test_keeps_file_shared_by_other_attached_files(self):
+        self.login(self.teacher)
+        other_file = self.create_file(
+            related_object=self.lesson_session, creator=self.teacher
+        )
+        utime(self.file.file.path, (0, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.get_url())
+
+        self.assertEqual(other_file.file.name, self.file.file.name)
+        self.assertTrue(path.exists(self.file.file.path))
+
+
+@override_settings(MEDIA_ROOT="temp_dir/", PROTECTED_FILES_HEADER=None)
+class AttachedFileDownloadViewTestCase(
+    LoginRequiredTestMixin,
+    ResourceViewTestMixin,
+    UsersMixin,
+    ClassesMixin,
+    LessonsMixin,
+    TestCase,
+):
+    path_name = "attached_file_download"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = cls.create_teacher()
+        cls.school_class = cls.create_class()
+        cls.student = cls.create_student(school_class=cls.school_class)
+        cls.subject = cls.create_subject()
+        cls.lesson = cls.create_lesson(cls.subject, cls.teacher, cls.school_class)
+        cls.lesson_session = cls.create_lesson_session(cls.lesson)
+
+    def setUp(self):
+        self.file = self.create_file(
+            related_object=self.lesson_session, creator=self.teacher
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        rmtree("temp_dir/")
+
+    def get_url(self, file_pk=None):
+        file_pk = file_pk or self.file.pk
+
+        return reverse(self.path_name, args=[file_pk])
+
+    def get_nonexistent_resource_url(self):
+        return self.get_url(file_pk=12345)
+
+    def get_permitted_user(self):
+        return self.student
+
+    def test_sends_file_if_related_object_is_visible_to_user(self):
+        self.login(self.student)
+
+        response = self.client.get(self.get_url())
+
+        self.assertEqual(b"".join(response.streaming_content), b"file_content")
+        self.assertEqual(response["Content-Length"], "12")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(
+            response["Content-Disposition"],
+            f'attachment; filename="{self.file.filename}"',
+        )
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_returns_404_if_related_object_is_not_visible_to_user(self):
+        homework = self.create_homework(self.subject, self.teacher, self.school_class)
+        realisation = self.create_realisation(homework, self.student)
+        file = self.create_file(related_object=realisation, creator=self.student)
+        self.login(self.create_student("student2", school_class=self.school_class))
+
+        response = self.client.get(self.get_url(file_pk=file.pk))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_sends_requested_range_of_file(self):
+        self.login(self.student)
+
+        response = self.client.get(self.get_url(), HTTP_RANGE="bytes=5-")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"content")
+        self.assertEqual(response["Content-Range"], "bytes 5-11/12")
+        self.assertEqual(response["Content-Length"], "7")
+
+    def test_sends_suffix_range_of_file(self):
+        self.login(self.student)
+
+        response = self.client.get(self.get_url(), HTTP_RANGE="bytes=-4")
+
+        self.assertEqual(b"".join(response.streaming_content), b"tent")
+        self.assertEqual(response["Content-Range"], "bytes 8-11/12")
+
+    def test_returns_416_if_range_is_not_satisfiable(self):
+        self.login(self.student)
+
+        response = self.client.get(self.get_url(), HTTP_RANGE="bytes=12-")
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */12")
+
+    @override_settings(PROTECTED_FILES_HEADER="X-Accel-Redirect")
+    def test_hands_transfer_to_nginx(self):
+        self.login(self.student)
+
+        response = self.client.get(self.get_url())
+
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected/{self.file.file.name}"
+        )
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["Content-Type"], "text/plain")
+
+    def test_sends_preview_of_file(self):
+        image = BytesIO()
+        Image.new("RGB", (10, 10)).save(image, "PNG")
+        file = AttachedFile.objects.create(
+            related_object=self.lesson_session,
+            creator=self.teacher,
+            file=SimpleUploadedFile("image.png", image.getvalue()),
+        )
+        generate_preview(file.file.storage, file.file.name)
+        self.login(self.student)
+
+        response = self.client.get(reverse("attached_file_preview", args=[file.pk]))
+
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertTrue(response["Content-Disposition"].startswith("inline"))
+
+    def test_returns_404_if_file_has_no_preview(self):
+        self.login(self.student)
+
+        response = self.client.get(
+            reverse("attached_file_preview", args=[self.file.pk])
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(PROTECTED_FILES_HEADER="X-Sendfile")
+    def test_hands_transfer_to_sendfile_server(self):
+        self.login(self.student)
+
+        response = self.client.get(self.get_url())
+
+        self.assertEqual(response["X-Sendfile"], self.file.file.path)
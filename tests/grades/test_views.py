@@ -1,10 +1,13 @@
-from django.test import TestCase
+from django.contrib import messages
+from django.contrib.messages.storage.base import Message
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
 
 from django_school.apps.grades.forms import GradeCategoryForm
 from django_school.apps.grades.models import Grade, GradeCategory
-from tests.utils import (AjaxRequiredTestMixin, ClassesMixin, GradesMixin,
-                         LessonsMixin, LoginRequiredTestMixin,
+from tests.utils import (SHARED_CACHES, AjaxRequiredTestMixin, ClassesMixin,
+                         GradesMixin, LessonsMixin, LoginRequiredTestMixin,
                          ResourceViewTestMixin, RolesRequiredTestMixin,
                          UsersMixin)
 
@@ -128,6 +131,7 @@ class GradeCreateViewTestCase(SubjectAndSchoolClassRelatedTestMixin, TestCase):
         self.assertEqual(form.initial["student"], str(self.student.pk))
 
 
+@override_settings(CACHES=SHARED_CACHES)
 class ClassGradesViewTestCase(SubjectAndSchoolClassRelatedTestMixin, TestCase):
     path_name = "grades:class_grades"
 
@@ -163,6 +167,69 @@ class ClassGradesViewTestCase(SubjectAndSchoolClassRelatedTestMixin, TestCase):
 
         self.assertContains(response, expected_avg)
 
+    def get_etag(self):
+        # the first response sets the CSRF cookie, which the ETag is made of
+        self.client.get(self.get_url())
+        return self.client.get(self.get_url())["ETag"]
+
+    def test_returns_304_if_grades_have_not_changed(self):
+        self.login(self.teacher)
+        etag = self.get_etag()
+
+        response = self.client.get(self.get_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertIsNone(response.context)
+
+    def test_renders_page_again_after_grade_is_added(self):
+        self.login(self.teacher)
+        etag = self.get_etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_grade(self.category, self.subject, self.student, self.teacher)
+
+        response = self.client.get(self.get_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_renders_page_again_for_another_user(self):
+        self.login(self.teacher)
+        etag = self.get_etag()
+        teacher2 = self.create_teacher(username="teacher2")
+        self.create_lesson(self.subject, teacher2, self.school_class)
+        self.login(teacher2)
+
+        response = self.client.get(self.get_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_renders_page_again_if_there_are_pending_messages(self):
+        self.login(self.teacher)
+        etag = self.get_etag()
+        storage = CookieStorage(RequestFactory().get("/"))
+        self.client.cookies[storage.cookie_name] = storage._encode(
+            [Message(messages.SUCCESS, "The grade has been added successfully.")]
+        )
+
+        response = self.client.get(self.get_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "The grade has been added successfully.")
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_does_not_return_etag_if_cache_is_not_shared(self):
+        # the versions in the memory of a worker miss the changes made by others
+        self.login(self.teacher)
+        self.client.get(self.get_url())
+
+        response = self.client.get(self.get_url())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("ETag"))
+
 
 class StudentGradesViewTestCase(
     LoginRequiredTestMixin,
@@ -4,7 +4,7 @@ from django.core.exceptions import ValidationError
 from django.test import TestCase
 
 from django_school.apps.lessons.models import (Attendance, Homework,
-                                               LessonSession, Subject)
+                                               LessonSession)
 from tests.utils import ClassesMixin, LessonsMixin, UsersMixin
 
 
@@ -20,31 +20,6 @@ class SubjectModelTestCase(LessonsMixin, TestCase):
         self.assertEqual(subject.slug, "cs")
 
 
-class SubjectQuerySetTestCase(UsersMixin, ClassesMixin, LessonsMixin, TestCase):
-    @classmethod
-    def setUpTestData(cls):
-        cls.teacher = cls.create_teacher()
-        cls.school_class = cls.create_class()
-        cls.subject = cls.create_subject()
-
-    def test_with_does_the_teacher_teach_the_subject_to_the_class_if_user_does_not_teach(
-        self,
-    ):
-        subject = Subject.objects.with_does_the_teacher_teach_the_subject_to_the_class(
-            self.teacher, self.school_class
-        ).get()
-
-        self.assertFalse(subject.does_the_teacher_teach_the_subject_to_the_class)
-
-    def test_with_does_the_teacher_teach_the_subject_to_the_class_if_user_teaches(self):
-        self.create_lesson(self.subject, self.teacher, self.school_class)
-        subject = Subject.objects.with_does_the_teacher_teach_the_subject_to_the_class(
-            self.teacher, self.school_class
-        ).get()
-
-        self.assertTrue(subject.does_the_teacher_teach_the_subject_to_the_class)
-
-
 class LessonModelTestCase(UsersMixin, ClassesMixin, LessonsMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -115,6 +90,18 @@ class AttendanceModelTestCase(UsersMixin, ClassesMixin, LessonsMixin, TestCase):
         with self.assertRaises(ValidationError):
             Attendance(student=student, lesson_session=lesson_session).clean()
 
+    def test_visible_to_user_returns_empty_qs_if_user_has_no_role(self):
+        teacher = self.create_teacher()
+        school_class = self.create_class()
+        student = self.create_student(school_class=school_class)
+        lesson = self.create_lesson(self.create_subject(), teacher, school_class)
+        self.create_attendance(self.create_lesson_session(lesson), [student])
+        admin = self.create_user(username="admin")
+
+        qs = Attendance.objects.visible_to_user(admin)
+
+        self.assertQuerysetEqual(qs, Attendance.objects.none())
+
 
 class HomeworkQuerySetTestCase(UsersMixin, ClassesMixin, LessonsMixin, TestCase):
     @classmethod
@@ -159,6 +146,19 @@ class HomeworkQuerySetTestCase(UsersMixin, ClassesMixin, LessonsMixin, TestCase)
         self.assertEqual(homework.submitted_count, 1)
         self.assertEqual(homework.total_count, 2)
 
+    def test_with_realisations_count_does_not_multiply_counts(self):
+        student2 = self.create_student(
+            username="student2", school_class=self.school_class
+        )
+        self.create_student(username="student3", school_class=self.school_class)
+        self.create_realisation(self.homework, self.student)
+        self.create_realisation(self.homework, student2)
+
+        homework = Homework.objects.with_realisations_count().get()
+
+        self.assertEqual(homework.submitted_count, 2)
+        self.assertEqual(homework.total_count, 3)
+
     def test_with_realisations(self):
         student2 = self.create_student(
             username="student2", school_class=self.school_class
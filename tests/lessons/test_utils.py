@@ -1,8 +1,11 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
 
 from django_school.apps.lessons.models import Attendance, LessonSession
-from django_school.apps.lessons.utils import create_lesson_session
-from tests.utils import ClassesMixin, LessonsMixin, UsersMixin
+from django_school.apps.lessons.utils import (create_lesson_session,
+                                              get_taught_classes_ids,
+                                              get_teaching_assignments)
+from tests.utils import SHARED_CACHES, ClassesMixin, LessonsMixin, UsersMixin
 
 
 class CreateLessonSessionTestCase(LessonsMixin, ClassesMixin, UsersMixin, TestCase):
@@ -25,3 +28,82 @@ class CreateLessonSessionTestCase(LessonsMixin, ClassesMixin, UsersMixin, TestCa
         students_with_attendances = [p.student for p in Attendance.objects.all()]
         self.assertEqual(LessonSession.objects.first().lesson, lesson)
         self.assertQuerysetEqual(students_with_attendances, students, ordered=False)
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class GetTeachingAssignmentsTestCase(
+    LessonsMixin, ClassesMixin, UsersMixin, TransactionTestCase
+):
+    def setUp(self):
+        cache.clear()
+        self.teacher = self.create_teacher()
+        self.school_class = self.create_class()
+        self.subject = self.create_subject()
+
+    def test_returns_pairs_of_class_and_subject_taught_by_teacher(self):
+        school_class2 = self.create_class(number="2b")
+        subject2 = self.create_subject(name="subject2")
+        teacher2 = self.create_teacher(username="teacher2")
+        self.create_lesson(self.subject, self.teacher, self.school_class)
+        self.create_lesson(self.subject, self.teacher, self.school_class, weekday="tue")
+        self.create_lesson(subject2, self.teacher, school_class2)
+        self.create_lesson(self.subject, teacher2, school_class2)
+
+        result = get_teaching_assignments(self.teacher)
+
+        self.assertEqual(
+            result,
+            {
+                (self.school_class.pk, self.subject.pk),
+                (school_class2.pk, subject2.pk),
+            },
+        )
+
+    def test_performs_no_queries_if_cached(self):
+        self.create_lesson(self.subject, self.teacher, self.school_class)
+        get_teaching_assignments(self.teacher)
+
+        with self.assertNumQueries(0):
+            get_teaching_assignments(self.teacher)
+
+    def test_cache_is_invalidated_when_lesson_is_created(self):
+        get_teaching_assignments(self.teacher)
+        self.create_lesson(self.subject, self.teacher, self.school_class)
+
+        result = get_teaching_assignments(self.teacher)
+
+        self.assertEqual(result, {(self.school_class.pk, self.subject.pk)})
+
+    def test_cache_is_invalidated_when_lesson_is_deleted(self):
+        lesson = self.create_lesson(self.subject, self.teacher, self.school_class)
+        get_teaching_assignments(self.teacher)
+        lesson.delete()
+
+        result = get_teaching_assignments(self.teacher)
+
+        self.assertEqual(result, set())
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_does_not_cache_assignments_in_memory_of_process(self):
+        # another worker wouldn't see the invalidation, and the assignments
+        # grant writing the grades and the attendance of the class
+        lesson = self.create_lesson(self.subject, self.teacher, self.school_class)
+        get_teaching_assignments(self.teacher)
+        lesson.teacher = self.create_teacher(username="teacher2")
+        lesson.save()
+
+        with self.assertNumQueries(1):
+            result = get_teaching_assignments(self.teacher)
+
+        self.assertEqual(result, set())
+
+    def test_get_taught_classes_ids(self):
+        subject2 = self.create_subject(name="subject2")
+        self.create_lesson(self.subject, self.teacher, self.school_class)
+        self.create_lesson(subject2, self.teacher, self.school_class, weekday="tue")
+
+        result = get_taught_classes_ids(self.teacher)
+
+        self.assertEqual(result, {self.school_class.pk})
@@ -1,9 +1,16 @@
 import datetime
+import json
+import os
+import tempfile
+import zipfile
+from io import BytesIO
 from os import path
 from shutil import rmtree
 
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from django_school.apps.events.models import Event, EventStatus
@@ -11,7 +18,7 @@ from django_school.apps.grades.models import GradeCategory
 from django_school.apps.lessons.forms import HomeworkRealisationForm
 from django_school.apps.lessons.models import (AttachedFile, Attendance,
                                                Homework, HomeworkRealisation,
-                                               Lesson)
+                                               HomeworkUpload, Lesson)
 from tests.utils import (AjaxRequiredTestMixin, ClassesMixin, LessonsMixin,
                          ResourceViewTestMixin, RolesRequiredTestMixin,
                          UsersMixin)
@@ -330,6 +337,28 @@ class LessonSessionDetailViewTestCase(
         updated_statuses = [attendance.status for attendance in attendances]
         self.assertEqual(updated_statuses, expected_statuses)
 
+    def test_number_of_queries_does_not_depend_on_number_of_students(self):
+        self.login(self.teacher)
+
+        def post_statuses(students_count, status):
+            students = [
+                self.create_student(f"{status}{i}", school_class=self.school_class)
+                for i in range(students_count)
+            ]
+            lesson_session = self.create_lesson_session(self.lesson)
+            attendances = self.create_attendance(lesson_session, students)
+            data = self.get_example_form_data(
+                lesson_session, attendances, "Topic", [status] * students_count
+            )
+
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(self.get_url(lesson_session.pk), data=data)
+
+            return len(queries)
+
+        self.assertEqual(post_statuses(2, "present"), post_statuses(10, "absent"))
+        self.assertEqual(Attendance.objects.filter(status="absent").count(), 10)
+
     @override_settings(MEDIA_ROOT=temp_dir_path)
     def test_updates_files(self):
         self.login(self.teacher)
@@ -345,10 +374,11 @@ class LessonSessionDetailViewTestCase(
 
         self.client.post(self.get_url(), data=data, files=files)
 
-        self.assertEqual(AttachedFile.objects.count(), 2)
-        self.assertTrue(
-            path.exists(path.join(self.temp_dir_path, "attached_files", "file1.txt"))
+        self.assertCountEqual(
+            AttachedFile.objects.values_list("filename", flat=True),
+            ["file1.txt", "file2.txt"],
         )
+        self.assertTrue(path.exists(AttachedFile.objects.first().file.path))
         rmtree(self.temp_dir_path)
 
     def test_redirects_to_lesson_sessions_detail_after_successful_update(self):
@@ -436,6 +466,193 @@ class LessonSessionDetailViewTestCase(
         self.assertNotEqual(self.lesson_session.topic, "New topic")
 
 
+class AttendanceBulkUpdateViewTestCase(
+    RolesRequiredTestMixin,
+    UsersMixin,
+    ClassesMixin,
+    LessonsMixin,
+    TestCase,
+):
+    path_name = "lessons:attendance_bulk_update"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = cls.create_teacher()
+        cls.school_class = cls.create_class()
+        cls.student1 = cls.create_student("student1", school_class=cls.school_class)
+        cls.student2 = cls.create_student("student2", school_class=cls.school_class)
+        cls.subject = cls.create_subject()
+        cls.lesson = cls.create_lesson(cls.subject, cls.teacher, cls.school_class)
+        cls.session1 = cls.create_lesson_session(cls.lesson)
+        cls.session2 = cls.create_lesson_session(cls.lesson)
+        for session in [cls.session1, cls.session2]:
+            cls.create_attendance(session, [cls.student1, cls.student2])
+
+    def get_url(self):
+        return reverse(self.path_name)
+
+    def get_permitted_user(self):
+        return self.teacher
+
+    def get_not_permitted_user(self):
+        return self.student1
+
+    @property
+    def _make_request(self):
+        return self.post
+
+    def post(self, url=None, entries=(), key="key"):
+        headers = {"HTTP_IDEMPOTENCY_KEY": key} if key else {}
+
+        return self.client.post(
+            url or self.get_url(),
+            json.dumps({"attendances": list(entries)}),
+            content_type="application/json",
+            **headers,
+        )
+
+    def get_statuses(self):
+        return {
+            (attendance.lesson_session_id, attendance.student_id): attendance.status
+            for attendance in Attendance.objects.all()
+        }
+
+    def test_updates_attendances_of_many_sessions(self):
+        self.login(self.teacher)
+
+        response = self.post(
+            entries=[
+                {
+                    "session": self.session1.pk,
+                    "student": self.student1.pk,
+                    "status": "absent",
+                },
+                {
+                    "session": self.session2.pk,
+                    "student": self.student2.pk,
+                    "status": "present",
+                },
+                {
+                    "session": self.session2.pk,
+                    "student": self.student1.pk,
+                    "status": "none",
+                },
+            ]
+        )
+
+        self.assertEqual(response.json(), {"updated": 2, "unchanged": 1})
+        self.assertEqual(
+            self.get_statuses(),
+            {
+                (self.session1.pk, self.student1.pk): "absent",
+                (self.session1.pk, self.student2.pk): "none",
+                (self.session2.pk, self.student1.pk): "none",
+                (self.session2.pk, self.student2.pk): "present",
+            },
+        )
+
+    def test_retried_request_returns_stored_response_without_changes(self):
+        self.login(self.teacher)
+        entries = [
+            {
+                "session": self.session1.pk,
+                "student": self.student1.pk,
+                "status": "absent",
+            }
+        ]
+        first_response = self.post(entries=entries)
+        Attendance.objects.filter(
+            lesson_session=self.session1, student=self.student1
+        ).update(status="excused")
+
+        response = self.post(entries=entries)
+
+        self.assertEqual(response.json(), first_response.json())
+        self.assertEqual(
+            Attendance.objects.get(
+                lesson_session=self.session1, student=self.student1
+            ).status,
+            "excused",
+        )
+
+    def test_returns_422_if_key_is_reused_for_different_request(self):
+        self.login(self.teacher)
+        entry = {"session": self.session1.pk, "student": self.student1.pk}
+        self.post(entries=[{**entry, "status": "absent"}])
+
+        response = self.post(entries=[{**entry, "status": "excused"}])
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(
+            Attendance.objects.get(
+                lesson_session=self.session1, student=self.student1
+            ).status,
+            "absent",
+        )
+
+    def test_number_of_queries_does_not_depend_on_number_of_entries(self):
+        self.login(self.teacher)
+
+        def post_statuses(sessions, status):
+            entries = [
+                {"session": session.pk, "student": student.pk, "status": status}
+                for session in sessions
+                for student in [self.student1, self.student2]
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                self.post(entries=entries, key=status)
+
+            return len(queries)
+
+        self.assertEqual(
+            post_statuses([self.session1], "absent"),
+            post_statuses([self.session1, self.session2], "present"),
+        )
+
+    def test_returns_400_without_idempotency_key(self):
+        self.login(self.teacher)
+
+        response = self.post(key=None)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_returns_400_if_entry_is_invalid(self):
+        self.login(self.teacher)
+
+        response = self.post(
+            entries=[{"session": self.session1.pk, "status": "absent"}]
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("errors", response.json())
+
+    def test_does_not_change_attendances_of_other_teachers_sessions(self):
+        teacher2 = self.create_teacher("teacher2")
+        self.login(teacher2)
+
+        response = self.post(
+            entries=[
+                {
+                    "session": self.session1.pk,
+                    "student": self.student1.pk,
+                    "status": "absent",
+                }
+            ]
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("absent", self.get_statuses().values())
+
+    def test_failed_request_can_be_retried_with_same_key(self):
+        self.login(self.teacher)
+        entry = {"session": self.session1.pk, "student": self.student1.pk}
+        self.post(entries=[{**entry, "status": "invalid"}])
+
+        response = self.post(entries=[{**entry, "status": "absent"}])
+
+        self.assertEqual(response.json(), {"updated": 1, "unchanged": 0})
+
+
 class ClassSubjectListViewTestCase(
     RolesRequiredTestMixin,
     ResourceViewTestMixin,
@@ -946,7 +1163,7 @@ class HomeworkDetailViewTestCase(
 
         response = self.client.get(self.get_url())
 
-        self.assertContains(response, file.file.url)
+        self.assertContains(response, file.download_url)
 
     def test_renders_students_realisations_if_user_is_teacher(self):
         self.login(self.teacher)
@@ -955,11 +1172,90 @@ class HomeworkDetailViewTestCase(
 
         response = self.client.get(self.get_url())
 
-        self.assertContains(response, file.file.url)
+        self.assertContains(response, file.download_url)
         self.assertContains(response, self.student.full_name)
         self.assertContains(response, "SUBMITTED")
 
 
+class HomeworkRealisationsDownloadViewTestCase(
+    RolesRequiredTestMixin,
+    ResourceViewTestMixin,
+    UsersMixin,
+    ClassesMixin,
+    LessonsMixin,
+    TestCase,
+):
+    path_name = "lessons:homework_realisations_download"
+    temp_dir_path = "temp_dir/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = cls.create_teacher()
+        cls.school_class = cls.create_class()
+        cls.student = cls.create_student(school_class=cls.school_class)
+        cls.subject = cls.create_subject()
+        cls.homework = cls.create_homework(cls.subject, cls.teacher, cls.school_class)
+
+    def get_url(self, homework_pk=None):
+        homework_pk = homework_pk or self.homework.pk
+
+        return reverse(self.path_name, args=[homework_pk])
+
+    def get_nonexistent_resource_url(self):
+        return self.get_url(homework_pk=12345)
+
+    def get_permitted_user(self):
+        return self.teacher
+
+    def get_not_permitted_user(self):
+        return self.student
+
+    def test_returns_404_if_homework_is_not_visible_to_user(self):
+        self.login(self.create_teacher(username="teacher2"))
+
+        response = self.client.get(self.get_url())
+
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(MEDIA_ROOT=temp_dir_path)
+    def test_streams_zip_of_realisations_files_organized_by_student(self):
+        self.login(self.teacher)
+        student = self.create_student(
+            username="student1",
+            school_class=self.school_class,
+            first_name="John",
+            last_name="Doe",
+        )
+        student2 = self.create_student(
+            username="student2",
+            school_class=self.school_class,
+            first_name="John",
+            last_name="Doe",
+        )
+        realisation = self.create_realisation(self.homework, student)
+        self.create_file(realisation, student, name="file1.txt")
+        self.create_file(realisation, student, name="file2.txt")
+        realisation2 = self.create_realisation(self.homework, student2)
+        self.create_file(realisation2, student2, name="file1.txt")
+
+        response = self.client.get(self.get_url())
+        content = b"".join(response.streaming_content)
+        rmtree(self.temp_dir_path)
+
+        self.assertEqual(response["Content-Type"], "application/zip")
+        archive = zipfile.ZipFile(BytesIO(content))
+        self.assertIsNone(archive.testzip())
+        self.assertCountEqual(
+            archive.namelist(),
+            [
+                "John Doe/file1.txt",
+                "John Doe/file2.txt",
+                "John Doe (student2)/file1.txt",
+            ],
+        )
+        self.assertEqual(archive.read("John Doe (student2)/file1.txt"), b"file_content")
+
+
 class SubmitHomeworkRealisationViewTestCase(
     RolesRequiredTestMixin,
     ResourceViewTestMixin,
@@ -1039,3 +1335,210 @@ class SubmitHomeworkRealisationViewTestCase(
         self.assertContains(
             response, "Your realisation has been submitted successfully"
         )
+
+
+@override_settings(MEDIA_ROOT="temp_dir/", HOMEWORK_UPLOAD_PART_SIZE=4)
+class HomeworkUploadViewsTestCase(
+    RolesRequiredTestMixin,
+    UsersMixin,
+    ClassesMixin,
+    LessonsMixin,
+    TestCase,
+):
+    parts = [b"0123", b"4567", b"89"]
+    content = b"".join(parts)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = cls.create_teacher()
+        cls.school_class = cls.create_class()
+        cls.student = cls.create_student(school_class=cls.school_class)
+        cls.subject = cls.create_subject()
+        cls.homework = cls.create_homework(cls.subject, cls.teacher, cls.school_class)
+
+    def setUp(self):
+        upload_dir = tempfile.mkdtemp()
+        self.addCleanup(rmtree, upload_dir)
+        settings_override = override_settings(HOMEWORK_UPLOAD_DIR=upload_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def get_url(self):
+        return reverse("lessons:homework_upload_create", args=[self.homework.pk])
+
+    def get_permitted_user(self):
+        return self.student
+
+    def get_not_permitted_user(self):
+        return self.teacher
+
+    @property
+    def _make_request(self):
+        return self.start_upload
+
+    def start_upload(self, url=None, filename="scan.pdf", size=len(content)):
+        return self.client.post(
+            url or self.get_url(),
+            json.dumps({"filename": filename, "size": size}),
+            content_type="application/json",
+        )
+
+    def send_part(self, upload, index):
+        return self.client.put(
+            reverse("lessons:homework_upload_part", args=[upload["id"], index]),
+            self.parts[index],
+            content_type="application/octet-stream",
+        )
+
+    def complete(self, upload):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                reverse("lessons:homework_upload_complete", args=[upload["id"]])
+            )
+
+    def test_starts_upload_of_file_in_parts(self):
+        self.login(self.student)
+
+        response = self.start_upload()
+
+        self.assertEqual(response.status_code, 201)
+        upload = response.json()
+        self.assertEqual(upload["parts"], 3)
+        self.assertEqual(upload["missing_parts"], [0, 1, 2])
+        self.assertEqual(HomeworkUpload.objects.get().filename, "scan.pdf")
+
+    def test_returns_400_if_file_is_too_large(self):
+        self.login(self.student)
+
+        with override_settings(HOMEWORK_UPLOAD_MAX_SIZE=5):
+            response = self.start_upload()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(HomeworkUpload.objects.exists())
+
+    @override_settings(HOMEWORK_UPLOAD_MAX_OPEN=2)
+    def test_returns_400_if_student_has_too_many_unfinished_uploads(self):
+        self.login(self.student)
+        self.start_upload()
+        self.start_upload()
+
+        response = self.start_upload()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(HomeworkUpload.objects.count(), 2)
+
+    def test_returns_403_if_student_already_has_submitted_realisation(self):
+        self.create_realisation(self.homework, self.student)
+        self.login(self.student)
+
+        response = self.start_upload()
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_resumes_upload_with_parts_received_in_any_order(self):
+        self.login(self.student)
+        upload = self.start_upload().json()
+
+        self.send_part(upload, 2)
+        self.send_part(upload, 0)
+        response = self.client.get(upload["url"])
+
+        self.assertEqual(response.json()["missing_parts"], [1])
+
+    def test_returns_400_if_part_has_wrong_size(self):
+        self.login(self.student)
+        upload = self.start_upload().json()
+
+        response = self.client.put(
+            reverse("lessons:homework_upload_part", args=[upload["id"], 2]),
+            b"1234",
+            content_type="application/octet-stream",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(HomeworkUpload.objects.get().received_parts, [])
+
+    def test_keeps_received_part_if_it_is_resent_too_short(self):
+        self.login(self.student)
+        upload = self.start_upload().json()
+        for index in range(3):
+            self.send_part(upload, index)
+
+        response = self.client.put(
+            reverse("lessons:homework_upload_part", args=[upload["id"], 0]),
+            b"ab",
+            content_type="application/octet-stream",
+        )
+        self.complete(upload)
+
+        self.assertEqual(response.status_code, 400)
+        attached_file = HomeworkRealisation.objects.get().attached_files.get()
+        with attached_file.file.open("rb") as file:
+            self.assertEqual(file.read(), self.content)
+        rmtree("temp_dir/")
+
+    def test_returns_400_if_parts_are_missing_on_completion(self):
+        self.login(self.student)
+        upload = self.start_upload().json()
+        self.send_part(upload, 0)
+
+        response = self.complete(upload)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(HomeworkRealisation.objects.exists())
+
+    def test_attaches_assembled_file_to_new_realisation(self):
+        self.login(self.student)
+        upload = self.start_upload().json()
+        path_ = HomeworkUpload.objects.get().path
+        for index in range(3):
+            self.send_part(upload, index)
+
+        response = self.complete(upload)
+
+        self.assertEqual(response.status_code, 200)
+        realisation = HomeworkRealisation.objects.get(student=self.student)
+        attached_file = realisation.attached_files.get()
+        with attached_file.file.open("rb") as file:
+            self.assertEqual(file.read(), self.content)
+        rmtree("temp_dir/")
+        self.assertEqual(response.json()["file"], attached_file.download_url)
+        self.assertEqual(attached_file.filename, "scan.pdf")
+        self.assertFalse(HomeworkUpload.objects.exists())
+        self.assertFalse(os.path.exists(path_))
+
+    def test_returns_400_if_realisation_is_submitted_during_upload(self):
+        self.login(self.student)
+        upload = self.start_upload().json()
+        for index in range(3):
+            self.send_part(upload, index)
+        self.create_realisation(self.homework, self.student)
+
+        response = self.complete(upload)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(AttachedFile.objects.exists())
+        self.assertTrue(HomeworkUpload.objects.exists())
+        rmtree("temp_dir/")
+
+    def test_returns_404_if_upload_is_completed_again(self):
+        self.login(self.student)
+        upload = self.start_upload().json()
+        for index in range(3):
+            self.send_part(upload, index)
+        self.complete(upload)
+
+        response = self.complete(upload)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(AttachedFile.objects.count(), 1)
+        rmtree("temp_dir/")
+
+    def test_returns_404_if_upload_belongs_to_other_student(self):
+        self.login(self.student)
+        upload = self.start_upload().json()
+        self.login(self.create_student("student2", school_class=self.school_class))
+
+        response = self.client.get(upload["url"])
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,149 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from django_school.apps.monitoring.benchmarks import (compare_with_baseline,
+                                                      percentile)
+
+
+class PercentileTestCase(TestCase):
+    def test_returns_nearest_rank_percentile(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+
+    def test_works_with_single_value(self):
+        self.assertEqual(percentile([3], 95), 3)
+
+
+class CompareWithBaselineTestCase(TestCase):
+    BASELINE = {
+        "view": {"p50_ms": 10, "p95_ms": 20, "queries": 5, "peak_memory_kb": 100}
+    }
+
+    def compare(self, threshold=0.2, **metrics):
+        result = {**self.BASELINE["view"], **metrics}
+
+        return compare_with_baseline({"view": result}, self.BASELINE, threshold)
+
+    def test_returns_empty_list_if_within_threshold(self):
+        self.assertEqual(self.compare(p50_ms=11.9, peak_memory_kb=120), [])
+
+    def test_returns_regressions_exceeding_threshold(self):
+        regressions = self.compare(p95_ms=25, peak_memory_kb=121)
+
+        self.assertEqual(
+            regressions,
+            [
+                "view: p95_ms increased from 20 to 25",
+                "view: peak_memory_kb increased from 100 to 121",
+            ],
+        )
+
+    def test_any_increase_of_queries_is_regression(self):
+        regressions = self.compare(queries=6)
+
+        self.assertEqual(regressions, ["view: queries increased from 5 to 6"])
+
+    def test_ignores_benchmarks_not_present_in_baseline(self):
+        regressions = compare_with_baseline(
+            {"new_view": self.BASELINE["view"]}, {}, 0.2
+        )
+
+        self.assertEqual(regressions, [])
+
+
+class BenchmarkCommandTestCase(TestCase):
+    options = {
+        "classes": 1,
+        "students_per_class": 2,
+        "weeks": 2,
+        "iterations": 1,
+        "warmup": 0,
+    }
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.baseline = Path(directory.name) / "baseline.json"
+
+    def benchmark(self, **kwargs):
+        out = StringIO()
+        call_command(
+            "benchmark", baseline=self.baseline, stdout=out, **self.options, **kwargs
+        )
+
+        return out.getvalue()
+
+    def test_saves_results_of_hot_views(self):
+        self.benchmark(save=True)
+
+        data = json.loads(self.baseline.read_text())
+        self.assertEqual(data["dataset"]["students"], 2)
+        self.assertCountEqual(
+            data["results"].keys(),
+            [
+                "class_grades",
+                "student_grades",
+                "lesson_session_list",
+                "lesson_session_detail",
+                "class_attendance",
+                "events_calendar",
+                "received_messages",
+                "homework_list",
+            ],
+        )
+        self.assertGreater(data["results"]["class_grades"]["queries"], 0)
+
+    def test_counts_dataset_of_benchmarked_school_only(self):
+        call_command(
+            "generate_school",
+            prefix="other",
+            classes=1,
+            students_per_class=5,
+            stdout=StringIO(),
+        )
+
+        self.benchmark(save=True, only=["homework_list"])
+
+        data = json.loads(self.baseline.read_text())
+        self.assertEqual(data["dataset"]["classes"], 1)
+        self.assertEqual(data["dataset"]["students"], 2)
+
+    def test_refuses_to_run_against_database_other_than_test_one(self):
+        with mock.patch.dict(connection.settings_dict, {"NAME": "school"}):
+            with self.assertRaisesMessage(CommandError, '"school" database'):
+                self.benchmark()
+
+    def test_runs_against_any_database_if_allowed(self):
+        with mock.patch.dict(connection.settings_dict, {"NAME": "school"}):
+            out = self.benchmark(only=["homework_list"], allow_any_database=True)
+
+        self.assertIn("homework_list:", out)
+
+    def test_does_not_fail_without_baseline(self):
+        out = self.benchmark(only=["homework_list"])
+
+        self.assertIn("There is no baseline", out)
+
+    def test_fails_if_results_regressed(self):
+        self.benchmark(save=True, only=["homework_list"])
+        data = json.loads(self.baseline.read_text())
+        data["results"]["homework_list"]["queries"] = 0
+        self.baseline.write_text(json.dumps(data))
+
+        with self.assertRaisesMessage(CommandError, "homework_list: queries"):
+            self.benchmark(only=["homework_list"])
+
+    def test_fails_if_baseline_was_recorded_against_different_dataset(self):
+        self.baseline.write_text(json.dumps({"dataset": {}, "results": {}}))
+
+        with self.assertRaisesMessage(CommandError, "different dataset"):
+            self.benchmark()
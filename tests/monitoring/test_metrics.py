@@ -0,0 +1,154 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from django_school.apps.monitoring import metrics
+from django_school.apps.monitoring.metrics import (Histogram, RequestMetrics,
+                                                   current_request_metrics,
+                                                   span)
+from tests.utils import UsersMixin
+
+
+class HistogramTestCase(SimpleTestCase):
+    def setUp(self):
+        self.histogram = Histogram("test_seconds", "Test.", "view", buckets=(1, 5))
+        self.addCleanup(metrics.REGISTRY.remove, self.histogram)
+
+    def test_renders_cumulative_buckets(self):
+        self.histogram.observe("a", 0.5)
+        self.histogram.observe("a", 1)
+        self.histogram.observe("a", 3)
+        self.histogram.observe("a", 10)
+
+        self.assertEqual(
+            self.histogram.render().splitlines(),
+            [
+                "# HELP test_seconds Test.",
+                "# TYPE test_seconds histogram",
+                'test_seconds_bucket{view="a",le="1"} 2',
+                'test_seconds_bucket{view="a",le="5"} 3',
+                'test_seconds_bucket{view="a",le="+Inf"} 4',
+                'test_seconds_sum{view="a"} 14.5',
+                'test_seconds_count{view="a"} 4',
+            ],
+        )
+
+    def test_keeps_separate_series_for_label_values(self):
+        self.histogram.observe("a", 1)
+        self.histogram.observe("b", 2)
+        self.histogram.observe("b", 2)
+
+        self.assertEqual(self.histogram.get_count("a"), 1)
+        self.assertEqual(self.histogram.get_count("b"), 2)
+        self.assertEqual(self.histogram.get_sum("b"), 4)
+
+    def test_escapes_label_values(self):
+        self.histogram.observe('a"b', 1)
+
+        self.assertIn('view="a\\"b"', self.histogram.render())
+
+
+class SpanTestCase(SimpleTestCase):
+    def setUp(self):
+        metrics.span_duration.clear()
+
+    def test_records_duration_as_decorator(self):
+        @span("test.function")
+        def function():
+            return 1
+
+        self.assertEqual(function(), 1)
+        self.assertEqual(function(), 1)
+
+        self.assertEqual(metrics.span_duration.get_count("test.function"), 2)
+
+    def test_counts_nested_spans_of_same_name_once(self):
+        request_metrics = RequestMetrics()
+        token = current_request_metrics.set(request_metrics)
+        self.addCleanup(current_request_metrics.reset, token)
+
+        with span("test.outer"):
+            with span("test.outer"):
+                pass
+            with span("test.inner"):
+                pass
+
+        self.assertEqual(metrics.span_duration.get_count("test.outer"), 1)
+        self.assertEqual(metrics.span_duration.get_count("test.inner"), 1)
+        self.assertCountEqual(
+            request_metrics.spans.keys(), ["test.outer", "test.inner"]
+        )
+
+
+class MetricsMiddlewareTestCase(UsersMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = cls.create_student()
+
+    def setUp(self):
+        for histogram in metrics.REGISTRY:
+            histogram.clear()
+
+    def test_records_metrics_per_view_name(self):
+        self.login(self.student)
+
+        self.client.get(reverse("events:calendar"))
+
+        view = "events:calendar"
+        self.assertEqual(metrics.request_duration.get_count(view), 1)
+        self.assertEqual(metrics.request_sql_queries.get_count(view), 1)
+        self.assertGreater(metrics.request_sql_queries.get_sum(view), 0)
+        self.assertGreater(metrics.request_sql_duration.get_sum(view), 0)
+        self.assertGreater(metrics.request_template_duration.get_sum(view), 0)
+        self.assertGreater(metrics.response_size.get_sum(view), 0)
+
+    def test_records_spans_of_context_processors_and_calendar(self):
+        self.login(self.student)
+
+        self.client.get(reverse("events:calendar"))
+
+        self.assertEqual(
+            metrics.span_duration.get_count("context_processors.unseen_events_count"),
+            1,
+        )
+        self.assertGreater(
+            metrics.span_duration.get_count("events.calendar.formatday"), 27
+        )
+
+    def test_groups_unresolved_requests(self):
+        self.client.get("/does-not-exist/")
+
+        self.assertEqual(metrics.request_duration.get_count("<unresolved>"), 1)
+
+
+@override_settings(METRICS_TOKEN="secret")
+class MetricsViewTestCase(TestCase):
+    def get_metrics(self, authorization=None):
+        headers = {"HTTP_AUTHORIZATION": authorization} if authorization else {}
+
+        return self.client.get(reverse("monitoring:metrics"), **headers)
+
+    def test_renders_metrics(self):
+        self.client.get(reverse("index"))
+
+        response = self.get_metrics("Bearer secret")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8"
+        )
+        self.assertContains(
+            response, 'django_request_duration_seconds_count{view="index"}'
+        )
+
+    def test_returns_403_if_token_is_missing_or_wrong(self):
+        for authorization in [None, "Bearer wrong", "Basic secret"]:
+            with self.subTest(authorization=authorization):
+                response = self.get_metrics(authorization)
+
+                self.assertEqual(response.status_code, 403)
+
+    @override_settings(METRICS_TOKEN=None)
+    def test_returns_403_if_token_is_not_configured(self):
+        response = self.get_metrics("Bearer ")
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import ResolverMatch
+
+from django_school.apps.monitoring.middleware import QueryBudgetMiddleware
+from django_school.apps.monitoring.utils import (QueryBudgetExceeded,
+                                                 query_budget)
+
+User = get_user_model()
+
+
+@override_settings(QUERY_BUDGET_RAISE=True, QUERY_BUDGET_MAX_DUPLICATES=2)
+class QueryBudgetMiddlewareTestCase(TestCase):
+    def get_response(self, view, queries_count):
+        def get_response(request):
+            for _ in range(queries_count):
+                User.objects.exists()
+
+            return view(request)
+
+        request = RequestFactory().get("/test")
+        request.resolver_match = ResolverMatch(view, (), {}, url_name="test")
+        middleware = QueryBudgetMiddleware(get_response)
+        middleware.process_view(request, view, (), {})
+
+        return middleware(request)
+
+    def test_does_not_raise_if_view_is_within_budget(self):
+        @query_budget(2)
+        def view(request):
+            return HttpResponse()
+
+        response = self.get_response(view, 2)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_raises_if_view_exceeds_budget(self):
+        @query_budget(2, max_duplicates=10)
+        def view(request):
+            return HttpResponse()
+
+        with self.assertRaises(QueryBudgetExceeded):
+            self.get_response(view, 3)
+
+    def test_raises_if_view_repeats_query(self):
+        @query_budget(10)
+        def view(request):
+            return HttpResponse()
+
+        with self.assertRaises(QueryBudgetExceeded):
+            self.get_response(view, 3)
+
+    def test_does_not_check_views_without_budget(self):
+        def view(request):
+            return HttpResponse()
+
+        response = self.get_response(view, 10)
+
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,106 @@
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_school.apps.monitoring.models import ProfileReport
+from django_school.apps.monitoring.profiler import explain
+from tests.utils import UsersMixin
+
+
+class ProfilerMiddlewareTestCase(UsersMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = cls.create_superuser(is_staff=True)
+        cls.student = cls.create_student()
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.reports_dir = Path(directory.name)
+
+        settings_override = override_settings(PROFILER_REPORTS_DIR=self.reports_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_profiles_request_of_staff_member(self):
+        self.login(self.staff)
+
+        response = self.client.get(f"{reverse('users:password_change')}?profile")
+
+        report = ProfileReport.objects.get()
+        self.assertEqual(
+            response["X-Profile-Report"],
+            reverse("admin:monitoring_profilereport_change", args=[report.pk]),
+        )
+        self.assertEqual(report.user, self.staff)
+        self.assertEqual(report.view_name, "users:password_change")
+        self.assertEqual(report.status_code, 200)
+        self.assertGreater(report.queries_count, 0)
+        self.assertTrue((self.reports_dir / report.file_name).exists())
+
+    def test_report_contains_profile_and_explained_queries(self):
+        self.login(self.staff)
+
+        self.client.get(f"{reverse('users:password_change')}?profile")
+
+        text = ProfileReport.objects.get().read()
+        self.assertIn("=== Profile ===", text)
+        self.assertIn("function calls", text)
+        self.assertIn("=== Slowest queries ===", text)
+        self.assertIn("Scan", text)
+
+    def test_profiles_request_with_header(self):
+        self.login(self.staff)
+
+        response = self.client.get(reverse("users:password_change"), HTTP_X_PROFILE="1")
+
+        self.assertIn("X-Profile-Report", response)
+
+    def test_does_not_profile_request_of_not_staff_user(self):
+        self.login(self.student)
+
+        response = self.client.get(f"{reverse('users:password_change')}?profile")
+
+        self.assertNotIn("X-Profile-Report", response)
+        self.assertFalse(ProfileReport.objects.exists())
+
+    def test_does_not_profile_request_without_flag(self):
+        self.login(self.staff)
+
+        self.client.get(reverse("users:password_change"))
+
+        self.assertFalse(ProfileReport.objects.exists())
+
+    @override_settings(PROFILER_MAX_REPORTS=2)
+    def test_keeps_only_last_reports(self):
+        self.login(self.staff)
+
+        for _ in range(3):
+            self.client.get(f"{reverse('users:password_change')}?profile")
+
+        self.assertEqual(ProfileReport.objects.count(), 2)
+        self.assertCountEqual(
+            [path.name for path in self.reports_dir.iterdir()],
+            ProfileReport.objects.values_list("file_name", flat=True),
+        )
+
+    def test_report_is_displayed_in_admin(self):
+        self.login(self.staff)
+        self.client.get(f"{reverse('users:password_change')}?profile")
+        report = ProfileReport.objects.get()
+
+        response = self.client.get(
+            reverse("admin:monitoring_profilereport_change", args=[report.pk])
+        )
+
+        self.assertContains(response, "=== Profile ===")
+
+
+class ExplainTestCase(TestCase):
+    def test_returns_error_if_query_can_not_be_explained(self):
+        result = explain("SELECT * FROM does_not_exist", [])
+
+        self.assertTrue(result.startswith("EXPLAIN failed"))
+        self.assertFalse(ProfileReport.objects.exists())
@@ -0,0 +1,113 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_school.apps.monitoring.models import SlowQuery
+from django_school.apps.monitoring.slow_queries import (CapturedQuery,
+                                                        get_fingerprint,
+                                                        record_slow_queries)
+from django_school.apps.monitoring.utils import normalize_sql
+from tests.utils import UsersMixin
+
+SQL = "SELECT id FROM users_user WHERE id = %s"
+
+
+def capture(sql=SQL, duration=0.5, params=(1,)):
+    return CapturedQuery(sql, params, False, duration, "apps/views.py:1")
+
+
+class RecordSlowQueriesTestCase(TestCase):
+    def test_creates_aggregate_with_explain_on_first_occurrence(self):
+        record_slow_queries([capture()], "users:detail")
+
+        query = SlowQuery.objects.get()
+        self.assertEqual(query.fingerprint, get_fingerprint(normalize_sql(SQL)))
+        self.assertEqual(query.view_name, "users:detail")
+        self.assertEqual(query.location, "apps/views.py:1")
+        self.assertEqual(query.calls, 1)
+        self.assertNotEqual(query.explain, "")
+
+    def test_aggregates_queries_of_same_shape(self):
+        record_slow_queries([capture(duration=0.5, params=(1,))])
+        record_slow_queries([capture(duration=1.5, params=(2,))])
+
+        query = SlowQuery.objects.get()
+        self.assertEqual(query.calls, 2)
+        self.assertEqual(query.total_duration, 2)
+        self.assertEqual(query.max_duration, 1.5)
+
+    def test_does_not_explain_not_select_queries(self):
+        record_slow_queries([capture("UPDATE users_user SET slug = %s", params=("a",))])
+
+        self.assertEqual(SlowQuery.objects.get().explain, "")
+
+    @override_settings(SLOW_QUERY_LOG_MAX_SHAPES=2)
+    def test_keeps_only_most_expensive_shapes(self):
+        record_slow_queries(
+            [
+                capture("SELECT 1", duration=3, params=()),
+                capture("SELECT 1, 2", duration=1, params=()),
+                capture("SELECT 1, 2, 3", duration=2, params=()),
+            ]
+        )
+
+        self.assertCountEqual(
+            SlowQuery.objects.values_list("total_duration", flat=True), [3, 2]
+        )
+
+
+class SlowQueryLogMiddlewareTestCase(UsersMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = cls.create_student()
+
+    @override_settings(SLOW_QUERY_LOG_THRESHOLD=0)
+    def test_records_queries_slower_than_threshold_with_origin(self):
+        self.login(self.student)
+
+        self.client.get(reverse("messages:received"))
+
+        query = SlowQuery.objects.filter(view_name="messages:received").first()
+        self.assertIsNotNone(query)
+        self.assertTrue(query.location.startswith("django_school/apps/"))
+
+    @override_settings(SLOW_QUERY_LOG_THRESHOLD=None)
+    def test_does_nothing_if_disabled(self):
+        self.login(self.student)
+
+        self.client.get(reverse("messages:received"))
+
+        self.assertFalse(SlowQuery.objects.exists())
+
+
+class SlowQueriesCommandTestCase(TestCase):
+    def call_command(self, **kwargs):
+        out = StringIO()
+        call_command("slow_queries", stdout=out, **kwargs)
+
+        return out.getvalue()
+
+    def test_lists_queries_ranked_by_total_time(self):
+        record_slow_queries(
+            [capture("SELECT 1", duration=1, params=()), capture(duration=2)]
+        )
+
+        output = self.call_command()
+
+        self.assertLess(output.index("users_user"), output.index("SELECT ?"))
+
+    def test_prints_plans(self):
+        record_slow_queries([capture()])
+
+        output = self.call_command(explain=True)
+
+        self.assertIn(SlowQuery.objects.get().explain.splitlines()[0], output)
+
+    def test_clears_queries(self):
+        record_slow_queries([capture()])
+
+        self.call_command(clear=True)
+
+        self.assertFalse(SlowQuery.objects.exists())
@@ -0,0 +1,134 @@
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.views import View
+
+from django_school.apps.monitoring.utils import (QueryBudget,
+                                                 QueryBudgetExceeded,
+                                                 QueryCounter,
+                                                 get_query_budget,
+                                                 normalize_sql, query_budget)
+
+
+def execute(sql, params, many, context):
+    return None
+
+
+class NormalizeSqlTestCase(SimpleTestCase):
+    def test_replaces_literals(self):
+        result = normalize_sql("SELECT * FROM t WHERE a = 'text' AND b = 12.5")
+
+        self.assertEqual(result, "SELECT * FROM t WHERE a = ? AND b = ?")
+
+    def test_collapses_lists_of_parameters(self):
+        result1 = normalize_sql("SELECT * FROM t WHERE id IN (%s, %s, %s)")
+        result2 = normalize_sql("SELECT * FROM t WHERE id IN (%s)")
+
+        self.assertEqual(result1, "SELECT * FROM t WHERE id IN (...)")
+        self.assertEqual(result1, result2)
+
+    def test_does_not_change_identifiers_with_digits(self):
+        result = normalize_sql('SELECT "t1"."id" FROM "t1"')
+
+        self.assertEqual(result, 'SELECT "t1"."id" FROM "t1"')
+
+
+class QueryCounterTestCase(SimpleTestCase):
+    def test_counts_queries_and_shapes(self):
+        counter = QueryCounter()
+
+        for sql in ["SELECT 1", "SELECT 2", "SELECT a FROM t"]:
+            counter(execute, sql, None, False, {})
+
+        self.assertEqual(counter.count, 3)
+        self.assertEqual(counter.most_repeated_shape(), ("SELECT ?", 2))
+
+    def test_most_repeated_shape_if_no_queries(self):
+        self.assertEqual(QueryCounter().most_repeated_shape(), (None, 0))
+
+
+@override_settings(QUERY_BUDGET_RAISE=True, QUERY_BUDGET_MAX_DUPLICATES=2)
+class QueryBudgetTestCase(SimpleTestCase):
+    @staticmethod
+    def get_counter(*queries):
+        counter = QueryCounter()
+        for sql in queries:
+            counter(execute, sql, None, False, {})
+
+        return counter
+
+    def test_does_not_raise_if_within_budget(self):
+        counter = self.get_counter("SELECT 1", "SELECT 2", "SELECT a FROM t")
+
+        QueryBudget(3).check(counter, "view")
+
+    def test_raises_if_too_many_queries(self):
+        counter = self.get_counter("SELECT a FROM t", "SELECT b FROM t")
+
+        with self.assertRaisesMessage(QueryBudgetExceeded, "2 queries executed"):
+            QueryBudget(1).check(counter, "view")
+
+    def test_raises_if_query_shape_is_repeated_too_many_times(self):
+        counter = self.get_counter("SELECT 1", "SELECT 2", "SELECT 3")
+
+        with self.assertRaisesMessage(QueryBudgetExceeded, "repeated 3 times"):
+            QueryBudget(10).check(counter, "view")
+
+    def test_uses_max_duplicates_of_budget_if_given(self):
+        counter = self.get_counter("SELECT 1", "SELECT 2", "SELECT 3")
+
+        QueryBudget(10, max_duplicates=3).check(counter, "view")
+
+    @override_settings(QUERY_BUDGET_RAISE=False)
+    def test_logs_warning_if_raising_is_disabled(self):
+        counter = self.get_counter("SELECT a FROM t", "SELECT b FROM t")
+
+        with self.assertLogs("django_school.apps.monitoring", "WARNING"):
+            QueryBudget(1).check(counter, "view")
+
+
+class QueryBudgetDecoratorTestCase(SimpleTestCase):
+    def test_sets_budget_of_function_view(self):
+        @query_budget(5, max_duplicates=2)
+        def view(request):
+            return HttpResponse()
+
+        budget = get_query_budget(view)
+
+        self.assertEqual(budget.max_queries, 5)
+        self.assertEqual(budget.max_duplicates, 2)
+
+    def test_sets_budget_of_class_based_view(self):
+        @query_budget(5)
+        class DummyView(View):
+            pass
+
+        budget = get_query_budget(DummyView.as_view())
+
+        self.assertEqual(budget.max_queries, 5)
+
+    def test_returns_none_if_view_has_no_budget(self):
+        def view(request):
+            return HttpResponse()
+
+        self.assertIsNone(get_query_budget(view))
+
+
+def get_url_patterns(resolver):
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            yield from get_url_patterns(pattern)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+class ViewsQueryBudgetsTestCase(SimpleTestCase):
+    def test_every_view_of_apps_has_query_budget(self):
+        for pattern in get_url_patterns(get_resolver()):
+            view = pattern.callback
+            view_class = getattr(view, "view_class", None)
+            module = (view_class or view).__module__
+
+            if module.startswith("django_school.apps.") and module.endswith(".views"):
+                with self.subTest(pattern=pattern.name):
+                    self.assertIsNotNone(get_query_budget(view))
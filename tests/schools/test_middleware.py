@@ -0,0 +1,105 @@
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from django_school.apps.classes.models import Class
+from django_school.apps.schools.middleware import SchoolMiddleware
+from django_school.apps.schools.models import School, current_school
+from tests.utils import (ClassesMixin, GradesMixin, LessonsMixin,
+                         MessagesMixin, SchoolsMixin, UsersMixin)
+
+
+@override_settings(ALLOWED_HOSTS=["*"])
+class SchoolMiddlewareTestCase(
+    SchoolsMixin,
+    UsersMixin,
+    ClassesMixin,
+    LessonsMixin,
+    GradesMixin,
+    MessagesMixin,
+    TestCase,
+):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school1 = cls.create_school("School 1", "school1.example.com")
+        cls.school2 = cls.create_school("School 2", "school2.example.com")
+        cls.class1 = cls.create_class("1a", school=cls.school1)
+        cls.class2 = cls.create_class("1a", school=cls.school2)
+
+    def get_response(self, host):
+        def view(request):
+            school_ids = [c.school_id for c in Class.objects.all()]
+            return HttpResponse(",".join(map(str, school_ids)))
+
+        request = RequestFactory().get("/", HTTP_HOST=host)
+        response = SchoolMiddleware(view)(request)
+
+        return request, response
+
+    def test_resolves_school_from_host(self):
+        request, response = self.get_response("school1.example.com:8000")
+
+        self.assertEqual(request.school, self.school1)
+        self.assertEqual(response.content.decode(), str(self.school1.pk))
+
+    @override_settings(SCHOOL_REQUIRED=False)
+    def test_does_not_limit_objects_if_host_has_no_school(self):
+        request, response = self.get_response("unknown.example.com")
+
+        self.assertIsNone(request.school)
+        self.assertEqual(len(response.content.decode().split(",")), 2)
+
+    def test_raises_404_if_host_has_no_school(self):
+        with self.assertRaises(Http404):
+            self.get_response("unknown.example.com")
+
+    def test_does_not_raise_404_if_there_are_no_schools(self):
+        Class.objects.all().delete()
+        School.objects.all().delete()
+
+        request, _ = self.get_response("unknown.example.com")
+
+        self.assertIsNone(request.school)
+
+    def test_resets_current_school_after_request(self):
+        self.get_response("school1.example.com")
+
+        self.assertIsNone(current_school.get())
+
+    def test_user_of_other_school_is_not_authenticated(self):
+        teacher = self.create_teacher(school=self.school2)
+        self.client.force_login(teacher)
+
+        response = self.client.get(
+            reverse("classes:list"), HTTP_HOST="school1.example.com"
+        )
+
+        self.assertRedirects(
+            response,
+            f"{reverse('users:login')}?next={reverse('classes:list')}",
+            fetch_redirect_response=False,
+        )
+
+    def test_rows_of_other_school_are_not_shown(self):
+        # the rows which aren't scoped are only reached through the user
+        # authenticated at the host of their school or the scoped objects
+        teacher1 = self.create_teacher(school=self.school1)
+        teacher2 = self.create_teacher(username="teacher2", school=self.school2)
+        student2 = self.create_student(
+            username="student2", school_class=self.class2, school=self.school2
+        )
+        subject2 = self.create_subject(school=self.school2)
+        category2 = self.create_grade_category(subject2, self.class2)
+        grade2 = self.create_grade(category2, subject2, student2, teacher2)
+        message2 = self.create_message(teacher2, [student2])
+        self.client.force_login(teacher1)
+
+        for url in [
+            reverse("grades:student_grades", args=[student2.slug]),
+            reverse("grades:update", args=[grade2.pk]),
+            reverse("messages:detail", args=[message2.pk]),
+        ]:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_HOST="school1.example.com")
+
+                self.assertEqual(response.status_code, 404)
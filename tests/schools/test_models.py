@@ -0,0 +1,86 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError
+from django.test import TestCase
+
+from django_school.apps.classes.models import Class
+from django_school.apps.events.models import EventStatus
+from django_school.apps.schools.models import current_school
+from tests.utils import ClassesMixin, EventsMixin, SchoolsMixin, UsersMixin
+
+User = get_user_model()
+
+
+class SchoolScopedModelTestCase(SchoolsMixin, ClassesMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school1 = cls.create_school("School 1", "school1.example.com")
+        cls.school2 = cls.create_school("School 2", "school2.example.com")
+
+    def set_current_school(self, school):
+        token = current_school.set(school)
+        self.addCleanup(current_school.reset, token)
+
+    def test_objects_are_limited_to_current_school(self):
+        class1 = self.create_class("1a", school=self.school1)
+        self.create_class("1a", school=self.school2)
+
+        self.set_current_school(self.school1)
+
+        self.assertQuerysetEqual(Class.objects.all(), [class1])
+
+    def test_objects_are_not_limited_without_current_school(self):
+        self.create_class("1a", school=self.school1)
+        self.create_class("1a", school=self.school2)
+
+        self.assertEqual(Class.objects.count(), 2)
+
+    def test_assigns_current_school_when_saved(self):
+        self.set_current_school(self.school1)
+
+        school_class = self.create_class()
+
+        self.assertEqual(school_class.school, self.school1)
+
+    def test_field_is_unique_within_school(self):
+        self.create_class("1a", school=self.school1)
+
+        with self.assertRaises(IntegrityError):
+            self.create_class("1a", school=self.school1)
+
+    def test_field_is_unique_among_objects_without_school(self):
+        self.create_class("1a")
+
+        with self.assertRaises(IntegrityError):
+            self.create_class("1a")
+
+    def test_validate_unique_checks_objects_without_school(self):
+        self.create_class("1a")
+        school_class = Class(number="1a", slug="1a")
+
+        with self.assertRaises(ValidationError) as cm:
+            school_class.validate_unique()
+
+        self.assertCountEqual(cm.exception.message_dict.keys(), ["number", "slug"])
+
+    def test_validate_unique_ignores_objects_of_other_schools(self):
+        self.create_class("1a", school=self.school1)
+        school_class = Class(number="1a", slug="1a", school=self.school2)
+
+        school_class.validate_unique()
+
+
+class EventStatusTestCase(SchoolsMixin, UsersMixin, EventsMixin, TestCase):
+    def test_creates_statuses_of_global_event_for_users_of_its_school(self):
+        school1 = self.create_school("School 1", "school1.example.com")
+        school2 = self.create_school("School 2", "school2.example.com")
+        teacher = self.create_teacher(school=school1)
+        student1 = self.create_student("student1", school=school1)
+        self.create_student("student2", school=school2)
+        event = self.create_event(teacher, None, datetime.date.today(), school=school1)
+
+        statuses = EventStatus.objects.create_multiple(event)
+
+        self.assertEqual([status.user for status in statuses], [student1])
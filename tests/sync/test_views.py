@@ -0,0 +1,310 @@
+import copy
+import datetime
+
+from django.db import connection, connections, transaction
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from django_school.apps.grades.models import Grade
+from django_school.apps.lessons.models import Attendance
+from django_school.apps.sync.changes import (COLLECTIONS, TOMBSTONES,
+                                             decode_cursor, encode_cursor,
+                                             get_changes)
+from tests.utils import (ClassesMixin, EventsMixin, GradesMixin, LessonsMixin,
+                         MessagesMixin, RolesRequiredTestMixin, UsersMixin)
+
+
+class ChangesViewTestCase(
+    RolesRequiredTestMixin,
+    UsersMixin,
+    ClassesMixin,
+    LessonsMixin,
+    GradesMixin,
+    EventsMixin,
+    MessagesMixin,
+    TransactionTestCase,
+):
+    """
+    The rows are committed by separate transactions, as in production,
+    the cursors tell the changes by the transactions which have written them.
+    """
+
+    path_name = "sync:changes"
+
+    def setUp(self):
+        self.teacher = self.create_teacher()
+        self.school_class = self.create_class()
+        self.student = self.create_student(school_class=self.school_class)
+        self.student2 = self.create_student("student2", school_class=self.school_class)
+        self.parent = self.create_parent(child=self.student)
+        self.subject = self.create_subject()
+        self.lesson = self.create_lesson(self.subject, self.teacher, self.school_class)
+        self.category = self.create_grade_category(self.subject, self.school_class)
+        self.grade = self.create_grade(
+            self.category, self.subject, self.student, self.teacher
+        )
+        self.create_grade(self.category, self.subject, self.student2, self.teacher)
+
+    def get_url(self, since=None):
+        url = reverse(self.path_name)
+
+        return f"{url}?since={since}" if since else url
+
+    def get_permitted_user(self):
+        return self.student
+
+    def get_not_permitted_user(self):
+        return self.teacher
+
+    def get_changes(self, since=None):
+        response = self.client.get(self.get_url(since))
+        self.assertEqual(response.status_code, 200)
+
+        return response.json()
+
+    def test_returns_all_rows_visible_to_student_without_cursor(self):
+        session = self.create_lesson_session(self.lesson)
+        self.create_attendance(session, [self.student, self.student2], "present")
+        self.create_event(self.teacher, None, datetime.date(2026, 11, 2))
+        self.create_message(self.teacher, [self.student])
+        self.create_message(self.teacher, [self.student2])
+        self.create_note(self.student, self.teacher)
+        self.login(self.student)
+
+        changes = self.get_changes()
+
+        self.assertTrue(changes["reset"])
+        self.assertFalse(changes["has_more"])
+        self.assertEqual(
+            [grade["id"] for grade in changes["changed"]["grades"]], [self.grade.pk]
+        )
+        self.assertEqual(
+            [attendance["student"] for attendance in changes["changed"]["attendances"]],
+            [self.student.pk],
+        )
+        for name in ["events", "message_statuses", "notes"]:
+            with self.subTest(name=name):
+                self.assertEqual(len(changes["changed"][name]), 1)
+
+    def test_returns_rows_of_child_to_parent(self):
+        self.login(self.parent)
+
+        changes = self.get_changes()
+
+        self.assertEqual(
+            [grade["id"] for grade in changes["changed"]["grades"]], [self.grade.pk]
+        )
+
+    def test_returns_only_rows_changed_after_cursor(self):
+        self.login(self.student)
+        cursor = self.get_changes()["cursor"]
+        grade = self.create_grade(
+            self.create_grade_category(self.subject, self.school_class, "Test"),
+            self.subject,
+            self.student,
+            self.teacher,
+        )
+
+        changes = self.get_changes(cursor)
+
+        self.assertFalse(changes["reset"])
+        self.assertEqual(
+            [grade["id"] for grade in changes["changed"]["grades"]], [grade.pk]
+        )
+        self.assertEqual(self.get_changes(changes["cursor"])["changed"]["grades"], [])
+
+    def test_returns_rows_changed_by_bulk_updates(self):
+        session = self.create_lesson_session(self.lesson)
+        self.create_attendance(session, [self.student])
+        self.login(self.student)
+        cursor = self.get_changes()["cursor"]
+
+        Attendance.objects.filter(student=self.student).update(status="absent")
+        changes = self.get_changes(cursor)
+
+        [attendance] = changes["changed"]["attendances"]
+        self.assertEqual(attendance["status"], "absent")
+
+    def test_returns_deleted_rows(self):
+        self.login(self.student)
+        cursor = self.get_changes()["cursor"]
+
+        # the grades of the category are deleted by a cascade
+        self.category.delete()
+        changes = self.get_changes(cursor)
+
+        self.assertEqual(changes["deleted"]["grades"], [self.grade.pk])
+        self.assertEqual(changes["changed"]["grades"], [])
+
+    @override_settings(SYNC_PAGE_SIZE=1)
+    def test_returns_changes_in_pages(self):
+        self.create_grade(
+            self.create_grade_category(self.subject, self.school_class, "Test"),
+            self.subject,
+            self.student,
+            self.teacher,
+        )
+        self.login(self.student)
+
+        first_page = self.get_changes()
+        second_page = self.get_changes(first_page["cursor"])
+
+        self.assertTrue(first_page["has_more"])
+        self.assertFalse(second_page["has_more"])
+        self.assertFalse(second_page["reset"])
+        self.assertEqual(
+            [
+                grade["id"]
+                for page in [first_page, second_page]
+                for grade in page["changed"]["grades"]
+            ],
+            list(
+                Grade.objects.filter(student=self.student)
+                .order_by("updated_xid", "pk")
+                .values_list("pk", flat=True)
+            ),
+        )
+
+    def test_returns_all_rows_again_if_cursor_is_older_than_tombstones(self):
+        state = decode_cursor(get_changes(self.student)["cursor"])
+        expired = timezone.now() - datetime.timedelta(days=31)
+        state["since"] = (state["since"][0], expired)
+        self.login(self.student)
+
+        changes = self.get_changes(encode_cursor(state))
+
+        self.assertTrue(changes["reset"])
+        self.assertEqual(len(changes["changed"]["grades"]), 1)
+
+    def test_removes_event_moved_to_another_class(self):
+        event = self.create_event(
+            self.teacher, self.school_class, datetime.date(2026, 11, 2)
+        )
+        self.login(self.student)
+        cursor = self.get_changes()["cursor"]
+
+        event.school_class = self.create_class("2b")
+        event.save()
+        changes = self.get_changes(cursor)
+
+        self.assertEqual(changes["deleted"]["events"], [event.pk])
+        self.assertEqual(changes["changed"]["events"], [])
+
+    def test_does_not_remove_event_made_global(self):
+        event = self.create_event(
+            self.teacher, self.school_class, datetime.date(2026, 11, 2)
+        )
+        self.login(self.student)
+        cursor = self.get_changes()["cursor"]
+
+        event.school_class = None
+        event.save()
+        changes = self.get_changes(cursor)
+
+        self.assertEqual(changes["deleted"]["events"], [])
+        self.assertEqual(
+            [event["id"] for event in changes["changed"]["events"]], [event.pk]
+        )
+
+    def test_returns_all_rows_again_if_student_is_moved_to_another_class(self):
+        school_class = self.create_class("2b")
+        event = self.create_event(
+            self.teacher, school_class, datetime.date(2026, 11, 2)
+        )
+        self.login(self.student)
+        cursor = self.get_changes()["cursor"]
+
+        self.student.school_class = school_class
+        self.student.save()
+        changes = self.get_changes(cursor)
+
+        self.assertTrue(changes["reset"])
+        self.assertEqual(
+            [event["id"] for event in changes["changed"]["events"]], [event.pk]
+        )
+        self.assertFalse(self.get_changes(changes["cursor"])["reset"])
+
+    def test_returns_all_rows_again_if_parent_is_assigned_another_child(self):
+        self.login(self.parent)
+        cursor = self.get_changes()["cursor"]
+
+        self.parent.child = self.student2
+        self.parent.save()
+        changes = self.get_changes(cursor)
+
+        self.assertTrue(changes["reset"])
+        self.assertEqual(
+            [grade["student"] for grade in changes["changed"]["grades"]],
+            [self.student2.pk],
+        )
+
+    def open_long_transaction(self):
+        connections.settings["long"] = copy.deepcopy(connection.settings_dict)
+        self.addCleanup(connections.settings.pop, "long")
+        self.addCleanup(connections.__delitem__, "long")
+        self.addCleanup(lambda: connections["long"].close())
+
+        return transaction.atomic(using="long")
+
+    def test_returns_rows_committed_later_by_longer_transaction(self):
+        self.login(self.student)
+
+        with self.open_long_transaction():
+            # the transaction has started before the newer grade is added
+            Grade.objects.using("long").filter(pk=self.grade.pk).update(grade=5)
+            grade = self.create_grade(
+                self.create_grade_category(self.subject, self.school_class, "Test"),
+                self.subject,
+                self.student,
+                self.teacher,
+            )
+            changes = self.get_changes()
+            self.assertEqual(
+                [grade["id"] for grade in changes["changed"]["grades"]],
+                [self.grade.pk, grade.pk],
+            )
+            self.assertEqual(changes["changed"]["grades"][0]["grade"], 3)
+        changes = self.get_changes(changes["cursor"])
+
+        [changed_grade] = changes["changed"]["grades"]
+        self.assertEqual(changed_grade["id"], self.grade.pk)
+        self.assertEqual(changed_grade["grade"], 5)
+
+    def test_returns_rows_deleted_later_by_longer_transaction(self):
+        self.login(self.student)
+        cursor = self.get_changes()["cursor"]
+
+        with self.open_long_transaction():
+            Grade.objects.using("long").filter(pk=self.grade.pk).delete()
+            self.create_note(self.student, self.teacher)
+            changes = self.get_changes(cursor)
+            self.assertEqual(len(changes["changed"]["notes"]), 1)
+            self.assertEqual(changes["deleted"]["grades"], [])
+        changes = self.get_changes(changes["cursor"])
+
+        self.assertEqual(changes["deleted"]["grades"], [self.grade.pk])
+        self.assertEqual(changes["changed"]["notes"], [])
+
+    def test_returns_400_if_cursor_is_invalid(self):
+        self.login(self.student)
+
+        for cursor in [
+            "not-a-cursor",
+            "e30=",
+            "eyJncmFkZXMiOiBbMSwgMl19",
+            encode_cursor(
+                {
+                    "since": ("1:2:; DROP TABLE grades_grade", timezone.now()),
+                    "run": None,
+                    "positions": dict.fromkeys([*COLLECTIONS, TOMBSTONES], (0, 0)),
+                }
+            ),
+        ]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.get_url(cursor))
+
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(
+                    response.json(), {"errors": ["The cursor is invalid."]}
+                )
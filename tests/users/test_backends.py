@@ -0,0 +1,129 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+
+from django_school.apps.users.backends import CachedUserBackend
+from tests.utils import SHARED_CACHES, ClassesMixin, UsersMixin
+
+User = get_user_model()
+
+
+# the cache is not populated inside transactions, so TestCase can't be used
+@override_settings(CACHES=SHARED_CACHES)
+class CachedUserBackendTestCase(UsersMixin, ClassesMixin, TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.backend = CachedUserBackend()
+        self.teacher = self.create_teacher()
+        self.school_class = self.create_class(tutor=self.teacher)
+        self.student = self.create_student(school_class=self.school_class)
+        self.parent = self.create_parent(child=self.student)
+
+    def test_returns_user(self):
+        user = self.backend.get_user(self.student.pk)
+
+        self.assertEqual(user, self.student)
+        self.assertEqual(user.username, self.student.username)
+        self.assertEqual(user.school_class_id, self.school_class.pk)
+
+    def test_returns_none_if_user_does_not_exist(self):
+        self.assertIsNone(self.backend.get_user(12345))
+
+    def test_returns_none_if_user_is_not_active(self):
+        self.student.is_active = False
+        self.student.save()
+
+        self.assertIsNone(self.backend.get_user(self.student.pk))
+
+    def test_performs_no_queries_if_user_is_cached(self):
+        self.backend.get_user(self.parent.pk)
+
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(self.parent.pk)
+            _ = user.is_parent
+            _ = user.child.school_class_id
+            _ = user.grades_url
+
+    def test_caches_tutor_class(self):
+        self.backend.get_user(self.teacher.pk)
+
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(self.teacher.pk)
+            self.assertTrue(user.is_tutor)
+            self.assertEqual(
+                user.teacher_class.detail_url, self.school_class.detail_url
+            )
+
+    def test_user_is_not_tutor_if_has_no_class(self):
+        teacher2 = self.create_teacher(username="teacher2")
+
+        user = self.backend.get_user(teacher2.pk)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(user.is_tutor)
+
+    def test_does_not_cache_user_inside_transaction(self):
+        with transaction.atomic():
+            self.backend.get_user(self.student.pk)
+
+        with self.assertNumQueries(1):
+            self.backend.get_user(self.student.pk)
+
+    def test_loads_related_objects_lazily(self):
+        user = self.backend.get_user(self.student.pk)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.school_class.number, self.school_class.number)
+
+    def test_cache_is_invalidated_when_user_is_saved(self):
+        self.backend.get_user(self.student.pk)
+        self.student.first_name = "NewFirstName"
+        self.student.save()
+
+        user = self.backend.get_user(self.student.pk)
+
+        self.assertEqual(user.first_name, "NewFirstName")
+
+    def test_cache_of_parent_is_invalidated_when_child_is_saved(self):
+        school_class2 = self.create_class(number="2b")
+        self.backend.get_user(self.parent.pk)
+        self.student.school_class = school_class2
+        self.student.save()
+
+        user = self.backend.get_user(self.parent.pk)
+
+        self.assertEqual(user.child.school_class_id, school_class2.pk)
+
+    def test_does_not_look_for_parents_when_teacher_is_saved(self):
+        self.teacher.first_name = "NewFirstName"
+
+        with self.assertNumQueries(1):
+            self.teacher.save()
+
+    def test_cache_is_invalidated_when_class_is_saved(self):
+        teacher2 = self.create_teacher(username="teacher2")
+        self.backend.get_user(teacher2.pk)
+        self.create_class(number="2b", tutor=teacher2)
+
+        user = self.backend.get_user(teacher2.pk)
+
+        self.assertTrue(user.is_tutor)
+
+    def test_cache_is_invalidated_when_class_is_deleted(self):
+        self.backend.get_user(self.student.pk)
+        self.school_class.delete()
+
+        user = self.backend.get_user(self.student.pk)
+
+        self.assertIsNone(user.school_class_id)
+
+
+class CachedUserBackendLocalMemoryTestCase(UsersMixin, TransactionTestCase):
+    def test_does_not_cache_user_in_memory_of_process(self):
+        backend = CachedUserBackend()
+        student = self.create_student()
+        backend.get_user(student.pk)
+
+        with self.assertNumQueries(1):
+            backend.get_user(student.pk)
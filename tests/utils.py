@@ -1,4 +1,6 @@
 import datetime
+import os
+import tempfile
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -14,10 +16,19 @@ from django_school.apps.lessons.models import (AttachedFile, Attendance,
                                                Homework, HomeworkRealisation,
                                                Lesson, LessonSession, Subject)
 from django_school.apps.messages.models import Message, MessageStatus
+from django_school.apps.schools.models import School, SchoolYear
 from django_school.apps.users.models import ROLES, Note
 
 User = get_user_model()
 
+# nothing is cached in the per-process memory, the files are shared by processes
+SHARED_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(tempfile.gettempdir(), "django_school_tests_cache"),
+    }
+}
+
 
 class UsersMixin:
     DEFAULT_USERNAME = "username"
@@ -276,6 +287,24 @@ class EventsMixin:
         )
 
 
+class SchoolsMixin:
+    DEFAULT_SCHOOL_NAME = "School"
+    DEFAULT_DOMAIN = "school.example.com"
+
+    @staticmethod
+    def create_school(name=DEFAULT_SCHOOL_NAME, domain=DEFAULT_DOMAIN, **kwargs):
+        if "slug" not in kwargs:
+            kwargs["slug"] = slugify(name)
+
+        return School.objects.create(name=name, domain=domain, **kwargs)
+
+    @staticmethod
+    def create_school_year(name, start_date, end_date, **kwargs):
+        return SchoolYear.objects.create(
+            name=name, start_date=start_date, end_date=end_date, **kwargs
+        )
+
+
 class TestMixin:
     ajax_required = False
 